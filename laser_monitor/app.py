@@ -1,10 +1,17 @@
+import time
+
+# 프로세스 시작 시각 (무거운 import 전에 기록, 첫 프레임 전송까지 걸린 시간의 기준)
+PROCESS_START_TIME = time.time()
+
 from flask import Flask, render_template, Response, jsonify, request, make_response
 import cv2
+import json
 import numpy as np
-import time
 import uuid
 import os
 import sys
+from datetime import datetime, timezone
+from werkzeug.http import is_resource_modified
 
 # 현재 파일의 디렉토리를 path에 추가
 current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -16,9 +23,12 @@ try:
     from utils.email_sender import email_sender
     from models.state import MonitoringState
     from models.database import Database
-    from camera.detector import detect_tshirt_center
+    from camera.detector import start_model_loading, get_model_readiness
+    from camera.inference_service import is_worker_process
+    from camera.encoder import select_rendition, rendition_size
 except ImportError as e:
     print(f"Import error: {e}")
+    import_error = str(e)
     # fallback logger
     class MockLogger:
         def info(self, msg): print(f"INFO: {msg}")
@@ -50,6 +60,12 @@ except ImportError as e:
         def get_or_create_session(self, session_id):
             return self
 
+        def open_stream(self, session_id, camera_id=None):
+            return self
+
+        def close_stream(self, session_id, camera_id=None):
+            pass
+
         def add_capture(self, frame, is_manual=False):
             pass
 
@@ -59,8 +75,20 @@ except ImportError as e:
         def save_setting(self, key, value):
             pass
 
-    def detect_tshirt_center(frame, state):
-        return frame
+    def select_rendition(max_width=None, quality=None, max_fps=None):
+        return None
+
+    def rendition_size(width, frame_shape):
+        return None
+
+    def start_model_loading():
+        pass
+
+    def get_model_readiness():
+        return {'ready': False, 'phase': 'unavailable', 'error': import_error}
+
+    def is_worker_process():
+        return False
 
     state = MockState()
     db = MockDatabase()
@@ -75,8 +103,11 @@ app = Flask(__name__,
 app.config['SECRET_KEY'] = Config.SECRET_KEY
 app.config['DEBUG'] = Config.DEBUG
 
+# spawn 추론 워커가 이 모듈을 다시 import할 때는 카메라/모델 등 전역 객체를 만들지 않음
+WORKER_IMPORT = is_worker_process()
+
 # 전역 객체 초기화 (import 성공한 경우에만)
-if 'MonitoringState' in globals():
+if 'MonitoringState' in globals() and not WORKER_IMPORT:
     state = MonitoringState()
     db = Database()
     # 설정 검증
@@ -88,27 +119,86 @@ if 'MonitoringState' in globals():
 # 필요한 디렉토리 생성
 os.makedirs(Config.CAPTURE_DIR, exist_ok=True)
 
-def generate_frames(session_id):
-    """비디오 프레임 생성기"""
-    session = state.get_or_create_session(session_id)
-    logger.info(f"프레임 생성 시작: 세션 {session_id}")
+# 감지 모델은 백그라운드에서 로드 (준비 전에는 감지 없이 프레임만 스트리밍)
+if not WORKER_IMPORT:
+    start_model_loading()
+
+# 스냅샷 ETag 접두사 (프로세스가 다시 시작되어 프레임 시퀀스가 1부터 다시 시작해도 이전 ETag와 겹치지 않음)
+SNAPSHOT_ETAG_PREFIX = f"{int(PROCESS_START_TIME * 1000):x}"
+
+# 시작 지연 지표 (프로세스 시작부터 첫 프레임/첫 감지 프레임 전송까지 걸린 시간, 초)
+startup_metrics = {
+    'time_to_first_frame': None,
+    'time_to_first_detection_frame': None
+}
+
+def _record_frame_served():
+    """첫 프레임 전송 시점 기록"""
+    if startup_metrics['time_to_first_detection_frame'] is not None:
+        return
+
+    elapsed = round(time.time() - PROCESS_START_TIME, 3)
+    if startup_metrics['time_to_first_frame'] is None:
+        startup_metrics['time_to_first_frame'] = elapsed
+        logger.info(f"첫 프레임 전송: 프로세스 시작 후 {elapsed}초")
+    if get_model_readiness()['ready']:
+        startup_metrics['time_to_first_detection_frame'] = elapsed
+        logger.info(f"첫 감지 프레임 전송: 프로세스 시작 후 {elapsed}초")
+
+def generate_frames(session_id, camera_id=None, rendition=None):
+    """
+    비디오 프레임 생성기
+
+    Args:
+        session_id (str): 세션 ID
+        camera_id (str): 카메라 ID (None이면 기본 카메라)
+        rendition (Rendition): 클라이언트 렌디션 (None이면 원본 해상도, 화질 설정 품질, FPS 제한 없음)
+    """
+    # 스트림이 열려 있는 동안만 세션이 카메라에 등록됨 (연결이 끊기면 finally에서 즉시 해제)
+    session = state.open_stream(session_id, camera_id)
+    logger.info(f"프레임 생성 시작: 세션 {session_id}, 카메라 {camera_id or '기본'}, 렌디션 {rendition}")
+
+    # 카메라별 공유 카메라 및 감지 파이프라인
+    camera = state.cameras.get_camera(camera_id) if hasattr(state, 'cameras') else None
+    pipeline = state.cameras.get_pipeline(camera_id) if hasattr(state, 'cameras') else None
+
+    # 파이프라인은 결과를 이 스트림의 최신 우선 우편함에 넣기만 하므로, 소켓 쓰기가 느리면
+    # 이 스트림의 프레임만 드롭됨 (최대 FPS가 지정되면 전송 시각의 최신 결과만 가져감)
+    mailbox = None
+    if pipeline is not None:
+        mailbox = pipeline.subscribe(session_id, camera_id, rendition.max_fps if rendition is not None else None)
 
+    try:
+        yield from _stream_frames(session, camera, pipeline, mailbox, rendition)
+    finally:
+        # 클라이언트가 연결을 끊으면 쓰기 실패 후 생성기가 닫히며(GeneratorExit) 여기서 자원 해제
+        if mailbox is not None:
+            pipeline.unsubscribe(mailbox)
+        state.close_stream(session_id, camera_id)
+        logger.info(f"프레임 생성 종료: 세션 {session_id}, 카메라 {camera_id or '기본'}")
+
+def _stream_frames(session, camera, pipeline, mailbox, rendition):
+    """generate_frames()의 프레임 전송 루프"""
+    last_chunk = None
     while True:
         if not session.is_monitoring:
-            time.sleep(0.1)
-            continue
+            # 모니터링이 다시 켜질 때까지 폴링 없이 대기 (대기 중에는 우편함도 결과를 받지 않음)
+            if mailbox is not None:
+                mailbox.pause()
+            if not session.wait_for_monitoring(Config.STREAM_IDLE_KEEPALIVE):
+                # 끊긴 연결을 감지하도록 마지막 프레임을 다시 전송 (쓰기가 실패하면 생성기가 닫힘)
+                if last_chunk is not None:
+                    yield last_chunk
+                continue
+            if mailbox is not None:
+                mailbox.resume()
 
         try:
-            # 카메라 연결 확인 및 재연결
-            if hasattr(state, 'camera') and state.camera.cap is None or not state.camera.cap.isOpened():
-                logger.warning("카메라 재연결 시도")
-                if not state.camera.start_capture():
-                    logger.error("카메라를 열 수 없습니다. 5초 후 재시도합니다.")
-                    time.sleep(5)
-                    continue
+            # 카메라 재연결은 캡처 감시 스레드가 백그라운드에서 처리하며,
+            # 재연결 중에는 파이프라인이 마지막 프레임에 안내 문구를 표시해 발행함
 
-            # 임시로 더미 프레임 생성 (카메라 없는 경우)
-            if not hasattr(state, 'camera') or state.camera.cap is None:
+            # 임시로 더미 프레임 생성 (카메라 객체가 없는 경우)
+            if camera is None:
                 # 640x480 더미 프레임 생성
                 frame = np.zeros((480, 640, 3), dtype=np.uint8)
                 cv2.putText(frame, "Camera not available", (50, 240),
@@ -119,36 +209,41 @@ def generate_frames(session_id):
                 cv2.line(frame, (310, 240), (330, 240), (0, 255, 0), 1)
                 cv2.line(frame, (320, 230), (320, 250), (0, 255, 0), 1)
 
-                processed_frame = frame
-            else:
-                ret, frame = state.camera.cap.read()
+                # 프레임 인코딩
+                encode_param = [int(cv2.IMWRITE_JPEG_QUALITY), Config.VIDEO_QUALITY]
+                ret, buffer = cv2.imencode('.jpg', frame, encode_param)
+
                 if not ret:
-                    logger.warning("프레임을 읽을 수 없습니다.")
-                    state.camera.stop_capture()
+                    logger.warning("프레임 인코딩 실패")
                     continue
 
-                # 프레임 좌우반전
-                frame = cv2.flip(frame, 1)
-
-                # 객체 감지 및 처리
-                processed_frame = detect_tshirt_center(frame, state)
-
-            # 프레임 유효성 검사
-            if processed_frame is None or processed_frame.size == 0:
-                logger.warning("유효하지 않은 프레임")
-                continue
+                chunk = (b'--frame\r\n'
+                         b'Content-Type: image/jpeg\r\n\r\n' + buffer.tobytes() + b'\r\n')
+            else:
+                # 감지 파이프라인이 프레임당 한 번 발행하는 결과를 공유
+                result = mailbox.take(timeout=1.0)
+                if result is None:
+                    continue
 
-            # 프레임 인코딩
-            encode_param = [int(cv2.IMWRITE_JPEG_QUALITY), Config.VIDEO_QUALITY]
-            ret, buffer = cv2.imencode('.jpg', processed_frame, encode_param)
+                # 렌디션별로 한 번만 인코딩된 bytes를 같은 렌디션의 모든 세션이 그대로 사용
+                # (품질을 지정하지 않으면 프레임 캡처 시점의 화질 설정 스냅샷을 따름)
+                try:
+                    if rendition is not None:
+                        encoded = pipeline.encoder.encode_rendition(result, rendition)
+                    else:
+                        quality = result.settings.quality if result.settings else Config.VIDEO_QUALITY
+                        encoded = pipeline.encoder.encode(result, quality)
+                finally:
+                    result.release()
+                if encoded is None:
+                    logger.warning("유효하지 않은 프레임")
+                    continue
 
-            if not ret:
-                logger.warning("프레임 인코딩 실패")
-                continue
+                chunk = encoded.chunk
 
-            frame = buffer.tobytes()
-            yield (b'--frame\r\n'
-                   b'Content-Type: image/jpeg\r\n\r\n' + frame + b'\r\n')
+            _record_frame_served()
+            last_chunk = chunk
+            yield chunk
 
         except Exception as e:
             logger.log_exception("프레임 생성 중 오류 발생", e)
@@ -194,16 +289,95 @@ def heartbeat():
         logger.log_exception("하트비트 처리 중 오류", e)
         return jsonify({'success': False, 'error': str(e)}), 500
 
+def generate_events(session):
+    """
+    상태 이벤트 스트림 생성기 (Server-Sent Events)
+
+    연결 직후 현재 상태를 보내고, 이후에는 발행기가 새 이벤트를 만들 때만 전송합니다.
+    연결이 유지되는 동안 세션 활성 시각을 갱신하므로 별도의 하트비트 요청이 필요 없습니다.
+    """
+    publisher = state.publisher
+    publisher.subscribers += 1
+    seen = {}
+    try:
+        # 연결이 끊기면 브라우저가 3초 후 재연결
+        yield 'retry: 3000\n\n'
+        while True:
+            session.last_active = time.time()
+            events = publisher.wait_for_events(seen, timeout=Config.STATUS_PUSH_KEEPALIVE)
+            if not events:
+                # 연결 유지용 주석 (끊긴 연결은 이 쓰기에서 감지됨)
+                yield ': keepalive\n\n'
+                continue
+            for name, version, data in events:
+                seen[name] = version
+                yield f"event: {name}\nid: {version}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+    finally:
+        publisher.subscribers -= 1
+
+@app.route('/events')
+def events():
+    """상태/거리/화질 변경 푸시 채널 (연결 자체가 세션 하트비트 역할)"""
+    try:
+        session_id = request.cookies.get('session_id')
+        if not session_id:
+            return "No session", 400
+        if not hasattr(state, 'publisher'):
+            return "Status push not available", 503
+
+        session = state.get_or_create_session(session_id)
+        return Response(generate_events(session), mimetype='text/event-stream',
+                        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+    except Exception as e:
+        logger.log_exception("상태 이벤트 스트림 제공 중 오류", e)
+        return "Event stream error", 500
+
+@app.route('/healthz')
+def healthz():
+    """프로세스 생존 확인 (모델 로딩 여부와 무관하게 응답)"""
+    return jsonify({
+        'status': 'ok',
+        'uptime': round(time.time() - PROCESS_START_TIME, 3)
+    })
+
+@app.route('/readyz')
+def readyz():
+    """감지 모델 준비 상태 (준비 전/실패 시 503)"""
+    try:
+        readiness = get_model_readiness()
+        readiness.update(startup_metrics)
+        readiness['uptime'] = round(time.time() - PROCESS_START_TIME, 3)
+        return jsonify(readiness), 200 if readiness['ready'] else 503
+    except Exception as e:
+        logger.log_exception("준비 상태 조회 중 오류", e)
+        return jsonify({'ready': False, 'error': str(e)}), 503
+
 @app.route('/video_feed')
-def video_feed():
-    """비디오 스트림 제공"""
+@app.route('/video_feed/<camera_id>')
+def video_feed(camera_id=None):
+    """
+    비디오 스트림 제공
+
+    쿼리 파라미터로 클라이언트 렌디션을 지정할 수 있습니다.
+    (max_width: 최대 너비, quality: JPEG 품질, max_fps: 최대 전송 FPS)
+    요청 값은 설정된 렌디션 단계로 맞춰져 같은 단계의 클라이언트끼리 인코딩 결과를 공유합니다.
+    """
     try:
         session_id = request.cookies.get('session_id')
         if not session_id:
             logger.warning("세션 ID 없이 비디오 피드 요청")
             return "No session", 400
 
-        return Response(generate_frames(session_id),
+        if hasattr(state, 'cameras') and not state.cameras.has_camera(camera_id):
+            return "Unknown camera", 404
+
+        rendition = None
+        if any(key in request.args for key in ('max_width', 'quality', 'max_fps')):
+            rendition = select_rendition(request.args.get('max_width', type=int),
+                                         request.args.get('quality', type=int),
+                                         request.args.get('max_fps', type=float))
+
+        return Response(generate_frames(session_id, camera_id, rendition),
                        mimetype='multipart/x-mixed-replace; boundary=frame')
     except Exception as e:
         logger.log_exception("비디오 피드 제공 중 오류", e)
@@ -245,16 +419,52 @@ def toggle_alert():
 def get_status():
     """현재 상태 조회"""
     try:
-        return jsonify({
+        response = {
             'status': state.status,
             'distance': state.distance,
             'is_monitoring': state.is_monitoring,
             'alert_enabled': state.alert_enabled
-        })
+        }
+        # 기본 카메라의 추론 주기/추적 신뢰도, 렌디션별 인코딩 횟수 및 스트림별 전송/드롭 통계
+        pipeline = getattr(state, 'pipeline', None)
+        if pipeline is not None:
+            response['detection'] = pipeline.context.get_stats()
+            response['encoder'] = pipeline.encoder.get_stats()
+            response['streams'] = pipeline.get_subscriber_stats()
+        if hasattr(state, 'publisher'):
+            response['push'] = state.publisher.get_stats()
+        return jsonify(response)
     except Exception as e:
         logger.log_exception("상태 조회 중 오류", e)
         return jsonify({'error': str(e)}), 500
 
+@app.route('/get_status/<camera_id>')
+def get_camera_status(camera_id):
+    """카메라별 상태 조회"""
+    try:
+        if not hasattr(state, 'cameras') or not state.cameras.has_camera(camera_id):
+            return jsonify({'error': '알 수 없는 카메라입니다.'}), 404
+
+        camera_status = state.cameras.get_status(camera_id)
+        camera_status.update({
+            'is_monitoring': state.is_monitoring,
+            'alert_enabled': state.alert_enabled
+        })
+        return jsonify(camera_status)
+    except Exception as e:
+        logger.log_exception("카메라 상태 조회 중 오류", e)
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/get_cameras')
+def get_cameras():
+    """카메라 목록 조회"""
+    try:
+        camera_ids = state.cameras.camera_ids() if hasattr(state, 'cameras') else []
+        return jsonify({'cameras': camera_ids})
+    except Exception as e:
+        logger.log_exception("카메라 목록 조회 중 오류", e)
+        return jsonify({'error': str(e)}), 500
+
 @app.route('/update_hsv', methods=['POST'])
 def update_hsv():
     """HSV 값 업데이트"""
@@ -279,6 +489,66 @@ def get_captures():
         logger.log_exception("캡처 목록 조회 중 오류", e)
         return jsonify({'error': str(e)}), 500
 
+@app.route('/snapshot.jpg')
+@app.route('/snapshot/<camera_id>.jpg')
+def snapshot(camera_id=None):
+    """
+    최신 감지 프레임 JPEG (추가 추론 없이 스트림과 같은 인코딩 캐시 사용)
+
+    ETag/Last-Modified는 프레임 시퀀스 번호와 캡처 시각 기준이므로, 새 프레임이 없으면
+    조건부 요청(If-None-Match, If-Modified-Since)에 인코딩 없이 304를 반환합니다.
+    쿼리 파라미터 max_width, quality는 /video_feed와 같은 렌디션 단계로 맞춥니다.
+    """
+    try:
+        if not hasattr(state, 'cameras') or not state.cameras.has_camera(camera_id):
+            return "Unknown camera", 404
+        pipeline = state.cameras.get_pipeline(camera_id)
+
+        # 시청자가 없으면 카메라를 잠시 켜 두고, 새로 켰으면 켠 뒤의 첫 결과를 기다림
+        if state.hold_camera(camera_id):
+            latest = pipeline.get_latest_result()
+            last_seq = 0
+            if latest is not None:
+                last_seq = latest.seq
+                latest.release()
+            result = pipeline.wait_for_result(last_seq, timeout=2.0)
+        else:
+            result = pipeline.get_latest_result() or pipeline.wait_for_result(0, timeout=2.0)
+        if result is None:
+            return "No frame available", 503
+
+        try:
+            if result.frame is None:
+                return "No frame available", 503
+            rendition = select_rendition(request.args.get('max_width', type=int),
+                                         request.args.get('quality', type=int))
+            quality = rendition.quality
+            if quality is None:
+                quality = result.settings.quality if result.settings else Config.VIDEO_QUALITY
+            size = rendition_size(rendition.width, result.frame.shape)
+
+            etag = f"{SNAPSHOT_ETAG_PREFIX}-{result.seq}-{rendition.width or 0}-{quality}"
+            last_modified = datetime.fromtimestamp(int(result.timestamp), timezone.utc)
+            if not is_resource_modified(request.environ, etag=etag, last_modified=last_modified):
+                response = Response(status=304)
+            else:
+                encoded = pipeline.encoder.encode(result, quality, size)
+                if encoded is None:
+                    return "Encoding failed", 503
+                response = Response(encoded.jpeg, mimetype='image/jpeg')
+        finally:
+            result.release()
+
+        response.set_etag(etag)
+        response.last_modified = last_modified
+        # 캐시는 허용하되 매번 재검증 (새 프레임이 없으면 304)
+        response.cache_control.no_cache = True
+        return response
+
+    except Exception as e:
+        logger.log_exception("스냅샷 제공 중 오류", e)
+        return "Snapshot error", 500
+
 @app.route('/capture_current')
 def capture_current():
     """현재 화면 캡처"""
@@ -287,18 +557,24 @@ def capture_current():
         if not hasattr(state, 'camera') or not state.camera or not state.camera.is_active():
             return jsonify({'success': False, 'error': '카메라가 활성화되지 않았습니다.'})
 
-        # 현재 프레임 가져오기
-        ret, frame = state.camera.get_frame()
-        if not ret or frame is None:
+        # 감지 파이프라인의 최신 결과 사용 (추가 추론 없음)
+        result = state.pipeline.get_latest_result()
+        if result is None:
+            result = state.pipeline.wait_for_result(0, timeout=2.0)
+        if result is None:
             return jsonify({'success': False, 'error': '프레임을 가져올 수 없습니다.'})
 
-        # 객체 감지 적용
-        processed_frame = detect_tshirt_center(frame, state)
-        if processed_frame is None:
-            processed_frame = frame
-
-        # 수동 캡처로 저장
-        state.add_capture(processed_frame, is_manual=True)
+        # 스트림이 이미 인코딩한 원본 해상도 JPEG를 그대로 저장 (캐시에 없을 때만 렌더링/인코딩)
+        try:
+            if result.frame is None:
+                return jsonify({'success': False, 'error': '프레임을 가져올 수 없습니다.'})
+            quality = result.settings.quality if result.settings else Config.VIDEO_QUALITY
+            encoded = state.pipeline.encoder.encode(result, quality)
+            if encoded is None:
+                return jsonify({'success': False, 'error': '프레임 인코딩에 실패했습니다.'})
+            state.add_capture(None, is_manual=True, jpeg=encoded.jpeg)
+        finally:
+            result.release()
 
         if state.captures:
             latest_capture = state.captures[0]  # 가장 최근 캡처
@@ -409,40 +685,50 @@ def set_quality_preset():
         if not preset_name:
             return jsonify({'success': False, 'error': '프리셋 이름이 필요합니다.'})
 
-        # 프리셋 설정 적용
-        if Config.set_quality_preset(preset_name):
-            # 카메라에 새 설정 적용 (state.camera 사용)
-            if hasattr(state, 'camera') and state.camera and state.camera.is_active():
-                preset = Config.get_quality_preset(preset_name)
-                new_settings = {
-                    'width': preset['width'],
-                    'height': preset['height'],
-                    'fps': preset['fps'],
-                    'quality': preset['quality']
-                }
-
-                # 카메라 설정 업데이트
-                if state.camera.update_settings(new_settings):
-                    logger.info(f"화질 프리셋 변경 성공: {preset_name} ({preset['description']})")
-                    return jsonify({
-                        'success': True,
-                        'preset': preset,
-                        'message': f"화질이 '{preset['name']}'으로 변경되었습니다."
-                    })
-                else:
-                    logger.warning(f"화질 프리셋 설정 실패: {preset_name}")
-                    return jsonify({'success': False, 'error': '카메라 설정 적용 실패'})
-            else:
-                logger.info(f"화질 프리셋 설정 (카메라 비활성 상태): {preset_name}")
-                preset = Config.get_quality_preset(preset_name)
-                return jsonify({
-                    'success': True,
-                    'preset': preset,
-                    'message': f"화질이 '{preset['name']}'으로 설정되었습니다. (다음 카메라 시작 시 적용)"
-                })
-        else:
+        # 프리셋 설정 적용 (새 버전의 화질 설정 스냅샷 생성)
+        if not Config.set_quality_preset(preset_name):
             return jsonify({'success': False, 'error': '유효하지 않은 프리셋입니다.'})
 
+        preset = Config.get_quality_preset(preset_name)
+        settings = Config.get_settings_snapshot()
+        if hasattr(state, 'publisher'):
+            state.publisher.notify()
+
+        # 활성 카메라마다 캡처 스레드에서 스냅샷을 원자적으로 적용
+        cameras = list(state.cameras.cameras.values()) if hasattr(state, 'cameras') else []
+        active_cameras = [camera for camera in cameras if camera.is_active()]
+
+        if not active_cameras:
+            for camera in cameras:
+                camera.reconfigure(settings)
+            logger.info(f"화질 프리셋 설정 (카메라 비활성 상태): {preset_name}")
+            return jsonify({
+                'success': True,
+                'preset': preset,
+                'message': f"화질이 '{preset['name']}'으로 설정되었습니다. (다음 카메라 시작 시 적용)"
+            })
+
+        new_settings = {
+            'width': preset['width'],
+            'height': preset['height'],
+            'fps': preset['fps'],
+            'quality': preset['quality']
+        }
+
+        # 카메라 설정 업데이트
+        failed = [camera.video_source for camera in active_cameras
+                  if not camera.update_settings(new_settings)]
+        if failed:
+            logger.warning(f"화질 프리셋 설정 실패: {preset_name} (카메라: {failed})")
+            return jsonify({'success': False, 'error': '카메라 설정 적용 실패'})
+
+        logger.info(f"화질 프리셋 변경 성공: {preset_name} ({preset['description']}, 설정 버전 {settings.version})")
+        return jsonify({
+            'success': True,
+            'preset': preset,
+            'message': f"화질이 '{preset['name']}'으로 변경되었습니다."
+        })
+
     except Exception as e:
         logger.log_exception("화질 프리셋 변경 중 오류", e)
         return jsonify({'success': False, 'error': str(e)}), 500
@@ -467,6 +753,17 @@ if __name__ == '__main__':
         # 필요한 디렉토리 생성
         os.makedirs(Config.CAPTURE_DIR, exist_ok=True)
 
+        if Config.SERVER_MODE == 'async':
+            # 스트리밍 시청자를 스레드 대신 코루틴으로 처리 (aiohttp 필요)
+            try:
+                import async_server
+            except ImportError as e:
+                logger.warning(f"비동기 서버를 사용할 수 없어 스레드 모드로 실행: {e}")
+            else:
+                async_server.run(app, state, host='127.0.0.1', port=5000,
+                                 on_frame_served=_record_frame_served)
+                sys.exit(0)
+
         app.run(host='127.0.0.1', port=5000, debug=Config.DEBUG, threaded=True)
     except Exception as e:
         logger.log_exception("애플리케이션 시작 중 오류", e)
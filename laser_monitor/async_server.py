@@ -0,0 +1,364 @@
+"""
+asyncio 기반 스트리밍 서버 모드 (SERVER_MODE=async, aiohttp 필요)
+
+스레드 모드에서는 /video_feed 시청자마다 OS 스레드 하나가 generate_frames()에 묶여 있으므로
+시청자 수만큼 스레드와 메모리가 늘어납니다. 이 모드에서는 스트리밍/상태 푸시 엔드포인트를
+코루틴으로 처리하여 한 이벤트 루프에서 수백 명의 시청자를 논블로킹 소켓으로 서비스합니다.
+
+  - 감지 파이프라인/상태 발행기의 리스너가 call_soon_threadsafe로 대기 중인 코루틴을 깨움
+  - 렌디션 인코딩은 프레임당 렌디션마다 한 번만 스레드 풀에서 실행하고 모든 시청자가 공유
+  - 그 밖의 라우트는 Flask 앱(WSGI)을 제한된 스레드 풀에서 실행
+"""
+import asyncio
+import io
+import json
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from aiohttp import web
+from multidict import CIMultiDict
+
+from config import Config
+from utils.logger import logger
+from camera.encoder import select_rendition
+
+# WSGI 응답에서 aiohttp가 직접 계산하는 헤더
+_HOP_BY_HOP_HEADERS = ('content-length', 'transfer-encoding', 'connection')
+
+class AsyncResultFeed:
+    """
+    감지 파이프라인 결과를 asyncio에서 기다리기 위한 어댑터 (카메라당 하나)
+
+    파이프라인 리스너가 새 결과 발행을 이벤트 루프에 알리고,
+    같은 결과/렌디션의 인코딩은 하나의 Future로 공유합니다.
+    """
+
+    def __init__(self, pipeline, loop):
+        self.pipeline = pipeline
+        self._loop = loop
+        self._changed = asyncio.Event()
+        self._encodings = {}
+        pipeline.add_listener(self._on_result)
+
+    def _on_result(self, result):
+        """감지 스레드에서 호출: 이벤트 루프에 새 결과를 알림"""
+        self._loop.call_soon_threadsafe(self._wake)
+
+    def _wake(self):
+        # 기다리던 코루틴을 모두 깨우고 다음 결과를 위해 새 이벤트로 교체
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    async def take(self, mailbox, timeout=1.0):
+        """
+        구독자 우편함에서 새 결과를 가져옴 (최대 FPS 제한 시 전송 시각까지 먼저 대기)
+
+        Returns:
+            DetectionResult: 새 결과 (사용 후 release() 필요). 시간 초과 시 None
+        """
+        deadline = self._loop.time() + timeout
+        while not mailbox.closed:
+            changed = self._changed
+            delay = mailbox.delay()
+            if delay > 0:
+                await asyncio.sleep(delay)
+                continue
+            result = mailbox.poll()
+            if result is not None:
+                return result
+
+            remaining = deadline - self._loop.time()
+            if remaining <= 0:
+                return None
+            try:
+                await asyncio.wait_for(changed.wait(), remaining)
+            except asyncio.TimeoutError:
+                return None
+        return None
+
+    async def encode(self, result, rendition):
+        """
+        결과를 렌디션으로 인코딩 (같은 결과/렌디션의 요청은 하나의 인코딩을 공유)
+
+        Returns:
+            EncodedFrame: 인코딩 결과. 실패 시 None
+        """
+        key = (result.seq, rendition)
+        future = self._encodings.get(key)
+        if future is None:
+            encoder = self.pipeline.encoder
+            if rendition is None:
+                quality = result.settings.quality if result.settings else Config.VIDEO_QUALITY
+                future = self._loop.run_in_executor(None, encoder.encode, result, quality)
+            else:
+                future = self._loop.run_in_executor(None, encoder.encode_rendition, result, rendition)
+            # 요청한 코루틴이 취소되어 결과를 해제해도 인코딩이 끝날 때까지 버퍼를 보유
+            if result.buffer is not None:
+                result.buffer.retain()
+                future.add_done_callback(lambda _: result.release())
+            self._encodings[key] = future
+            # 이전 결과의 인코딩 Future는 더 이상 공유되지 않으므로 정리
+            for stale in [stale for stale in self._encodings if stale[0] < result.seq]:
+                del self._encodings[stale]
+        # 취소되어도 공유 중인 인코딩은 계속 진행되도록 보호
+        return await asyncio.shield(future)
+
+class AsyncStatusFeed:
+    """상태 발행기(StatusPublisher)의 새 이벤트를 asyncio에서 기다리기 위한 어댑터"""
+
+    def __init__(self, publisher, loop):
+        self.publisher = publisher
+        self._loop = loop
+        self._changed = asyncio.Event()
+        publisher.add_listener(lambda: loop.call_soon_threadsafe(self._wake))
+
+    def _wake(self):
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    async def wait_for_events(self, seen, timeout):
+        """구독자가 받지 않은 이벤트 목록 (시간 초과 시 빈 목록)"""
+        deadline = self._loop.time() + timeout
+        while True:
+            changed = self._changed
+            events = self.publisher.wait_for_events(seen, timeout=0)
+            if events:
+                return events
+            remaining = deadline - self._loop.time()
+            if remaining <= 0:
+                return []
+            try:
+                await asyncio.wait_for(changed.wait(), remaining)
+            except asyncio.TimeoutError:
+                return []
+
+class AsyncStreamingServer:
+    """스트리밍/상태 푸시는 코루틴으로, 나머지 라우트는 Flask 앱으로 처리하는 aiohttp 서버"""
+
+    def __init__(self, flask_app, state, on_frame_served=None):
+        """
+        초기화
+
+        Args:
+            flask_app (Flask): 스트리밍 외 라우트를 처리할 Flask 앱
+            state (MonitoringState): 모니터링 상태 (카메라 관리자, 상태 발행기)
+            on_frame_served (callable): 프레임 전송 시 호출할 콜백 (시작 지연 지표 기록용)
+        """
+        self.flask_app = flask_app
+        self.state = state
+        self.on_frame_served = on_frame_served
+        self.result_feeds = {}
+        self.status_feed = None
+        self.viewers = 0
+
+        self.app = web.Application()
+        self.app.router.add_get('/video_feed', self.video_feed)
+        self.app.router.add_get('/video_feed/{camera_id}', self.video_feed)
+        self.app.router.add_get('/events', self.events)
+        self.app.router.add_route('*', '/{tail:.*}', self.handle_wsgi)
+        self.app.on_startup.append(self._on_startup)
+
+    async def _on_startup(self, app):
+        """이벤트 루프가 준비된 뒤 스레드 풀과 리스너 등록"""
+        loop = asyncio.get_running_loop()
+        loop.set_default_executor(ThreadPoolExecutor(max_workers=Config.ASYNC_WORKER_THREADS,
+                                                     thread_name_prefix='async-worker'))
+        for camera_id in self.state.cameras.camera_ids():
+            self.result_feeds[camera_id] = AsyncResultFeed(self.state.cameras.get_pipeline(camera_id), loop)
+        if hasattr(self.state, 'publisher'):
+            self.status_feed = AsyncStatusFeed(self.state.publisher, loop)
+
+    async def video_feed(self, request):
+        """비디오 스트림 제공 (스레드 모드의 /video_feed와 같은 쿼리 파라미터)"""
+        session_id = request.cookies.get('session_id')
+        if not session_id:
+            logger.warning("세션 ID 없이 비디오 피드 요청")
+            return web.Response(text="No session", status=400)
+
+        camera_id = request.match_info.get('camera_id')
+        if not self.state.cameras.has_camera(camera_id):
+            return web.Response(text="Unknown camera", status=404)
+        feed = self.result_feeds[camera_id if camera_id is not None else self.state.cameras.default_id]
+
+        rendition = None
+        if any(key in request.query for key in ('max_width', 'quality', 'max_fps')):
+            rendition = select_rendition(_query_number(request, 'max_width', int),
+                                         _query_number(request, 'quality', int),
+                                         _query_number(request, 'max_fps', float))
+
+        # 첫 시청자면 카메라 캡처를 시작하므로 이벤트 루프 밖에서 실행
+        loop = asyncio.get_running_loop()
+        session = await loop.run_in_executor(None, self.state.open_stream, session_id, camera_id)
+        logger.info(f"프레임 스트림 시작 (async): 세션 {session_id}, 카메라 {camera_id or '기본'}, "
+                    f"렌디션 {rendition}")
+
+        # 모니터링 상태가 바뀌면 대기 중인 코루틴을 깨움
+        monitoring_changed = asyncio.Event()
+        on_monitoring = lambda value: loop.call_soon_threadsafe(monitoring_changed.set)
+        session.add_listener(on_monitoring)
+
+        # 쓰기가 밀린 동안 발행된 결과는 이 시청자의 우편함에서만 최신 결과로 교체됨
+        pipeline = feed.pipeline
+        mailbox = pipeline.subscribe(session_id, camera_id, rendition.max_fps if rendition is not None else None)
+        self.viewers += 1
+        last_chunk = None
+        response = web.StreamResponse(headers={'Content-Type': 'multipart/x-mixed-replace; boundary=frame',
+                                               'Cache-Control': 'no-cache'})
+        try:
+            await response.prepare(request)
+
+            while True:
+                if not session.is_monitoring:
+                    # 모니터링이 다시 켜질 때까지 폴링 없이 대기 (대기 중에는 우편함도 결과를 받지 않음)
+                    mailbox.pause()
+                    while True:
+                        monitoring_changed.clear()
+                        if session.is_monitoring:
+                            break
+                        try:
+                            await asyncio.wait_for(monitoring_changed.wait(), Config.STREAM_IDLE_KEEPALIVE)
+                        except asyncio.TimeoutError:
+                            # 끊긴 연결을 감지하도록 마지막 프레임을 다시 전송
+                            if last_chunk is not None:
+                                await response.write(last_chunk)
+                    mailbox.resume()
+
+                result = await feed.take(mailbox)
+                if result is None:
+                    continue
+
+                try:
+                    encoded = await feed.encode(result, rendition)
+                finally:
+                    result.release()
+                if encoded is None:
+                    continue
+
+                if self.on_frame_served is not None:
+                    self.on_frame_served()
+                # 소켓 버퍼가 차면 이 시청자의 코루틴만 대기 (다른 시청자와 생산자는 계속 진행)
+                last_chunk = encoded.chunk
+                await response.write(last_chunk)
+
+        except ConnectionResetError:
+            pass
+        finally:
+            # 연결이 끊기면(쓰기 실패 또는 요청 취소) 즉시 세션 자원 해제
+            self.viewers -= 1
+            session.remove_listener(on_monitoring)
+            pipeline.unsubscribe(mailbox)
+            # 마지막 시청자면 캡처/감지 스레드를 중지하므로 이벤트 루프 밖에서 실행
+            await loop.run_in_executor(None, self.state.close_stream, session_id, camera_id)
+            logger.info(f"프레임 스트림 종료 (async): 세션 {session_id}")
+        return response
+
+    async def events(self, request):
+        """상태/거리/화질 변경 푸시 채널 (스레드 모드의 /events와 같은 형식)"""
+        session_id = request.cookies.get('session_id')
+        if not session_id:
+            return web.Response(text="No session", status=400)
+        if self.status_feed is None:
+            return web.Response(text="Status push not available", status=503)
+
+        session = self.state.get_or_create_session(session_id)
+        response = web.StreamResponse(headers={'Content-Type': 'text/event-stream',
+                                               'Cache-Control': 'no-cache',
+                                               'X-Accel-Buffering': 'no'})
+        await response.prepare(request)
+
+        publisher = self.status_feed.publisher
+        publisher.subscribers += 1
+        seen = {}
+        try:
+            await response.write(b'retry: 3000\n\n')
+            while True:
+                session.last_active = time.time()
+                events = await self.status_feed.wait_for_events(seen, Config.STATUS_PUSH_KEEPALIVE)
+                if not events:
+                    await response.write(b': keepalive\n\n')
+                    continue
+                for name, version, data in events:
+                    seen[name] = version
+                    message = f"event: {name}\nid: {version}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+                    await response.write(message.encode('utf-8'))
+
+        except ConnectionResetError:
+            pass
+        finally:
+            publisher.subscribers -= 1
+        return response
+
+    async def handle_wsgi(self, request):
+        """스트리밍 외 라우트를 Flask 앱에서 처리 (스레드 풀에서 실행)"""
+        body = await request.read()
+        environ = self._build_environ(request, body)
+        status, headers, content = await asyncio.get_running_loop().run_in_executor(
+            None, self._call_wsgi, environ)
+        return web.Response(status=status, headers=headers, body=content)
+
+    def _build_environ(self, request, body):
+        """aiohttp 요청을 WSGI environ으로 변환"""
+        host, _, port = (request.host or '127.0.0.1').partition(':')
+        environ = {
+            'REQUEST_METHOD': request.method,
+            'SCRIPT_NAME': '',
+            'PATH_INFO': request.path,
+            'QUERY_STRING': request.query_string,
+            'SERVER_NAME': host,
+            'SERVER_PORT': port or '80',
+            'SERVER_PROTOCOL': f"HTTP/{request.version.major}.{request.version.minor}",
+            'REMOTE_ADDR': request.remote or '',
+            'CONTENT_TYPE': request.headers.get('Content-Type', ''),
+            'CONTENT_LENGTH': str(len(body)),
+            'wsgi.version': (1, 0),
+            'wsgi.url_scheme': request.scheme,
+            'wsgi.input': io.BytesIO(body),
+            'wsgi.errors': sys.stderr,
+            'wsgi.multithread': True,
+            'wsgi.multiprocess': False,
+            'wsgi.run_once': False
+        }
+        for name, value in request.headers.items():
+            key = 'HTTP_' + name.upper().replace('-', '_')
+            if key in ('HTTP_CONTENT_TYPE', 'HTTP_CONTENT_LENGTH'):
+                continue
+            environ[key] = f"{environ[key]},{value}" if key in environ else value
+        return environ
+
+    def _call_wsgi(self, environ):
+        """Flask 앱 호출 후 (상태 코드, 헤더, 본문) 반환"""
+        captured = {}
+
+        def start_response(status, headers, exc_info=None):
+            captured['status'] = int(status.split(' ', 1)[0])
+            captured['headers'] = headers
+
+        iterable = self.flask_app.wsgi_app(environ, start_response)
+        try:
+            content = b''.join(iterable)
+        finally:
+            if hasattr(iterable, 'close'):
+                iterable.close()
+
+        headers = CIMultiDict((name, value) for name, value in captured['headers']
+                              if name.lower() not in _HOP_BY_HOP_HEADERS)
+        return captured['status'], headers, content
+
+    def get_stats(self):
+        """시청자 수"""
+        return {'viewers': self.viewers}
+
+def _query_number(request, name, type_):
+    """쿼리 파라미터를 숫자로 변환 (없거나 잘못된 값이면 None)"""
+    try:
+        return type_(request.query[name])
+    except (KeyError, ValueError):
+        return None
+
+def run(flask_app, state, host='127.0.0.1', port=5000, on_frame_served=None):
+    """aiohttp 서버 실행 (종료 신호까지 블록)"""
+    server = AsyncStreamingServer(flask_app, state, on_frame_served)
+    logger.info(f"비동기 스트리밍 서버 시작: http://{host}:{port} "
+                f"(WSGI 스레드 {Config.ASYNC_WORKER_THREADS}개)")
+    web.run_app(server.app, host=host, port=port, print=None)
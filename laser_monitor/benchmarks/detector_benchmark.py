@@ -0,0 +1,330 @@
+"""
+감지기 마이크로 벤치마크 (화질 프리셋 x 추론 백엔드 x 장면)
+
+각 조합마다 새 하위 프로세스에서 모델을 로드하고 다음 두 대상을 측정합니다.
+  - predict: TshirtDetector.predict (전처리 + 추론 + 박스 복원)
+  - detect_tshirt_center: 감지 + 상태 판정 + 시각화 렌더링 전체 경로
+조합마다 프로세스를 분리하므로 최대 RSS가 다른 조합의 영향을 받지 않습니다.
+
+장면:
+  - empty: 사람 없음
+  - single: 사람 1명
+  - crowd: 사람 여러 명 (--crowd-size)
+  - recorded: --frames로 지정한 녹화 동영상/이미지 디렉토리 (프리셋 해상도로 변환)
+
+결과는 JSON으로 저장되며, --baseline을 주면 저장된 기준 결과와 비교하여
+지연 시간(p50/p95/p99)이 늘었거나 처리량이 줄어든 조합을 회귀로 표시하고 종료 코드 1을 반환합니다.
+
+사용법:
+    python laser_monitor/benchmarks/detector_benchmark.py --output results.json
+    python laser_monitor/benchmarks/detector_benchmark.py --presets medium low --backends pytorch onnxruntime
+    python laser_monitor/benchmarks/detector_benchmark.py --baseline baseline.json --tolerance 0.1
+    python laser_monitor/benchmarks/detector_benchmark.py --compare results.json --baseline baseline.json
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from types import SimpleNamespace
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import Config
+
+SCENES = ('empty', 'single', 'crowd')
+TARGETS = ('predict', 'detect_tshirt_center')
+BACKENDS = ('pytorch', 'onnxruntime', 'openvino')
+LATENCY_KEYS = ('p50_ms', 'p95_ms', 'p99_ms')
+
+def _draw_person(frame, center_x, head_y, height):
+    """사람 형태 (머리 + 몸통) 그리기 (합성 소스와 같은 모양)"""
+    head_radius = max(height // 16, 2)
+    body_w = head_radius * 3
+    cv2.circle(frame, (center_x, head_y), head_radius, (90, 120, 200), -1)
+    cv2.rectangle(frame, (center_x - body_w // 2, head_y + head_radius),
+                  (center_x + body_w // 2, min(head_y + height, frame.shape[0] - 1)),
+                  (40, 40, 200), -1)
+
+def scene_generator(count):
+    """
+    사람 count명이 있는 장면의 프레임 생성 함수 (SyntheticFrameSource generator 형식)
+
+    사람들은 프레임 너비에 고르게 배치되고 프레임마다 조금씩 좌우로 움직입니다.
+    """
+    def generate(index, width, height):
+        gradient = np.linspace(40, 160, height, dtype=np.uint8)
+        frame = np.repeat(gradient[:, None, None], width, axis=1).repeat(3, axis=2)
+        if count == 0:
+            return frame
+
+        # 인원이 많을수록 작게 (멀리 서 있는 사람)
+        person_height = int(height * (0.75 if count == 1 else 0.45))
+        spacing = width / count
+        sway = int(spacing * 0.1 * np.sin(index * 0.3))
+        for person in range(count):
+            center_x = int(spacing * (person + 0.5)) + sway
+            head_y = height // 4 + (person % 2) * height // 10
+            _draw_person(frame, center_x, head_y, person_height)
+        return frame
+    return generate
+
+def _load_frames(scene, width, height, count, frames_path, crowd_size):
+    """장면 프레임을 미리 만들어 둠 (생성/디코딩 비용은 측정에서 제외)"""
+    from camera.sources import SyntheticFrameSource, PACING_FAST, open_frame_source
+
+    if scene == 'recorded':
+        source = open_frame_source(frames_path, pacing=PACING_FAST, loop=True)
+    else:
+        people = {'empty': 0, 'single': 1, 'crowd': crowd_size}[scene]
+        source = SyntheticFrameSource(width, height, 30, generator=scene_generator(people),
+                                      pacing=PACING_FAST)
+
+    frames = []
+    try:
+        for _ in range(count):
+            ret, frame = source.read()
+            if not ret:
+                break
+            if frame.shape[:2] != (height, width):
+                frame = cv2.resize(frame, (width, height), interpolation=cv2.INTER_AREA)
+            frames.append(frame)
+    finally:
+        source.release()
+    if not frames:
+        raise RuntimeError(f"장면 프레임을 읽을 수 없습니다: {scene}")
+    return frames
+
+def _peak_rss_mb():
+    """현재 프로세스의 최대 RSS (MB). 측정할 수 없으면 None"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux는 KB, macOS는 바이트 단위
+    return round(peak / (1 << 20) if sys.platform == 'darwin' else peak / 1024, 1)
+
+def _measure(func, frames, iterations, warmup):
+    """프레임을 순환하며 func 호출 지연 시간 측정"""
+    for index in range(warmup):
+        func(frames[index % len(frames)])
+
+    samples = np.empty(iterations, dtype=np.float64)
+    start = time.perf_counter()
+    for index in range(iterations):
+        frame = frames[index % len(frames)]
+        begin = time.perf_counter()
+        func(frame)
+        samples[index] = time.perf_counter() - begin
+    elapsed = time.perf_counter() - start
+
+    samples *= 1000
+    return {
+        'p50_ms': round(float(np.percentile(samples, 50)), 3),
+        'p95_ms': round(float(np.percentile(samples, 95)), 3),
+        'p99_ms': round(float(np.percentile(samples, 99)), 3),
+        'mean_ms': round(float(samples.mean()), 3),
+        'fps': round(iterations / elapsed, 2)
+    }
+
+def run_case(case):
+    """
+    한 조합 측정 (하위 프로세스에서 실행)
+
+    Args:
+        case (dict): backend, preset, scene, iterations, warmup, scene_frames, frames, crowd_size
+
+    Returns:
+        list: 대상별 측정 결과
+    """
+    from camera.detector import detector, detect_tshirt_center
+
+    preset = Config.QUALITY_PRESETS[case['preset']]
+    width, height = preset['width'], preset['height']
+    base = {
+        'backend': case['backend'],
+        'preset': case['preset'],
+        'resolution': f"{width}x{height}",
+        'scene': case['scene']
+    }
+
+    if not detector.load():
+        return [dict(base, target=target, error=detector.load_error or "모델을 로드할 수 없습니다.")
+                for target in TARGETS]
+    base['actual_backend'] = detector.backend
+
+    frames = _load_frames(case['scene'], width, height, case['scene_frames'],
+                          case['frames'], case['crowd_size'])
+    people = [int((detector.predict(frame)[:, 5] == 0).sum()) for frame in frames]
+
+    # detect_tshirt_center는 상태/거리만 기록하므로 최소한의 상태 객체 사용
+    state = SimpleNamespace(status=None, distance=0)
+    results = []
+    for target in TARGETS:
+        if target == 'predict':
+            func = detector.predict
+        else:
+            func = lambda frame: detect_tshirt_center(frame, state)
+        stats = _measure(func, frames, case['iterations'], case['warmup'])
+        results.append(dict(base, target=target, people=round(float(np.mean(people)), 2), **stats))
+
+    # 최대 RSS는 프로세스 단위이므로 두 대상을 모두 측정한 뒤의 값을 함께 기록
+    peak_rss = _peak_rss_mb()
+    for result in results:
+        result['peak_rss_mb'] = peak_rss
+    return results
+
+def _run_case_subprocess(case, timeout):
+    """조합을 새 하위 프로세스에서 측정"""
+    env = dict(os.environ, INFERENCE_BACKEND=case['backend'], INFERENCE_WORKERS='0')
+    process = subprocess.run([sys.executable, os.path.abspath(__file__), '--case', json.dumps(case)],
+                             env=env, capture_output=True, text=True, timeout=timeout)
+    for line in process.stdout.splitlines():
+        if line.startswith('{'):
+            return json.loads(line)['results']
+
+    error = (process.stderr.strip().splitlines() or [f"종료 코드 {process.returncode}"])[-1]
+    return [{'backend': case['backend'], 'preset': case['preset'], 'scene': case['scene'],
+             'target': target, 'error': error} for target in TARGETS]
+
+def _case_key(result):
+    return (result['backend'], result['preset'], result['scene'], result['target'])
+
+def compare(results, baseline, tolerance):
+    """
+    기준 결과와 비교하여 회귀 목록 반환
+
+    지연 시간(p50/p95/p99)이 기준보다 tolerance 비율 이상 늘었거나
+    처리량(fps)이 tolerance 비율 이상 줄어든 항목을 회귀로 판단합니다.
+
+    Returns:
+        list: (조합 키, 지표, 기준값, 현재값, 변화율) 목록
+    """
+    baseline_map = {_case_key(result): result for result in baseline['results'] if 'error' not in result}
+    regressions = []
+    for result in results['results']:
+        previous = baseline_map.get(_case_key(result))
+        if previous is None or 'error' in result:
+            continue
+        for key in LATENCY_KEYS:
+            if previous[key] > 0 and result[key] > previous[key] * (1 + tolerance):
+                regressions.append((_case_key(result), key, previous[key], result[key],
+                                    result[key] / previous[key] - 1))
+        if previous['fps'] > 0 and result['fps'] < previous['fps'] * (1 - tolerance):
+            regressions.append((_case_key(result), 'fps', previous['fps'], result['fps'],
+                                result['fps'] / previous['fps'] - 1))
+    return regressions
+
+def _print_results(results):
+    print(f"{'backend':20} {'preset':7} {'scene':9} {'target':21} {'people':>6} | "
+          f"{'p50':>8} {'p95':>8} {'p99':>8} {'fps':>8} | {'RSS MB':>7}")
+    for result in results:
+        if 'error' in result:
+            print(f"{result['backend']:20} {result['preset']:7} {result['scene']:9} "
+                  f"{result['target']:21} 오류: {result['error']}")
+            continue
+        backend = result['backend']
+        if result.get('actual_backend') not in (None, backend):
+            backend = f"{backend}->{result['actual_backend']}"
+        print(f"{backend:20} {result['preset']:7} {result['scene']:9} {result['target']:21} "
+              f"{result['people']:>6} | {result['p50_ms']:>8.2f} {result['p95_ms']:>8.2f} "
+              f"{result['p99_ms']:>8.2f} {result['fps']:>8.1f} | {result['peak_rss_mb'] or '-':>7}")
+
+def _print_regressions(regressions, tolerance):
+    if not regressions:
+        print(f"회귀 없음 (허용 오차 {tolerance:.0%})")
+        return
+    print(f"회귀 {len(regressions)}건 (허용 오차 {tolerance:.0%}):")
+    for key, metric, previous, current, change in regressions:
+        print(f"  {'/'.join(key)} {metric}: {previous} -> {current} ({change:+.1%})")
+
+def _metadata(args):
+    return {
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'opencv': cv2.__version__,
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'model': Config.YOLO_MODEL_PATH,
+        'inference_size': Config.INFERENCE_SIZE,
+        'inference_interpolation': Config.INFERENCE_INTERPOLATION,
+        'iterations': args.iterations,
+        'warmup': args.warmup,
+        'crowd_size': args.crowd_size,
+        'frames': args.frames
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="감지기 마이크로 벤치마크")
+    parser.add_argument('--presets', nargs='+', default=list(Config.QUALITY_PRESETS.keys()),
+                        choices=list(Config.QUALITY_PRESETS.keys()))
+    parser.add_argument('--backends', nargs='+', default=['pytorch'], choices=BACKENDS)
+    parser.add_argument('--scenes', nargs='+', default=list(SCENES), choices=SCENES + ('recorded',))
+    parser.add_argument('--frames', help="recorded 장면에 사용할 녹화 동영상 또는 이미지 디렉토리")
+    parser.add_argument('--crowd-size', type=int, default=8, help="crowd 장면의 인원 수")
+    parser.add_argument('--iterations', type=int, default=100)
+    parser.add_argument('--warmup', type=int, default=5)
+    parser.add_argument('--scene-frames', type=int, default=16, help="장면마다 순환할 프레임 수")
+    parser.add_argument('--timeout', type=float, default=1800.0, help="조합당 최대 실행 시간(초)")
+    parser.add_argument('--output', help="결과 JSON 저장 경로")
+    parser.add_argument('--baseline', help="비교할 기준 결과 JSON")
+    parser.add_argument('--compare', help="측정 없이 이 결과 JSON을 --baseline과 비교")
+    parser.add_argument('--tolerance', type=float, default=0.10, help="회귀 허용 비율 (기본값: 0.10)")
+    parser.add_argument('--case', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.case:
+        # 하위 프로세스: 한 조합을 측정하여 JSON 한 줄로 출력
+        print(json.dumps({'results': run_case(json.loads(args.case))}))
+        return 0
+
+    if args.compare:
+        if not args.baseline:
+            parser.error("--compare에는 --baseline이 필요합니다.")
+        with open(args.compare, encoding='utf-8') as f:
+            results = json.load(f)
+    else:
+        if 'recorded' in args.scenes and not args.frames:
+            parser.error("recorded 장면에는 --frames가 필요합니다.")
+
+        results = {'metadata': _metadata(args), 'results': []}
+        for backend in args.backends:
+            for preset in args.presets:
+                for scene in args.scenes:
+                    case = {
+                        'backend': backend,
+                        'preset': preset,
+                        'scene': scene,
+                        'iterations': args.iterations,
+                        'warmup': args.warmup,
+                        'scene_frames': args.scene_frames,
+                        'frames': args.frames,
+                        'crowd_size': args.crowd_size
+                    }
+                    print(f"측정 중: {backend} / {preset} / {scene}", file=sys.stderr)
+                    results['results'].extend(_run_case_subprocess(case, args.timeout))
+
+        if args.output:
+            with open(args.output, 'w', encoding='utf-8') as f:
+                json.dump(results, f, ensure_ascii=False, indent=2)
+            print(f"결과 저장: {args.output}", file=sys.stderr)
+
+    _print_results(results['results'])
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance)
+        _print_regressions(regressions, args.tolerance)
+        return 1 if regressions else 0
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,170 @@
+"""
+화질 프리셋별 추론 전처리(축소) 지연 시간과 전체 추론 결과 비교
+
+각 프리셋 해상도의 프레임으로 다음을 측정합니다.
+  - preprocess: TshirtDetector.preprocess (INFERENCE_SIZE로 한 번 축소)
+  - predict(full): 원본 해상도 프레임을 그대로 모델에 전달 (INFERENCE_SIZE=0)
+  - predict(scaled): 축소 후 추론하고 박스를 원본 해상도로 복원
+  - FPS full/scaled: 두 방식의 평균 지연 시간으로 계산한 단일 스레드 감지 처리량
+  - boxes full/scaled, IoU: 두 방식의 감지 박스 수와 서로 대응하는 박스의 평균 IoU
+
+합성 프레임에는 사람이 없으므로 감지 결과 비교에는 --images로 실제 사진을 지정합니다.
+(사진은 각 프리셋 해상도로 크기를 바꿔 사용)
+YOLO 모델이 없으면 전처리 단계만 측정합니다.
+
+사용법:
+    python laser_monitor/benchmarks/preprocess_latency.py [--presets ultra high] [--iterations 100]
+    python laser_monitor/benchmarks/preprocess_latency.py --images people1.jpg people2.jpg
+"""
+import argparse
+import os
+import sys
+import time
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import Config
+from camera.sources import SyntheticFrameSource, PACING_FAST
+from camera.detector import detector
+
+def _measure(func, iterations):
+    """func를 반복 실행하여 호출당 지연 시간(ms) 목록 반환 (첫 호출은 워밍업)"""
+    func()
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+def _summary(samples):
+    """평균/p95 (ms)"""
+    if not samples:
+        return '-'
+    return f"{np.mean(samples):7.2f} / {np.percentile(samples, 95):7.2f}"
+
+def _fps(samples):
+    """평균 지연 시간 기준 초당 처리 프레임 수"""
+    return f"{1000.0 / np.mean(samples):.1f}" if samples else '-'
+
+def _iou(a, b):
+    """두 박스 (x1, y1, x2, y2)의 IoU"""
+    width = min(a[2], b[2]) - max(a[0], b[0])
+    height = min(a[3], b[3]) - max(a[1], b[1])
+    if width <= 0 or height <= 0:
+        return 0.0
+    inter = width * height
+    union = (a[2] - a[0]) * (a[3] - a[1]) + (b[2] - b[0]) * (b[3] - b[1]) - inter
+    return inter / union if union > 0 else 0.0
+
+def _compare_boxes(full, scaled):
+    """
+    원본/축소 추론 박스를 IoU가 큰 순서로 짝지어 비교
+
+    Returns:
+        tuple: (원본 박스 수, 축소 박스 수, 짝지어진 박스들의 IoU 목록)
+    """
+    full = [] if full is None else full
+    scaled = [] if scaled is None else scaled
+    pairs = sorted(((_iou(a, b), i, j) for i, a in enumerate(full) for j, b in enumerate(scaled)),
+                   reverse=True)
+    used_full, used_scaled, ious = set(), set(), []
+    for iou, i, j in pairs:
+        if iou <= 0 or i in used_full or j in used_scaled:
+            continue
+        used_full.add(i)
+        used_scaled.add(j)
+        ious.append(iou)
+    return len(full), len(scaled), ious
+
+def _load_frames(images, preset):
+    """프리셋 해상도의 입력 프레임 목록 (사진이 없으면 합성 프레임 하나)"""
+    if not images:
+        source = SyntheticFrameSource(preset['width'], preset['height'], preset['fps'],
+                                      pacing=PACING_FAST)
+        _, frame = source.read()
+        return [frame]
+
+    frames = []
+    for path in images:
+        image = cv2.imread(path)
+        if image is None:
+            print(f"이미지를 읽을 수 없습니다: {path}")
+            continue
+        frames.append(cv2.resize(image, (preset['width'], preset['height']),
+                                 interpolation=cv2.INTER_AREA))
+    return frames
+
+def run(presets, iterations, size, images=None):
+    """프리셋별 측정 결과 출력"""
+    model_available = detector.load()
+    original_size = Config.INFERENCE_SIZE
+
+    print(f"백엔드={detector.backend if model_available else '없음'}, OpenCV {cv2.__version__}, "
+          f"INFERENCE_SIZE={size}, 보간={Config.INFERENCE_INTERPOLATION}, 반복={iterations}, "
+          f"입력={'사진 %d장' % len(images) if images else '합성 프레임'}")
+    print(f"{'preset':8} {'resolution':>11} | {'preprocess ms (avg/p95)':>24} | "
+          f"{'predict(full)':>18} | {'predict(scaled)':>18} | {'FPS full/scaled':>15} | "
+          f"{'boxes full/scaled':>17} | {'IoU':>5}")
+
+    try:
+        for name in presets:
+            preset = Config.QUALITY_PRESETS[name]
+            frames = _load_frames(images, preset)
+            if not frames:
+                continue
+            # 프레임마다 iterations회씩 측정
+            per_frame = max(iterations // len(frames), 1)
+
+            Config.INFERENCE_SIZE = size
+            preprocess = [sample for frame in frames
+                          for sample in _measure(lambda: detector.preprocess(frame), per_frame)]
+
+            full = scaled = []
+            boxes = '-'
+            iou = '-'
+            if model_available:
+                scaled = [sample for frame in frames
+                          for sample in _measure(lambda: detector.predict(frame), per_frame)]
+                scaled_boxes = [detector.predict(frame) for frame in frames]
+                Config.INFERENCE_SIZE = 0
+                full = [sample for frame in frames
+                        for sample in _measure(lambda: detector.predict(frame), per_frame)]
+                full_boxes = [detector.predict(frame) for frame in frames]
+
+                full_count = scaled_count = 0
+                ious = []
+                for full_result, scaled_result in zip(full_boxes, scaled_boxes):
+                    count_full, count_scaled, matched = _compare_boxes(full_result, scaled_result)
+                    full_count += count_full
+                    scaled_count += count_scaled
+                    ious.extend(matched)
+                boxes = f"{full_count}/{scaled_count}"
+                iou = f"{np.mean(ious):.2f}" if ious else '-'
+
+            fps = f"{_fps(full)}/{_fps(scaled)}" if model_available else '-'
+            print(f"{name:8} {preset['width']:>5}x{preset['height']:<5} | {_summary(preprocess):>24} | "
+                  f"{_summary(full):>18} | {_summary(scaled):>18} | {fps:>15} | {boxes:>17} | {iou:>5}")
+    finally:
+        Config.INFERENCE_SIZE = original_size
+
+    if not model_available:
+        print("YOLO 모델이 없어 추론 지연 시간은 측정하지 않았습니다.")
+
+def main():
+    parser = argparse.ArgumentParser(description="화질 프리셋별 추론 전처리 지연 시간 비교")
+    parser.add_argument('--presets', nargs='+', default=list(Config.QUALITY_PRESETS.keys()),
+                        choices=list(Config.QUALITY_PRESETS.keys()))
+    parser.add_argument('--iterations', type=int, default=50)
+    parser.add_argument('--size', type=int, default=Config.INFERENCE_SIZE or 640,
+                        help="모델 입력 긴 변 크기 (픽셀)")
+    parser.add_argument('--images', nargs='+', default=None,
+                        help="감지 결과 비교에 사용할 사진 경로 (기본값: 합성 프레임)")
+    args = parser.parse_args()
+    run(args.presets, args.iterations, args.size, args.images)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,121 @@
+"""
+시작 지연 시간 측정 (프로세스 시작 -> 첫 프레임 전송 / 모델 준비 / 첫 감지 프레임)
+
+app.py를 하위 프로세스로 실행하고 외부에서 다음을 측정합니다.
+  - listen: /healthz가 처음 응답한 시점
+  - first_frame: /video_feed에서 첫 JPEG 프레임을 받은 시점
+  - ready: /readyz가 처음 200을 반환한 시점
+서버가 기록한 time_to_first_frame / time_to_first_detection_frame도 함께 출력합니다.
+
+사용법:
+    python laser_monitor/benchmarks/startup_latency.py [--runs 3] [--source synthetic:1280x720@30]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+
+APP_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'app.py')
+BASE_URL = 'http://127.0.0.1:5000'
+
+def _get(path, headers=None, timeout=2.0):
+    """GET 요청 (HTTP 오류 응답도 반환)"""
+    request = urllib.request.Request(BASE_URL + path, headers=headers or {})
+    try:
+        return urllib.request.urlopen(request, timeout=timeout)
+    except urllib.error.HTTPError as e:
+        return e
+
+def _wait_until(predicate, deadline):
+    """predicate가 참이 될 때까지 폴링. 성공 여부 반환"""
+    while time.perf_counter() < deadline:
+        try:
+            if predicate():
+                return True
+        except (urllib.error.URLError, ConnectionError, OSError):
+            pass
+        time.sleep(0.02)
+    return False
+
+def _read_stream(cookie, marks, start, stop_event):
+    """비디오 피드를 계속 읽으며 첫 JPEG 수신 시점 기록"""
+    try:
+        response = _get('/video_feed', {'Cookie': cookie}, timeout=30.0)
+        while not stop_event.is_set():
+            chunk = response.read(65536)
+            if not chunk:
+                break
+            if 'first_frame' not in marks and b'\xff\xd8' in chunk:
+                marks['first_frame'] = time.perf_counter() - start
+    except Exception:
+        pass
+
+def run_once(env, timeout):
+    """서버를 한 번 시작하여 측정"""
+    marks = {}
+    stop_event = threading.Event()
+    start = time.perf_counter()
+    process = subprocess.Popen([sys.executable, APP_PATH], env=env,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = start + timeout
+    try:
+        if not _wait_until(lambda: _get('/healthz').status == 200, deadline):
+            raise RuntimeError("서버가 시간 내에 시작되지 않았습니다.")
+        marks['listen'] = time.perf_counter() - start
+
+        # 세션 쿠키를 받은 뒤 스트림 읽기 시작
+        cookie = _get('/').headers.get('Set-Cookie', '').split(';')[0]
+        reader = threading.Thread(target=_read_stream, args=(cookie, marks, start, stop_event),
+                                  daemon=True)
+        reader.start()
+
+        if _wait_until(lambda: _get('/readyz').status == 200, deadline):
+            marks['ready'] = time.perf_counter() - start
+
+        # 모델 준비 후 첫 감지 프레임이 전송될 시간을 잠시 줌
+        _wait_until(lambda: json.load(_get('/readyz')).get('time_to_first_detection_frame') is not None,
+                    min(deadline, time.perf_counter() + 5.0))
+        server = json.load(_get('/readyz'))
+        marks['server_first_frame'] = server.get('time_to_first_frame')
+        marks['server_first_detection_frame'] = server.get('time_to_first_detection_frame')
+        marks['phase'] = server.get('phase')
+        return marks
+    finally:
+        stop_event.set()
+        process.terminate()
+        try:
+            process.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+def _median(runs, key):
+    values = [run[key] for run in runs if run.get(key) is not None]
+    return f"{statistics.median(values):.3f}" if values else '-'
+
+def main():
+    parser = argparse.ArgumentParser(description="시작 지연 시간 측정")
+    parser.add_argument('--runs', type=int, default=3)
+    parser.add_argument('--source', default='synthetic:1280x720@30',
+                        help="CAMERA_SOURCES 값 (기본값: 합성 프레임)")
+    parser.add_argument('--timeout', type=float, default=120.0)
+    args = parser.parse_args()
+
+    env = dict(os.environ, DEBUG='False', CAMERA_SOURCES=args.source)
+    runs = []
+    for index in range(args.runs):
+        marks = run_once(env, args.timeout)
+        runs.append(marks)
+        print(f"run {index + 1}: " + ", ".join(f"{key}={value}" for key, value in marks.items()))
+
+    print("median (초): " + ", ".join(
+        f"{key}={_median(runs, key)}"
+        for key in ('listen', 'first_frame', 'ready', 'server_first_frame', 'server_first_detection_frame')))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,153 @@
+"""
+스트림 동시 시청자 부하 테스트 (스레드 모드 vs 비동기 모드)
+
+app.py를 지정한 서버 모드로 하위 프로세스 실행한 뒤, N개의 MJPEG 시청자를
+하나의 asyncio 이벤트 루프에서 raw 소켓으로 동시에 연결하여 다음을 측정합니다.
+  - 시청자별 수신 FPS (중앙값/최소), 전체 수신 대역폭
+  - 연결에 성공한 시청자 수
+  - 서버 프로세스의 스레드 수와 RSS (/proc/<pid>/status, Linux)
+
+사용법:
+    python laser_monitor/benchmarks/stream_load.py --mode async --clients 200
+    python laser_monitor/benchmarks/stream_load.py --mode threaded --clients 200 --query max_width=640
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+
+APP_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'app.py')
+HOST = '127.0.0.1'
+PORT = 5000
+BOUNDARY = b'--frame\r\n'
+
+def _wait_for_server(process, timeout):
+    """/healthz가 응답할 때까지 대기"""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError("서버 프로세스가 종료되었습니다.")
+        try:
+            urllib.request.urlopen(f"http://{HOST}:{PORT}/healthz", timeout=1.0)
+            return
+        except (urllib.error.URLError, ConnectionError, OSError):
+            time.sleep(0.1)
+    raise RuntimeError("서버가 시간 내에 시작되지 않았습니다.")
+
+def _session_cookie():
+    """메인 페이지에서 세션 쿠키 발급"""
+    response = urllib.request.urlopen(f"http://{HOST}:{PORT}/", timeout=10.0)
+    return response.headers.get('Set-Cookie', '').split(';')[0]
+
+def _process_stats(pid):
+    """서버 프로세스의 스레드 수와 RSS(MB)"""
+    stats = {}
+    try:
+        with open(f"/proc/{pid}/status") as status:
+            for line in status:
+                if line.startswith('Threads:'):
+                    stats['threads'] = int(line.split()[1])
+                elif line.startswith('VmRSS:'):
+                    stats['rss_mb'] = round(int(line.split()[1]) / 1024, 1)
+    except OSError:
+        pass
+    return stats
+
+async def _viewer(cookie, path, stats, stop_event):
+    """MJPEG 시청자 하나: 프레임 경계를 세며 스트림을 계속 읽음"""
+    try:
+        reader, writer = await asyncio.open_connection(HOST, PORT)
+    except OSError:
+        stats['failed'] = True
+        return
+    try:
+        writer.write(f"GET {path} HTTP/1.1\r\nHost: {HOST}:{PORT}\r\nCookie: {cookie}\r\n\r\n".encode())
+        await writer.drain()
+        tail = b''
+        while not stop_event.is_set():
+            chunk = await reader.read(262144)
+            if not chunk:
+                break
+            stats['bytes'] += len(chunk)
+            data = tail + chunk
+            stats['frames'] += data.count(BOUNDARY)
+            tail = data[-(len(BOUNDARY) - 1):]
+    except (ConnectionError, OSError):
+        pass
+    finally:
+        writer.close()
+
+async def _run_clients(cookies, path, warmup, duration, pid):
+    """시청자를 동시에 연결하고 워밍업 이후 구간만 집계"""
+    stop_event = asyncio.Event()
+    viewers = [{'frames': 0, 'bytes': 0, 'failed': False} for _ in cookies]
+    tasks = [asyncio.create_task(_viewer(cookie, path, stats, stop_event))
+             for cookie, stats in zip(cookies, viewers)]
+
+    await asyncio.sleep(warmup)
+    start_counts = [(stats['frames'], stats['bytes']) for stats in viewers]
+    start = time.perf_counter()
+    await asyncio.sleep(duration)
+    elapsed = time.perf_counter() - start
+    server = _process_stats(pid)
+
+    stop_event.set()
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+    fps = [(stats['frames'] - frames) / elapsed for stats, (frames, _) in zip(viewers, start_counts)]
+    total_bytes = sum(stats['bytes'] - sent for stats, (_, sent) in zip(viewers, start_counts))
+    return {
+        'connected': sum(1 for stats in viewers if not stats['failed'] and stats['frames'] > 0),
+        'fps_median': round(statistics.median(fps), 2) if fps else 0.0,
+        'fps_min': round(min(fps), 2) if fps else 0.0,
+        'mb_per_s': round(total_bytes / elapsed / (1024 * 1024), 2),
+        **server
+    }
+
+def run(mode, clients, source, query, warmup, duration, timeout):
+    """서버를 한 번 시작하여 측정"""
+    env = dict(os.environ, DEBUG='False', CAMERA_SOURCES=source, SERVER_MODE=mode)
+    process = subprocess.Popen([sys.executable, APP_PATH], env=env,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        _wait_for_server(process, timeout)
+        cookies = [_session_cookie() for _ in range(clients)]
+        idle = _process_stats(process.pid)
+        path = '/video_feed' + (f"?{query}" if query else '')
+        result = asyncio.run(_run_clients(cookies, path, warmup, duration, process.pid))
+        result['idle_threads'] = idle.get('threads')
+        result['idle_rss_mb'] = idle.get('rss_mb')
+        return result
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+def main():
+    parser = argparse.ArgumentParser(description="스트림 동시 시청자 부하 테스트")
+    parser.add_argument('--mode', choices=('threaded', 'async'), default='async')
+    parser.add_argument('--clients', type=int, default=100)
+    parser.add_argument('--source', default='synthetic:1280x720@30',
+                        help="CAMERA_SOURCES 값 (기본값: 합성 프레임)")
+    parser.add_argument('--query', default='', help="/video_feed 쿼리 문자열 (예: max_width=640)")
+    parser.add_argument('--warmup', type=float, default=5.0)
+    parser.add_argument('--duration', type=float, default=15.0)
+    parser.add_argument('--timeout', type=float, default=120.0)
+    args = parser.parse_args()
+
+    result = run(args.mode, args.clients, args.source, args.query,
+                 args.warmup, args.duration, args.timeout)
+    print(json.dumps(dict(mode=args.mode, clients=args.clients, **result), ensure_ascii=False))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,326 @@
+import cv2
+import hashlib
+import numpy as np
+import os
+import shutil
+import threading
+from collections import namedtuple
+from config import Config
+from utils.logger import logger
+
+# 추론 백엔드
+BACKEND_PYTORCH = 'pytorch'          # ultralytics YOLO (PyTorch)
+BACKEND_ONNXRUNTIME = 'onnxruntime'  # ONNX Runtime CPU
+BACKEND_OPENVINO = 'openvino'        # OpenVINO CPU
+
+# ultralytics 결과와 같은 형태 (result.boxes.data: (N, 6) [x1, y1, x2, y2, confidence, class_id])
+Boxes = namedtuple('Boxes', ['data'])
+BackendResult = namedtuple('BackendResult', ['boxes'])
+
+class ExportedYoloBackend:
+    """
+    내보낸(export) YOLOv8 감지 모델을 실행하는 CPU 백엔드 기본 클래스
+
+    ultralytics YOLO 객체처럼 model(images, conf=..., verbose=False)로 호출하며,
+    레터박스 전처리, 박스 디코딩, 클래스별 NMS를 직접 수행하여
+    ultralytics와 같은 boxes.data 형식의 결과 목록을 반환합니다.
+    """
+
+    # ultralytics 기본값과 동일
+    IOU_THRESHOLD = 0.7
+    MAX_DETECTIONS = 300
+    PAD_VALUE = 114
+
+    def __init__(self, model_path, input_size):
+        """
+        초기화
+
+        Args:
+            model_path (str): 내보낸 모델 경로
+            input_size (int): 모델 입력 크기 (정사각형, 32의 배수)
+        """
+        self.model_path = model_path
+        self.input_size = input_size
+        self._local = threading.local()
+
+    def __call__(self, source, conf=0.25, verbose=False, **kwargs):
+        images = source if isinstance(source, list) else [source]
+        batch, letterboxes = self._prepare(images)
+        output = self._infer(batch)
+        return [BackendResult(Boxes(self._decode(prediction, conf, letterbox, image.shape)))
+                for prediction, letterbox, image in zip(output, letterboxes, images)]
+
+    def _infer(self, batch):
+        """
+        하위 클래스에서 모델 실행
+
+        Args:
+            batch (np.ndarray): (B, 3, S, S) float32 입력
+
+        Returns:
+            np.ndarray: (B, 4 + 클래스 수, 앵커 수) 원시 출력
+        """
+        raise NotImplementedError
+
+    def _prepare(self, images):
+        """레터박스 + BGR->RGB + HWC->CHW + 정규화 (스레드별 입력 텐서 재사용)"""
+        size = self.input_size
+        shape = (len(images), 3, size, size)
+        batch = getattr(self._local, 'batch', None)
+        if batch is None or batch.shape != shape:
+            batch = np.empty(shape, dtype=np.float32)
+            self._local.batch = batch
+            self._local.canvas = np.empty((size, size, 3), dtype=np.uint8)
+        canvas = self._local.canvas
+
+        letterboxes = []
+        for index, image in enumerate(images):
+            height, width = image.shape[:2]
+            gain = min(size / height, size / width)
+            new_width, new_height = int(round(width * gain)), int(round(height * gain))
+            pad_x, pad_y = (size - new_width) // 2, (size - new_height) // 2
+
+            canvas.fill(self.PAD_VALUE)
+            target = canvas[pad_y:pad_y + new_height, pad_x:pad_x + new_width]
+            if (new_width, new_height) != (width, height):
+                cv2.resize(image, (new_width, new_height), dst=target, interpolation=cv2.INTER_LINEAR)
+            else:
+                target[...] = image
+
+            # (S, S, BGR) -> (RGB, S, S), 0~1 범위
+            np.multiply(canvas[:, :, ::-1].transpose(2, 0, 1), 1.0 / 255.0, out=batch[index])
+            letterboxes.append((gain, pad_x, pad_y))
+
+        return batch, letterboxes
+
+    def _decode(self, prediction, conf, letterbox, image_shape):
+        """
+        원시 출력 한 장을 (N, 6) 박스 배열로 변환
+
+        Args:
+            prediction (np.ndarray): (4 + 클래스 수, 앵커 수) 출력 [cx, cy, w, h, class scores...]
+            conf (float): 신뢰도 임계값
+            letterbox (tuple): (gain, pad_x, pad_y)
+            image_shape (tuple): 원본 입력 이미지 형상
+
+        Returns:
+            np.ndarray: 신뢰도 내림차순 (N, 6) float32 배열 [x1, y1, x2, y2, confidence, class_id]
+        """
+        scores = prediction[4:]
+        class_ids = scores.argmax(axis=0)
+        confidences = scores[class_ids, np.arange(scores.shape[1])]
+        keep = confidences > conf
+        if not keep.any():
+            return np.empty((0, 6), dtype=np.float32)
+
+        cx, cy, w, h = prediction[:4, keep]
+        boxes = np.stack((cx - w / 2, cy - h / 2, cx + w / 2, cy + h / 2), axis=1)
+        confidences = confidences[keep]
+        class_ids = class_ids[keep]
+
+        keep = self._nms(boxes, confidences, class_ids)[:self.MAX_DETECTIONS]
+        boxes, confidences, class_ids = boxes[keep], confidences[keep], class_ids[keep]
+
+        # 레터박스 좌표를 입력 이미지 좌표로 복원
+        gain, pad_x, pad_y = letterbox
+        boxes[:, [0, 2]] -= pad_x
+        boxes[:, [1, 3]] -= pad_y
+        boxes /= gain
+        boxes[:, [0, 2]] = boxes[:, [0, 2]].clip(0, image_shape[1])
+        boxes[:, [1, 3]] = boxes[:, [1, 3]].clip(0, image_shape[0])
+
+        return np.column_stack((boxes, confidences, class_ids)).astype(np.float32)
+
+    def _nms(self, boxes, confidences, class_ids):
+        """클래스별 NMS (클래스마다 좌표를 오프셋하여 한 번에 처리). 유지할 인덱스를 신뢰도 내림차순으로 반환"""
+        offset_boxes = boxes + (class_ids * (self.input_size + 1))[:, None]
+        x1, y1, x2, y2 = offset_boxes.T
+        areas = (x2 - x1) * (y2 - y1)
+        order = confidences.argsort()[::-1]
+
+        keep = []
+        while order.size:
+            index = order[0]
+            keep.append(index)
+            rest = order[1:]
+            inter_w = np.clip(np.minimum(x2[index], x2[rest]) - np.maximum(x1[index], x1[rest]), 0, None)
+            inter_h = np.clip(np.minimum(y2[index], y2[rest]) - np.maximum(y1[index], y1[rest]), 0, None)
+            inter = inter_w * inter_h
+            iou = inter / (areas[index] + areas[rest] - inter + 1e-9)
+            order = rest[iou <= self.IOU_THRESHOLD]
+        return np.array(keep, dtype=np.int64)
+
+class OnnxRuntimeBackend(ExportedYoloBackend):
+    """ONNX Runtime CPU 백엔드"""
+
+    def __init__(self, model_path, input_size):
+        super().__init__(model_path, input_size)
+        import onnxruntime
+
+        options = onnxruntime.SessionOptions()
+        if Config.INFERENCE_THREADS > 0:
+            options.intra_op_num_threads = Config.INFERENCE_THREADS
+        self._session = onnxruntime.InferenceSession(model_path, sess_options=options,
+                                                     providers=['CPUExecutionProvider'])
+        self._input_name = self._session.get_inputs()[0].name
+
+    def _infer(self, batch):
+        return self._session.run(None, {self._input_name: batch})[0]
+
+class OpenVinoBackend(ExportedYoloBackend):
+    """OpenVINO CPU 백엔드"""
+
+    def __init__(self, model_path, input_size):
+        super().__init__(model_path, input_size)
+        import openvino
+
+        core = openvino.Core()
+        config = {'PERFORMANCE_HINT': 'LATENCY'}
+        if Config.INFERENCE_THREADS > 0:
+            config['INFERENCE_NUM_THREADS'] = Config.INFERENCE_THREADS
+        model = core.read_model(model_path)
+        # 이전에 배치 크기 1로 고정해 내보낸 캐시 모델은 항목별로 나눠 추론
+        self._static_batch = not model.input(0).get_partial_shape()[0].is_dynamic
+        self._compiled = core.compile_model(model, 'CPU', config)
+        self._output = self._compiled.output(0)
+        # 컴파일된 모델의 추론 요청은 스레드 간에 공유하지 않음
+        self._lock = threading.Lock()
+
+    def _infer(self, batch):
+        with self._lock:
+            if self._static_batch and len(batch) > 1:
+                return np.concatenate([self._compiled([batch[index:index + 1]])[self._output]
+                                       for index in range(len(batch))])
+            return self._compiled([batch])[self._output]
+
+# 백엔드별 (ultralytics export 형식, 캐시 파일 확장자, 클래스)
+EXPORT_FORMATS = {
+    BACKEND_ONNXRUNTIME: ('onnx', '.onnx', OnnxRuntimeBackend),
+    BACKEND_OPENVINO: ('openvino', '_openvino_model', OpenVinoBackend)
+}
+
+def model_input_size(size=None):
+    """모델 입력 크기 (32의 배수로 올림, 0이면 640)"""
+    size = size if size is not None else Config.INFERENCE_SIZE
+    if size <= 0:
+        size = 640
+    return int(np.ceil(size / 32) * 32)
+
+def _model_hash(model_path):
+    """모델 파일 내용 해시 (앞 16자리)"""
+    digest = hashlib.sha256()
+    with open(model_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()[:16]
+
+def cached_export_path(backend, model_path, input_size):
+    """모델 해시와 입력 크기를 키로 하는 내보내기 캐시 경로"""
+    _, suffix, _ = EXPORT_FORMATS[backend]
+    name = os.path.splitext(os.path.basename(model_path))[0]
+    key = f"{name}-{_model_hash(model_path)}-{input_size}"
+    return os.path.join(Config.MODEL_CACHE_DIR, key + suffix)
+
+def _export(backend, model_path, input_size, cache_path):
+    """ultralytics로 모델을 내보내고 캐시 경로로 이동"""
+    from ultralytics import YOLO
+
+    export_format, _, _ = EXPORT_FORMATS[backend]
+    logger.info(f"모델 내보내기 시작: {model_path} -> {export_format} (입력 {input_size})")
+    # predict_batch()가 여러 프레임을 한 번에 넣을 수 있도록 배치 차원을 동적으로 내보냄
+    exported = YOLO(model_path, verbose=False).export(format=export_format, imgsz=input_size,
+                                                      dynamic=True)
+
+    os.makedirs(Config.MODEL_CACHE_DIR, exist_ok=True)
+    # 다른 프로세스가 반쯤 쓴 캐시를 읽지 않도록 프로세스별 임시 경로로 옮긴 뒤 이름 변경
+    temp_path = f"{cache_path}.{os.getpid()}.tmp"
+    if os.path.exists(temp_path):
+        shutil.rmtree(temp_path) if os.path.isdir(temp_path) else os.remove(temp_path)
+    shutil.move(str(exported), temp_path)
+    os.replace(temp_path, cache_path)
+    logger.info(f"모델 내보내기 완료: {cache_path}")
+
+def _openvino_xml(cache_path):
+    """OpenVINO 내보내기 디렉토리의 .xml 모델 파일 경로"""
+    for filename in os.listdir(cache_path):
+        if filename.endswith('.xml'):
+            return os.path.join(cache_path, filename)
+    raise FileNotFoundError(f"OpenVINO 모델(.xml)이 없습니다: {cache_path}")
+
+def prepare_backend(backend, model_path, input_size=None):
+    """
+    내보낸 모델을 캐시에 준비 (이미 있으면 내보내지 않음)
+
+    추론 워커 풀은 워커를 시작하기 전에 부모 프로세스에서 한 번 호출하므로,
+    여러 워커가 동시에 같은 경로로 내보내지 않습니다.
+
+    Returns:
+        str: 캐시 경로. 준비 실패 시 None
+    """
+    if backend not in EXPORT_FORMATS:
+        logger.error(f"알 수 없는 추론 백엔드: {backend}")
+        return None
+
+    try:
+        input_size = model_input_size(input_size)
+        if not os.path.isfile(model_path):
+            # 모델 파일이 없으면 ultralytics가 내려받도록 한 번 로드
+            from ultralytics import YOLO
+            YOLO(model_path, verbose=False)
+
+        cache_path = cached_export_path(backend, model_path, input_size)
+        if os.path.exists(cache_path):
+            logger.info(f"캐시된 모델 사용: {cache_path}")
+        else:
+            _export(backend, model_path, input_size, cache_path)
+        return cache_path
+
+    except ImportError as e:
+        logger.error(f"추론 백엔드 모듈을 찾을 수 없습니다 ({backend}): {e}")
+        return None
+    except Exception as e:
+        logger.log_exception(f"모델 내보내기 실패 ({backend})", e)
+        return None
+
+def create_backend(backend, model_path, input_size=None, export=True):
+    """
+    내보낸 모델 백엔드 생성 (캐시에 없으면 한 번만 내보냄)
+
+    Args:
+        backend (str): 'onnxruntime' 또는 'openvino'
+        model_path (str): 원본 YOLO 모델(.pt) 경로
+        input_size (int): 모델 입력 크기 (기본값: INFERENCE_SIZE를 32의 배수로 올린 값)
+        export (bool): 캐시에 없을 때 내보낼지 여부 (추론 워커는 캐시된 모델만 로드)
+
+    Returns:
+        ExportedYoloBackend: 백엔드. 생성 실패 시 None
+    """
+    if backend not in EXPORT_FORMATS:
+        logger.error(f"알 수 없는 추론 백엔드: {backend}")
+        return None
+
+    try:
+        input_size = model_input_size(input_size)
+        if export:
+            cache_path = prepare_backend(backend, model_path, input_size)
+            if cache_path is None:
+                return None
+        else:
+            cache_path = (cached_export_path(backend, model_path, input_size)
+                          if os.path.isfile(model_path) else None)
+            if cache_path is None or not os.path.exists(cache_path):
+                logger.warning(f"캐시된 {backend} 모델이 없습니다: {model_path}")
+                return None
+
+        _, _, backend_class = EXPORT_FORMATS[backend]
+        load_path = _openvino_xml(cache_path) if backend == BACKEND_OPENVINO else cache_path
+        instance = backend_class(load_path, input_size)
+        logger.info(f"추론 백엔드 로드 성공: {backend} ({load_path})")
+        return instance
+
+    except ImportError as e:
+        logger.error(f"추론 백엔드 모듈을 찾을 수 없습니다 ({backend}): {e}")
+        return None
+    except Exception as e:
+        logger.log_exception(f"추론 백엔드 생성 실패 ({backend})", e)
+        return None
@@ -0,0 +1,113 @@
+import numpy as np
+import threading
+from config import Config
+
+class PooledFrame:
+    """
+    풀에서 빌린 프레임 버퍼
+
+    참조 카운트 1로 생성되며, 버퍼를 다른 소비자에게 넘길 때는 retain(),
+    사용이 끝나면 release()를 호출합니다. 참조 카운트가 0이 되면 풀로 반환되어 재사용됩니다.
+    """
+    __slots__ = ('array', '_pool', '_refs')
+
+    def __init__(self, array, pool):
+        self.array = array
+        self._pool = pool
+        self._refs = 1
+
+    def retain(self):
+        """참조 추가"""
+        with self._pool._lock:
+            if self._refs <= 0:
+                raise RuntimeError("이미 반환된 버퍼입니다.")
+            self._refs += 1
+        return self
+
+    def release(self):
+        """참조 해제 (마지막 참조이면 풀로 반환)"""
+        with self._pool._lock:
+            self._refs -= 1
+            if self._refs > 0:
+                return
+            if self._refs < 0:
+                raise RuntimeError("버퍼가 중복 해제되었습니다.")
+        self._pool._return(self)
+
+class FrameBufferPool:
+    """재사용 가능한 NumPy 프레임 버퍼의 크기 제한 풀"""
+
+    def __init__(self, max_buffers=None):
+        """
+        초기화
+
+        Args:
+            max_buffers (int): 풀에 보관할 최대 유휴 버퍼 수 (기본값: Config.FRAME_POOL_SIZE)
+        """
+        self.max_buffers = max_buffers if max_buffers is not None else Config.FRAME_POOL_SIZE
+        self._free = {}
+        self._free_count = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.discarded = 0
+
+    def acquire(self, shape, dtype=np.uint8):
+        """
+        버퍼 대여 (유휴 버퍼가 있으면 재사용, 없으면 새로 할당)
+
+        Returns:
+            PooledFrame: 참조 카운트 1인 버퍼. 내용은 이전 사용 값이 남아 있을 수 있습니다.
+        """
+        key = (tuple(shape), np.dtype(dtype).str)
+        with self._lock:
+            free = self._free.get(key)
+            if free:
+                pooled = free.pop()
+                self._free_count -= 1
+                self.hits += 1
+                pooled._refs = 1
+            else:
+                pooled = None
+                self.misses += 1
+
+        if pooled is None:
+            pooled = PooledFrame(np.empty(shape, dtype=dtype), self)
+        # 이전 소비자가 읽기 전용으로 고정했을 수 있으므로 쓰기 가능하게 복구
+        pooled.array.flags.writeable = True
+        return pooled
+
+    def adopt(self, array):
+        """풀 밖에서 할당된 배열을 풀 버퍼로 편입 (할당이 발생했으므로 미스로 집계)"""
+        with self._lock:
+            self.misses += 1
+        return PooledFrame(array, self)
+
+    def _return(self, pooled):
+        """참조가 모두 해제된 버퍼를 유휴 목록에 반환"""
+        key = (pooled.array.shape, pooled.array.dtype.str)
+        with self._lock:
+            if self._free_count >= self.max_buffers:
+                # 해상도 변경 등으로 쓰이지 않는 버퍼가 쌓이지 않도록 다른 형상의 버퍼부터 버림
+                for other_key, other in self._free.items():
+                    if other_key != key and other:
+                        other.pop()
+                        self._free_count -= 1
+                        self.discarded += 1
+                        break
+                else:
+                    self.discarded += 1
+                    return
+
+            self._free.setdefault(key, []).append(pooled)
+            self._free_count += 1
+
+    def get_stats(self):
+        """풀 적중/미스 통계"""
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'discarded': self.discarded,
+                'free': self._free_count
+            }
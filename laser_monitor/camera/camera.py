@@ -1,22 +1,62 @@
 import cv2
+import json
+import threading
+import time
+from collections import namedtuple
 from config import Config
 from utils.logger import logger
+from camera.sources import FrameSource, open_frame_source
+from camera.buffer_pool import FrameBufferPool
+from models.database import Database
+
+# 최신 프레임 슬롯에서 꺼낸 캡처 프레임
+#   seq, timestamp: 캡처 시퀀스 번호와 캡처 시각
+#   buffer: 프레임이 담긴 PooledFrame (사용 후 release() 필요)
+#   settings: 프레임을 캡처할 때 적용되어 있던 화질 설정 스냅샷 (QualitySettings)
+CapturedFrame = namedtuple('CapturedFrame', ['seq', 'timestamp', 'buffer', 'settings'])
 
 class SharedCamera:
     """공유 카메라 클래스"""
 
-    def __init__(self, video_source=None):
+    def __init__(self, video_source=None, allow_fallback=True):
         """
         초기화
 
         Args:
-            video_source (int): 비디오 소스 번호 (기본값: Config에서 가져옴)
+            video_source: 비디오 소스 번호 (기본값: Config에서 가져옴).
+                동영상 파일/이미지 디렉토리 경로, "synthetic[:WxH@FPS]" 문자열,
+                FrameSource 또는 프레임 생성 함수도 사용할 수 있습니다.
+            allow_fallback (bool): 연결 실패 시 다른 소스(0~3) 탐색 여부
         """
         try:
             self.video_source = video_source if video_source is not None else Config.DEFAULT_VIDEO_SOURCE
+            self.allow_fallback = allow_fallback
+            self.active_source = None
             self.cap = None
+            # 연결 상태: stopped, connecting, connected, reconnecting,
+            #           ended (반복 재생이 꺼진 파일/디렉토리 소스의 끝)
+            self.connection_state = 'stopped'
+
+            # 적용된 화질 설정 스냅샷과 캡처 스레드가 적용할 대기 중인 재설정 요청
+            self.settings = Config.get_settings_snapshot()
+            self._pending_settings = None   # (설정 스냅샷, 결과를 기다리는 요청자 목록)
+            self._pending_lock = threading.Lock()
+            self._db = Database()
             self.active_sessions = set()
 
+            # 캡처 스레드 및 최신 프레임 슬롯
+            # 모든 소비자(스트림, 수동/자동 캡처)는 cap 대신 이 슬롯에서 프레임을 읽습니다.
+            # 슬롯의 프레임은 재사용 버퍼 풀(PooledFrame)에서 빌린 버퍼입니다.
+            self.buffer_pool = FrameBufferPool()
+            self._cap_lock = threading.RLock()
+            self._frame_cond = threading.Condition()
+            self._capture_thread = None
+            self._stop_event = threading.Event()
+            self._latest_frame = None
+            self._latest_settings = None
+            self._frame_seq = 0
+            self._frame_timestamp = 0.0
+
             # 비디오 설정을 Config에서 가져오기
             self.video_settings = {
                 'width': Config.CAMERA_WIDTH,
@@ -32,68 +72,155 @@ class SharedCamera:
             raise
 
     def start_capture(self):
-        """카메라 캡처 시작"""
-        try:
-            if self.cap is None:
-                logger.info(f"카메라 초기화 시도: source={self.video_source}")
+        """
+        카메라 캡처 시작
 
-                # 기본 카메라 소스로 시도
-                self.cap = cv2.VideoCapture(self.video_source)
+        장치를 한 번 열어 보고, 성공 여부와 관계없이 캡처 감시 스레드를 시작합니다.
+        열기에 실패하면 감시 스레드가 백오프 간격으로 재연결을 시도합니다.
 
-                if not self.cap.isOpened():
-                    logger.warning(f"카메라 소스 {self.video_source} 연결 실패, 다른 소스 시도")
+        Returns:
+            bool: 장치가 열려 있는지 여부
+        """
+        try:
+            if self.cap is None and not self._is_capture_thread_alive():
+                self.connection_state = 'connecting'
+                if not self._open_capture():
+                    logger.warning("카메라 연결 실패, 백그라운드에서 재연결을 시도합니다.")
 
-                    # 다른 카메라 소스들 시도 (0부터 3까지)
-                    for i in range(4):
-                        if i == self.video_source:
-                            continue  # 이미 시도한 소스는 건너뛰기
+            if not self._start_capture_thread():
+                return False
+            return self.cap is not None and self.cap.isOpened()
 
-                        logger.info(f"카메라 소스 {i} 시도")
-                        if self.cap:
-                            self.cap.release()
+        except Exception as e:
+            logger.log_exception("카메라 캡처 시작 중 오류", e)
+            return False
 
-                        self.cap = cv2.VideoCapture(i)
-                        if self.cap.isOpened():
-                            self.video_source = i
-                            logger.info(f"카메라 소스 {i} 연결 성공")
-                            break
-                    else:
-                        logger.error("모든 카메라 소스 연결 실패")
-                        return False
+    def _open_capture(self):
+        """
+        카메라 장치 열기
 
-                # 카메라 설정 적용
-                self._apply_camera_settings()
+        마지막으로 정상 동작한 소스(캐시)를 먼저 시도하고, 실패한 경우에만 다른 소스(0~3)를 탐색합니다.
+        캐시된 소스가 현재 화질 프리셋으로 협상된 적이 있으면 연결 테스트를 생략합니다.
 
-                # 연결 테스트
-                if not self._test_camera_connection():
-                    logger.error("카메라 연결 테스트 실패")
-                    return False
+        Returns:
+            bool: 연결 성공 여부
+        """
+        cache = self._load_source_cache()
+
+        # 카메라가 멈춰 있는 동안 변경된 화질 설정이 있으면 최신 스냅샷으로 연결
+        latest_settings = Config.get_settings_snapshot()
+        if latest_settings.version > self.settings.version:
+            self.settings = latest_settings
+
+        candidates = []
+        if cache is not None and self.allow_fallback:
+            candidates.append(cache['source'])
+        candidates.append(self.video_source)
+        # 장치 번호가 아닌 소스(파일/합성)는 다른 장치로 대체하지 않음
+        if self.allow_fallback and isinstance(self.video_source, int):
+            candidates.extend(range(4))
+
+        cap = None
+        source = None
+        tried = set()
+        for candidate in candidates:
+            if candidate in tried:
+                continue
+            tried.add(candidate)
+
+            logger.info(f"카메라 초기화 시도: source={candidate}")
+            cap = open_frame_source(candidate)
+            if cap.isOpened():
+                source = candidate
+                break
+
+            logger.warning(f"카메라 소스 {candidate} 연결 실패")
+            cap.release()
+            cap = None
+
+        if cap is None:
+            logger.error("모든 카메라 소스 연결 실패")
+            return False
 
-                logger.info("카메라 초기화 성공")
+        with self._cap_lock:
+            self.cap = cap
+            self.active_source = source
 
-                # 카메라 설정 적용
-                if not self._apply_camera_settings():
-                    logger.warning("카메라 설정 적용 실패, 기본 설정으로 사용")
+        # 카메라 설정 적용
+        if not self._apply_camera_settings():
+            logger.warning("카메라 설정 적용 실패, 기본 설정으로 사용")
 
-                return True
+        # 캐시된 소스/모드로 다시 여는 경우 연결 테스트 생략
+        known_good = (cache is not None and cache['source'] == source and
+                      cache.get('preset') == self.settings.preset_name)
+        if not known_good and not self._test_camera_connection():
+            logger.error("카메라 연결 테스트 실패")
+            self._release_capture()
+            return False
+        if isinstance(cap, FrameSource):
+            # 연결 테스트로 읽은 첫 프레임부터 다시 재생되도록 처음으로 되돌림
+            cap.reset()
+
+        self._save_source_cache(source, cache)
+        self.connection_state = 'connected'
+        logger.info(f"카메라 초기화 성공: source={source}")
+        return True
+
+    def _source_cache_key(self):
+        """정상 소스 캐시 키 (장치 번호 소스만 캐시)"""
+        if not isinstance(self.video_source, int):
+            return None
+        return f"camera_source_cache:{self.video_source}"
+
+    def _load_source_cache(self):
+        """마지막으로 정상 동작한 소스와 협상된 모드 조회"""
+        key = self._source_cache_key()
+        if key is None:
+            return None
 
-            return self.cap.isOpened()
+        try:
+            value = self._db.get_setting(key)
+            return json.loads(value) if value else None
+        except Exception as e:
+            logger.log_exception("카메라 소스 캐시 조회 중 오류", e)
+            return None
+
+    def _save_source_cache(self, source, previous=None):
+        """정상 동작한 소스와 협상된 모드 저장 (변경된 경우에만 기록)"""
+        key = self._source_cache_key()
+        if key is None:
+            return
 
+        try:
+            with self._cap_lock:
+                cache = {
+                    'source': source,
+                    'preset': self.settings.preset_name,
+                    'width': int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+                    'height': int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+                    'fps': int(self.cap.get(cv2.CAP_PROP_FPS))
+                }
+            if cache != previous:
+                self._db.save_setting(key, json.dumps(cache))
         except Exception as e:
-            logger.log_exception("카메라 캡처 시작 중 오류", e)
-            return False
+            logger.log_exception("카메라 소스 캐시 저장 중 오류", e)
 
-    def _apply_camera_settings(self):
+    def _apply_camera_settings(self, settings=None):
         """카메라 설정 적용 (4K 60Hz 지원 포함)"""
+        with self._cap_lock:
+            return self._apply_camera_settings_locked(settings or self.settings)
+
+    def _apply_camera_settings_locked(self, settings):
+        """카메라 설정 적용 (_cap_lock 보유 상태에서 호출)"""
         try:
             if not self.cap:
                 return False
 
-            # 현재 화질 프리셋 가져오기
-            current_preset = Config.get_quality_preset()
-            target_width = current_preset['width']
-            target_height = current_preset['height']
-            target_fps = current_preset['fps']
+            # 적용할 화질 설정 스냅샷
+            current_preset = settings.preset
+            target_width = settings.width
+            target_height = settings.height
+            target_fps = settings.fps
 
             # 4K 모드인 경우 특별 설정
             is_4k_mode = target_width >= 3840 and target_height >= 2160
@@ -183,13 +310,217 @@ class SharedCamera:
             logger.log_exception("카메라 연결 테스트 중 오류", e)
             return False
 
-    def stop_capture(self):
-        """카메라 캡처 중지"""
+    def _start_capture_thread(self):
+        """
+        캡처 감시 스레드 시작 (이미 실행 중이면 무시)
+
+        Returns:
+            bool: 캡처 스레드가 실행 중인지 여부 (이전 스레드가 아직 종료 중이면 False)
+        """
+        thread = self._capture_thread
+        if thread is not None and thread.is_alive():
+            if not self._stop_event.is_set():
+                return True
+            # 중지 중인 이전 스레드가 끝나야 새 스레드를 시작 (두 스레드가 같은 장치를 읽지 않도록)
+            thread.join(timeout=2.0)
+            if thread.is_alive():
+                logger.error("이전 캡처 스레드가 아직 종료되지 않아 캡처를 시작하지 못했습니다.")
+                return False
+
+        self._stop_event.clear()
+        self._capture_thread = threading.Thread(target=self._capture_loop,
+                                                name=f"camera-capture-{self.video_source}",
+                                                daemon=True)
+        self._capture_thread.start()
+        logger.info("카메라 캡처 스레드 시작")
+        return True
+
+    def _is_capture_thread_alive(self):
+        """캡처 감시 스레드 동작 여부"""
+        thread = self._capture_thread
+        return thread is not None and thread.is_alive()
+
+    def _capture_loop(self):
+        """
+        캡처 감시 루프
+
+        장치가 열려 있으면 프레임을 읽고, 연결이 끊기면 지수 백오프 간격으로 재연결합니다.
+        재연결 중에도 스트림은 마지막 프레임을 계속 제공하므로 시청자를 멈추지 않습니다.
+        """
+        delay = Config.CAMERA_RECONNECT_MIN_DELAY
+
+        while not self._stop_event.is_set():
+            if self.cap is None:
+                if not self._open_capture():
+                    self.connection_state = 'reconnecting'
+                    logger.warning(f"카메라 재연결 실패, {delay:.1f}초 후 재시도")
+                    self._stop_event.wait(delay)
+                    delay = min(delay * 2, Config.CAMERA_RECONNECT_MAX_DELAY)
+                    continue
+                delay = Config.CAMERA_RECONNECT_MIN_DELAY
+
+            self._read_frames()
+            if self._stop_event.is_set():
+                break
+
+            if getattr(self.cap, 'ended', False):
+                # 유한한 소스의 끝: 재연결하지 않고 캡처 종료 (마지막 프레임은 슬롯에 유지)
+                self.connection_state = 'ended'
+                self._release_capture()
+                logger.info("프레임 소스 끝에 도달하여 캡처를 종료합니다.")
+                break
+
+            # 읽기 실패: 장치를 해제하고 즉시 재연결 시도
+            self.connection_state = 'reconnecting'
+            self._release_capture()
+            logger.warning("카메라 연결 끊김, 재연결 시도")
+
+        with self._frame_cond:
+            self._frame_cond.notify_all()
+        logger.info("카메라 캡처 스레드 종료")
+
+    def _read_frames(self):
+        """장치에서 프레임을 연속으로 읽어 최신 프레임 슬롯에 저장 (읽기 실패 시 반환)"""
+        frame_shape = None
+
+        while not self._stop_event.is_set():
+            raw = None
+            try:
+                # 대기 중인 화질 재설정은 읽기 사이에 캡처 스레드에서 적용
+                self._apply_pending_settings()
+
+                # 풀 버퍼에 직접 읽어 프레임마다 새 배열을 할당하지 않음
+                if frame_shape is not None:
+                    raw = self.buffer_pool.acquire(frame_shape)
+
+                with self._cap_lock:
+                    cap = self.cap
+                    if cap is None or not cap.isOpened():
+                        return
+                    if raw is not None:
+                        ret, frame = cap.read(image=raw.array)
+                    else:
+                        ret, frame = cap.read()
+
+                if not ret or frame is None or frame.size == 0:
+                    if not getattr(cap, 'ended', False):
+                        logger.warning("프레임을 읽을 수 없습니다.")
+                    return
+
+                # 해상도가 바뀌어 새 배열이 반환된 경우 해당 배열을 풀 버퍼로 편입
+                if raw is None or frame is not raw.array:
+                    if raw is not None:
+                        raw.release()
+                    raw = self.buffer_pool.adopt(frame)
+                    frame_shape = frame.shape
+
+                # 프레임 좌우반전 (미리 할당된 버퍼에 기록)
+                flipped = self.buffer_pool.acquire(frame_shape)
+                cv2.flip(raw.array, 1, dst=flipped.array)
+                raw.release()
+                raw = None
+
+                self._publish_frame(flipped)
+
+            except Exception as e:
+                logger.log_exception("프레임 캡처 중 오류", e)
+                return
+            finally:
+                if raw is not None:
+                    raw.release()
+
+    def _apply_pending_settings(self):
+        """대기 중인 재설정 요청을 적용하고 요청자에게 결과 통지 (캡처 스레드에서 호출)"""
+        with self._pending_lock:
+            request = self._pending_settings
+            self._pending_settings = None
+        if request is None:
+            return
+
+        settings, waiters = request
+        logger.info(f"화질 재설정 적용: {settings.preset_name} (버전 {settings.version})")
+
+        applied = self._apply_camera_settings(settings)
+        if applied:
+            self.settings = settings
+        for done, outcome in waiters:
+            outcome.append(applied)
+            done.set()
+
+    def reconfigure(self, settings, timeout=5.0):
+        """
+        화질 설정 스냅샷을 원자적으로 적용
+
+        캡처 중이면 캡처 스레드가 진행 중인 읽기를 마친 뒤 같은 스레드에서 장치를 재설정하므로
+        스트림 읽기와 cap.set() 호출이 경합하지 않습니다. 이후 프레임은 새 스냅샷과 함께 발행됩니다.
+        적용 전에 다시 호출되면 가장 최신 스냅샷만 적용하고, 대체된 요청자도 그 결과를 받습니다.
+
+        Args:
+            settings (QualitySettings): 적용할 화질 설정 스냅샷
+            timeout (float): 적용 완료 대기 시간(초)
+
+        Returns:
+            bool: 적용 성공 여부
+        """
         try:
+            if not self._is_capture_thread_alive() or self.cap is None:
+                # 캡처 중이 아니면 다음 연결 시 적용
+                self.settings = settings
+                return True
+
+            done = threading.Event()
+            outcome = []
+            with self._pending_lock:
+                waiters = [(done, outcome)]
+                if self._pending_settings is not None:
+                    # 아직 적용되지 않은 이전 요청은 새 스냅샷으로 대체하고 그 요청자에게도 결과를 통지
+                    waiters = self._pending_settings[1] + waiters
+                self._pending_settings = (settings, waiters)
+
+            if not done.wait(timeout):
+                logger.warning("화질 재설정 대기 시간 초과")
+                return False
+            return bool(outcome and outcome[0])
+
+        except Exception as e:
+            logger.log_exception("화질 재설정 중 오류", e)
+            return False
+
+    def _publish_frame(self, buffer):
+        """캡처한 프레임 버퍼를 최신 프레임 슬롯에 저장 (이전 버퍼는 슬롯 참조 해제)"""
+        with self._frame_cond:
+            previous = self._latest_frame
+            self._frame_seq += 1
+            self._latest_frame = buffer
+            self._latest_settings = self.settings
+            self._frame_timestamp = time.time()
+            self._frame_cond.notify_all()
+
+        if previous is not None:
+            previous.release()
+
+    def _release_capture(self):
+        """카메라 장치 해제"""
+        with self._cap_lock:
             if self.cap is not None:
                 self.cap.release()
                 self.cap = None
                 logger.info("카메라 연결 해제")
+
+    def stop_capture(self):
+        """카메라 캡처 중지"""
+        try:
+            self._stop_event.set()
+            thread = self._capture_thread
+            if thread is not None and thread is not threading.current_thread():
+                thread.join(timeout=2.0)
+                if thread.is_alive():
+                    # 핸들을 유지해 다음 시작 시 이전 스레드의 종료를 확인하도록 함
+                    logger.warning("캡처 스레드가 시간 내에 종료되지 않았습니다.")
+            if thread is None or not thread.is_alive():
+                self._capture_thread = None
+            self._release_capture()
+            self.connection_state = 'stopped'
         except Exception as e:
             logger.log_exception("카메라 캡처 중지 중 오류", e)
 
@@ -225,6 +556,14 @@ class SharedCamera:
         except Exception as e:
             logger.log_exception(f"세션 제거 중 오류 (ID: {session_id})", e)
 
+    def is_reconnecting(self):
+        """장치 재연결 대기 중인지 여부"""
+        return self.connection_state == 'reconnecting'
+
+    def is_ended(self):
+        """유한한 프레임 소스를 끝까지 읽어 캡처가 종료되었는지 여부"""
+        return self.connection_state == 'ended'
+
     def is_active(self):
         """카메라 활성 상태 확인"""
         try:
@@ -235,18 +574,63 @@ class SharedCamera:
             logger.log_exception("카메라 활성 상태 확인 중 오류", e)
             return False
 
+    def get_latest_frame(self):
+        """
+        최신 프레임 슬롯 조회
+
+        Returns:
+            CapturedFrame: 최신 캡처 프레임. 프레임이 없으면 None
+            반환된 버퍼는 참조가 추가된 상태이므로 사용 후 반드시 release()를 호출해야 하며,
+            다른 소비자와 공유되므로 내용을 수정하지 말아야 합니다.
+        """
+        with self._frame_cond:
+            if self._latest_frame is None:
+                return None
+            return self._captured_frame()
+
+    def wait_for_frame(self, last_seq=0, timeout=1.0):
+        """
+        last_seq 이후의 새 프레임이 들어올 때까지 대기
+
+        Args:
+            last_seq (int): 소비자가 마지막으로 처리한 시퀀스 번호
+            timeout (float): 최대 대기 시간(초)
+
+        Returns:
+            CapturedFrame: 새 캡처 프레임. 시간 초과 또는 소스 끝에 도달하면 None
+            반환된 버퍼는 사용 후 반드시 release()를 호출해야 합니다.
+        """
+        deadline = time.time() + timeout
+        with self._frame_cond:
+            while self._latest_frame is None or self._frame_seq <= last_seq:
+                if self.connection_state == 'ended':
+                    return None
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    return None
+                self._frame_cond.wait(remaining)
+            return self._captured_frame()
+
+    def _captured_frame(self):
+        """슬롯 내용을 참조를 추가한 CapturedFrame으로 반환 (_frame_cond 보유 상태에서 호출)"""
+        return CapturedFrame(self._frame_seq, self._frame_timestamp,
+                             self._latest_frame.retain(), self._latest_settings)
+
     def get_frame(self):
-        """프레임 읽기"""
+        """최신 프레임 복사본 읽기 (카메라 장치에 직접 접근하지 않음)"""
         try:
             if not self.is_active():
                 return False, None
 
-            ret, frame = self.cap.read()
-            if not ret or frame is None:
+            captured = self.get_latest_frame()
+            if captured is None:
                 logger.warning("프레임 읽기 실패")
                 return False, None
 
-            return True, frame
+            try:
+                return True, captured.buffer.array.copy()
+            finally:
+                captured.buffer.release()
 
         except Exception as e:
             logger.log_exception("프레임 읽기 중 오류", e)
@@ -258,9 +642,9 @@ class SharedCamera:
             old_settings = self.video_settings.copy()
             self.video_settings.update(new_settings)
 
-            # 카메라가 활성 상태인 경우 설정 적용
+            # 카메라가 활성 상태인 경우 현재 화질 설정 스냅샷을 캡처 스레드에서 적용
             if self.is_active():
-                if not self._apply_camera_settings():
+                if not self.reconfigure(Config.get_settings_snapshot()):
                     # 설정 적용 실패 시 이전 설정으로 복구
                     self.video_settings = old_settings
                     logger.warning("설정 업데이트 실패, 이전 설정으로 복구")
@@ -280,13 +664,16 @@ class SharedCamera:
                 return None
 
             return {
-                'source': self.video_source,
+                'source': self.active_source,
+                'connection_state': self.connection_state,
                 'width': self.cap.get(cv2.CAP_PROP_FRAME_WIDTH),
                 'height': self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT),
                 'fps': self.cap.get(cv2.CAP_PROP_FPS),
                 'is_opened': self.cap.isOpened(),
                 'active_sessions': len(self.active_sessions),
-                'settings': self.video_settings.copy()
+                'settings': self.video_settings.copy(),
+                'settings_version': self.settings.version,
+                'buffer_pool': self.buffer_pool.get_stats()
             }
 
         except Exception as e:
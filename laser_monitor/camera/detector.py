@@ -3,24 +3,39 @@ import numpy as np
 import sys
 import os
 import time
+import threading
+from collections import deque, namedtuple
+from types import MappingProxyType
 
 # 상위 디렉토리를 path에 추가
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
-try:
-    from ultralytics import YOLO
-    # YOLO 로깅 설정 - 콘솔 출력 최소화
-    import ultralytics
-    ultralytics.checks(verbose=False)  # 체크 과정 로그 비활성화
+# ultralytics(PyTorch)는 import 비용이 크므로 모델 로딩 스레드에서 처음 필요할 때 import
+YOLO = None
+YOLO_AVAILABLE = None  # 모델 로딩 시 결정
 
-    # 로깅 레벨 설정
-    import logging
-    logging.getLogger('ultralytics').setLevel(logging.WARNING)
+def _import_yolo():
+    """ultralytics import 및 로깅 설정 (성공 여부 반환)"""
+    global YOLO, YOLO_AVAILABLE
+    if YOLO_AVAILABLE is not None:
+        return YOLO_AVAILABLE
 
-    YOLO_AVAILABLE = True
-except ImportError:
-    print("WARNING: ultralytics 모듈을 찾을 수 없습니다. pip install ultralytics로 설치하세요.")
-    YOLO_AVAILABLE = False
+    try:
+        from ultralytics import YOLO as _YOLO
+        # YOLO 로깅 설정 - 콘솔 출력 최소화
+        import ultralytics
+        ultralytics.checks(verbose=False)  # 체크 과정 로그 비활성화
+
+        # 로깅 레벨 설정
+        import logging
+        logging.getLogger('ultralytics').setLevel(logging.WARNING)
+
+        YOLO = _YOLO
+        YOLO_AVAILABLE = True
+    except ImportError:
+        print("WARNING: ultralytics 모듈을 찾을 수 없습니다. pip install ultralytics로 설치하세요.")
+        YOLO_AVAILABLE = False
+    return YOLO_AVAILABLE
 
 try:
     from config import Config
@@ -42,26 +57,132 @@ except ImportError:
         DETECTION_CONFIDENCE = 0.6
         TARGET_DISTANCE = 10
         TOLERANCE = 50
+        INFERENCE_SIZE = 640
+        INFERENCE_INTERPOLATION = 'area'
+        INFERENCE_BATCH_SIZE = 1
+        INFERENCE_BATCH_WAIT_MS = 5.0
+        INFERENCE_BACKEND = 'pytorch'
+        INFERENCE_WORKERS = 0
+
+# 추론 전처리 축소 보간 방식
+INTERPOLATIONS = {
+    'area': cv2.INTER_AREA,
+    'linear': cv2.INTER_LINEAR
+}
+
+from camera.tracking import RoiTracker, BoxTracker, InferenceCadence, MotionGate
+from camera.backends import BACKEND_PYTORCH, create_backend
+from camera.inference_service import InferenceService, is_worker_process
+from camera.overlay import render_overlay
+
+# 모델 로딩 단계
+LOAD_PENDING = 'pending'        # 로딩 시작 전
+LOAD_LOADING = 'loading'        # 모델 로드 중
+LOAD_WARMING_UP = 'warming_up'  # 워밍업 추론 중
+LOAD_READY = 'ready'            # 추론 가능
+LOAD_FAILED = 'failed'          # 로드 실패 (감지 없이 스트리밍)
 
 class TshirtDetector:
     """T셔츠 감지를 위한 YOLO 기반 감지기"""
     _instance = None
     _model = None
+    _load_lock = threading.Lock()
+    _load_thread = None
+    _ready_event = threading.Event()
+    load_phase = LOAD_PENDING
+    load_error = None
+    load_seconds = None    # 모델 로드 소요 시간(초)
+    warmup_seconds = None  # 워밍업 추론 소요 시간(초)
     _last_log_time = 0
     _log_interval = 3.0  # 3초마다 로그 출력
+    _local = threading.local()  # 스레드(파이프라인)별 전처리 버퍼
+    backend = BACKEND_PYTORCH  # 실제 사용 중인 추론 백엔드
+    export_models = True  # 캐시에 없는 백엔드 모델을 내보낼지 여부 (추론 워커는 캐시만 사용)
 
     def __new__(cls):
-        """싱글톤 패턴으로 모델 인스턴스 관리"""
+        """싱글톤 패턴으로 모델 인스턴스 관리 (모델은 start_loading()/load()로 지연 로드)"""
         if cls._instance is None:
             cls._instance = super(TshirtDetector, cls).__new__(cls)
-            cls._load_model()
         return cls._instance
 
+    def start_loading(self):
+        """백그라운드 스레드에서 모델 로드 시작 (여러 번 호출해도 한 번만 로드)"""
+        cls = type(self)
+        with cls._load_lock:
+            if cls._load_thread is not None or cls.load_phase != LOAD_PENDING:
+                return
+            cls._load_thread = threading.Thread(target=self.load, daemon=True)
+            cls._load_thread.start()
+
+    def load(self):
+        """
+        모델 로드 및 워밍업 추론 (호출한 스레드에서 동기 실행)
+
+        Returns:
+            bool: 추론 가능 여부
+        """
+        cls = type(self)
+        with cls._load_lock:
+            owner = cls.load_phase == LOAD_PENDING
+            if owner:
+                cls.load_phase = LOAD_LOADING
+        if not owner:
+            # 다른 스레드가 이미 로드 중이거나 로드를 마쳤으면 결과만 기다림
+            return self.wait_until_ready()
+
+        try:
+            start = time.monotonic()
+            cls._load_model()
+            if cls._model is None:
+                cls.load_phase = LOAD_FAILED
+                return False
+            cls.load_seconds = time.monotonic() - start
+
+            # 첫 추론의 지연(그래프 초기화, 메모리 할당)을 스트림 시작 전에 처리
+            cls.load_phase = LOAD_WARMING_UP
+            start = time.monotonic()
+            size = Config.INFERENCE_SIZE if Config.INFERENCE_SIZE > 0 else 640
+            cls._model(np.zeros((size, size, 3), dtype=np.uint8),
+                       conf=Config.DETECTION_CONFIDENCE, verbose=False)
+            cls.warmup_seconds = time.monotonic() - start
+
+            cls.load_phase = LOAD_READY
+            logger.info(f"모델 준비 완료 - 로드: {cls.load_seconds:.2f}초, 워밍업: {cls.warmup_seconds:.2f}초")
+            return True
+
+        except Exception as e:
+            logger.log_exception("모델 로드/워밍업 중 오류", e)
+            cls.load_error = str(e)
+            cls.load_phase = LOAD_FAILED
+            return False
+        finally:
+            cls._ready_event.set()
+
+    def is_ready(self):
+        """추론 가능 여부"""
+        return self.load_phase == LOAD_READY
+
+    def wait_until_ready(self, timeout=None):
+        """모델 로딩이 끝날 때까지 대기 (실패해도 반환). 추론 가능 여부 반환"""
+        self._ready_event.wait(timeout)
+        return self.is_ready()
+
     @classmethod
     def _load_model(cls):
-        """YOLO 모델 로드"""
-        if not YOLO_AVAILABLE:
+        """YOLO 모델 로드 (INFERENCE_BACKEND가 pytorch가 아니면 내보낸 모델 백엔드 사용)"""
+        backend = Config.INFERENCE_BACKEND
+        if backend != BACKEND_PYTORCH:
+            # 캐시된 내보내기 모델이 있으면 재내보내기 없이 바로 로드
+            cls._model = create_backend(backend, Config.YOLO_MODEL_PATH, export=cls.export_models)
+            if cls._model is not None:
+                cls.backend = backend
+                return
+            logger.warning(f"{backend} 백엔드를 사용할 수 없어 PyTorch 백엔드로 대체합니다.")
+
+        cls.backend = BACKEND_PYTORCH
+        if not _import_yolo():
             logger.error("YOLO 모듈이 설치되지 않았습니다. 객체 감지를 사용할 수 없습니다.")
+            cls.load_error = "ultralytics 모듈 없음"
             cls._model = None
             return
 
@@ -71,8 +192,143 @@ class TshirtDetector:
             logger.info(f"YOLO 모델 로드 성공: {Config.YOLO_MODEL_PATH}")
         except Exception as e:
             logger.log_exception("YOLO 모델 로드 실패", e)
+            cls.load_error = str(e)
             cls._model = None
 
+    def predict(self, frame, region=None):
+        """
+        프레임(또는 지정 영역)을 추론하고 전체 프레임 좌표의 박스 배열을 반환
+
+        Args:
+            frame: 입력 프레임
+            region (tuple): 추론할 영역 (x1, y1, x2, y2). None이면 전체 프레임
+
+        Returns:
+            np.ndarray: (N, 6) 배열 [x1, y1, x2, y2, confidence, class_id]. 실패 시 None
+        """
+        if self._model is None:
+            return None
+
+        try:
+            image, scale, offset = self.preprocess(frame, region)
+
+            results = self._model(image, conf=Config.DETECTION_CONFIDENCE, verbose=False)
+            return self._to_boxes(results[0] if results else None, scale, offset)
+
+        except Exception as e:
+            logger.log_exception("객체 감지 중 오류", e)
+            return None
+
+    def predict_batch(self, frames, regions=None):
+        """
+        여러 프레임을 한 번의 배치 추론으로 처리
+
+        Args:
+            frames (list): 입력 프레임 목록 (카메라별 프레임 또는 연속 프레임)
+            regions (list): 프레임별 추론 영역 목록 (None이면 모두 전체 프레임)
+
+        Returns:
+            list: 프레임별 (N, 6) 박스 배열 목록. 실패한 항목은 None
+        """
+        if regions is None:
+            regions = [None] * len(frames)
+        if self._model is None or not frames:
+            return [None] * len(frames)
+
+        try:
+            # 배치 안의 프레임들이 서로의 전처리 버퍼를 덮어쓰지 않도록 슬롯을 나눠 사용
+            prepared = [self.preprocess(frame, region, slot=index)
+                        for index, (frame, region) in enumerate(zip(frames, regions))]
+            images = [image for image, _, _ in prepared]
+
+            results = self._model(images, conf=Config.DETECTION_CONFIDENCE, verbose=False)
+            if not results or len(results) != len(prepared):
+                logger.warning("배치 추론 결과 수가 입력 프레임 수와 다릅니다.")
+                return [None] * len(frames)
+
+            return [self._to_boxes(result, scale, offset)
+                    for result, (_, scale, offset) in zip(results, prepared)]
+
+        except Exception as e:
+            logger.log_exception("배치 객체 감지 중 오류", e)
+            return [None] * len(frames)
+
+    @staticmethod
+    def _to_boxes(result, scale, offset):
+        """모델 결과를 전체 프레임 좌표의 (N, 6) float32 배열로 변환"""
+        if result is None or result.boxes is None:
+            return np.empty((0, 6), dtype=np.float32)
+
+        data = result.boxes.data
+        data = data.cpu().numpy() if hasattr(data, 'cpu') else np.asarray(data)
+        data = data.astype(np.float32, copy=True)
+
+        # 모델 입력 좌표를 전체 프레임 좌표로 변환 (축소 비율 복원 후 영역 오프셋 적용)
+        offset_x, offset_y = offset
+        if scale != 1.0:
+            data[:, :4] /= scale
+        if offset_x or offset_y:
+            data[:, [0, 2]] += offset_x
+            data[:, [1, 3]] += offset_y
+        return data
+
+    def preprocess(self, frame, region=None, slot=0):
+        """
+        추론 입력 준비: 영역을 잘라내고 긴 변이 INFERENCE_SIZE가 되도록 한 번만 축소 (기본 INTER_AREA)
+
+        축소 결과는 스레드별로 미리 할당된 버퍼에 기록하므로 프레임마다 새 배열을 만들지 않습니다.
+        반환된 이미지는 같은 스레드의 다음 호출에서 덮어쓰이므로 추론 직후에만 사용해야 합니다.
+
+        Args:
+            frame: 입력 프레임
+            region (tuple): 추론할 영역 (x1, y1, x2, y2). None이면 전체 프레임
+            slot (int): 전처리 버퍼 슬롯 (배치 추론 시 프레임별로 다른 슬롯 사용)
+
+        Returns:
+            tuple: (모델 입력 이미지, 축소 비율, (offset_x, offset_y))
+        """
+        offset_x = offset_y = 0
+        if region is not None:
+            x1, y1, x2, y2 = region
+            frame = frame[y1:y2, x1:x2]
+            offset_x, offset_y = x1, y1
+
+        size = Config.INFERENCE_SIZE
+        height, width = frame.shape[:2]
+        if size <= 0 or max(height, width) <= size:
+            # 이미 모델 입력보다 작으면 확대하지 않고 그대로 사용
+            return frame, 1.0, (offset_x, offset_y)
+
+        scale = size / max(height, width)
+        target_width = max(int(round(width * scale)), 1)
+        target_height = max(int(round(height * scale)), 1)
+        buffer = self._get_buffer((target_height, target_width) + frame.shape[2:], frame.dtype, slot)
+        interpolation = INTERPOLATIONS.get(Config.INFERENCE_INTERPOLATION, cv2.INTER_AREA)
+        cv2.resize(frame, (target_width, target_height), dst=buffer, interpolation=interpolation)
+        return buffer, scale, (offset_x, offset_y)
+
+    def _get_buffer(self, shape, dtype, slot=0):
+        """
+        스레드별 전처리 버퍼에서 지정 형상의 연속 배열 뷰를 반환
+
+        ROI 영역 크기는 프레임마다 달라지므로 슬롯마다 모델 입력 최대 크기(INFERENCE_SIZE^2)의
+        1차원 버퍼 하나를 할당해 두고 필요한 형상으로 잘라 사용합니다.
+        """
+        buffers = getattr(self._local, 'buffers', None)
+        if buffers is None:
+            buffers = self._local.buffers = []
+        while len(buffers) <= slot:
+            buffers.append(None)
+
+        count = int(np.prod(shape))
+        backing = buffers[slot]
+        if backing is None or backing.size < count or backing.dtype != dtype:
+            channels = shape[2] if len(shape) > 2 else 1
+            capacity = max(count, Config.INFERENCE_SIZE * Config.INFERENCE_SIZE * channels)
+            backing = np.empty(capacity, dtype=dtype)
+            buffers[slot] = backing
+        return backing[:count].reshape(shape)
+
     def detect_keypoints(self, frame):
         """YOLOv8로 객체 감지 및 키포인트 추출"""
         if self._model is None:
@@ -87,200 +343,504 @@ class TshirtDetector:
             logger.log_exception("객체 감지 중 오류", e)
             return None
 
+class _BatchRequest:
+    """배치 대기열에 들어간 단일 추론 요청"""
+    __slots__ = ('frame', 'region', 'result', 'done')
+
+    def __init__(self, frame, region):
+        self.frame = frame
+        self.region = region
+        self.result = None
+        self.done = threading.Event()
+
+class BatchInference:
+    """
+    여러 호출자(카메라별 파이프라인 스레드)의 추론 요청을 모아 한 번의 배치 추론으로 처리
+
+    첫 요청이 들어온 뒤 최대 max_wait초 동안 최대 max_batch_size개까지 요청을 모아
+    TshirtDetector.predict_batch로 한 번에 추론하고, 결과를 각 호출자에게 돌려줍니다.
+    max_batch_size가 1이면 대기 없이 바로 단일 추론합니다.
+
+    각 파이프라인은 이전 프레임의 결과(ROI, 추적 상태)로 다음 요청을 만들기 때문에
+    predict()에서 결과를 기다리며, 한 카메라의 요청은 한 번에 하나만 대기열에 있습니다.
+    따라서 배치는 여러 카메라의 요청 사이에서만 만들어지고, 카메라가 하나면 배치 크기는
+    항상 1입니다 (max_wait만큼 지연만 늘어남).
+    """
+
+    def __init__(self, detector, max_batch_size=None, max_wait=None):
+        """
+        초기화
+
+        Args:
+            detector (TshirtDetector): 감지기
+            max_batch_size (int): 최대 배치 크기 (기본값: Config.INFERENCE_BATCH_SIZE)
+            max_wait (float): 배치를 모으는 최대 대기 시간(초) (기본값: Config.INFERENCE_BATCH_WAIT_MS)
+        """
+        self.detector = detector
+        self.max_batch_size = max(Config.INFERENCE_BATCH_SIZE if max_batch_size is None else max_batch_size, 1)
+        self.max_wait = Config.INFERENCE_BATCH_WAIT_MS / 1000.0 if max_wait is None else max_wait
+
+        self._queue = deque()
+        self._cond = threading.Condition()
+        self._thread = None
+        self.batches = 0
+        self.frames = 0
+
+    def predict(self, frame, region=None):
+        """
+        배치 대기열에 추론을 요청하고 결과가 나올 때까지 대기
+
+        Returns:
+            np.ndarray: TshirtDetector.predict와 같은 (N, 6) 박스 배열. 실패 시 None
+        """
+        if self.max_batch_size <= 1:
+            return self.detector.predict(frame, region)
+
+        request = _BatchRequest(frame, region)
+        with self._cond:
+            self._ensure_thread()
+            self._queue.append(request)
+            self._cond.notify_all()
+
+        request.done.wait()
+        return request.result
+
+    def _ensure_thread(self):
+        """배치 처리 스레드 시작 (_cond를 잡은 상태에서 호출)"""
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+
+    def _next_batch(self):
+        """첫 요청 이후 최대 대기 시간 동안 요청을 모아 반환"""
+        with self._cond:
+            while not self._queue:
+                self._cond.wait()
+
+            deadline = time.monotonic() + self.max_wait
+            while len(self._queue) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+
+            count = min(len(self._queue), self.max_batch_size)
+            return [self._queue.popleft() for _ in range(count)]
+
+    def _run(self):
+        """배치 처리 루프"""
+        while True:
+            batch = self._next_batch()
+            results = [None] * len(batch)
+            try:
+                if len(batch) == 1:
+                    results = [self.detector.predict(batch[0].frame, batch[0].region)]
+                else:
+                    results = self.detector.predict_batch([request.frame for request in batch],
+                                                          [request.region for request in batch])
+                self.batches += 1
+                self.frames += len(batch)
+            except Exception as e:
+                logger.log_exception("배치 추론 처리 중 오류", e)
+            finally:
+                # 결과를 각 호출자에게 분배
+                for request, result in zip(batch, results):
+                    request.result = result
+                    request.done.set()
+
+    def get_stats(self):
+        """배치 추론 통계"""
+        return {
+            'max_batch_size': self.max_batch_size,
+            'max_wait_ms': round(self.max_wait * 1000, 1),
+            'batches': self.batches,
+            'average_batch_size': round(self.frames / self.batches, 2) if self.batches else 0
+        }
+
 # 전역 감지기 인스턴스
 detector = TshirtDetector()
 
-def detect_tshirt_center(frame, state):
+# 전역 배치 추론기 (카메라 파이프라인들이 공유)
+batcher = BatchInference(detector)
+
+# 프로세스 외부 추론 워커 풀
+# 워커 프로세스 안에서 이 모듈을 다시 import하는 경우에는 만들지 않음
+inference_service = None
+if Config.INFERENCE_WORKERS > 0 and not is_worker_process():
+    try:
+        inference_service = InferenceService()
+    except Exception as e:
+        logger.log_exception("추론 워커 풀 시작 실패 - 프로세스 내부 추론 사용", e)
+        inference_service = None
+
+def start_model_loading():
     """
-    프레임에서 사람을 감지하고 T셔츠 중심점을 계산
+    백그라운드 모델 로딩 시작
+
+    워커 풀을 쓰는 경우 각 워커가 자체 모델을 로드하므로 웹 프로세스에서는 로드하지 않습니다.
+    """
+    if inference_service is None:
+        detector.start_loading()
+
+def is_model_ready():
+    """추론 가능 여부 (워커 풀을 쓰면 모델을 로드한 워커가 하나 이상 있어야 함)"""
+    if inference_service is not None:
+        return inference_service.is_ready()
+    return detector.is_ready()
+
+def get_model_readiness():
+    """모델 로딩 상태 (/readyz 응답용)"""
+    ready = is_model_ready()
+    if inference_service is not None:
+        phase = LOAD_READY if ready else LOAD_LOADING
+        workers = inference_service.get_stats()
+    else:
+        phase = detector.load_phase
+        workers = None
+    return {
+        'ready': ready,
+        'phase': phase,
+        'backend': detector.backend,
+        'load_seconds': detector.load_seconds,
+        'warmup_seconds': detector.warmup_seconds,
+        'error': detector.load_error,
+        'workers': workers
+    }
+
+def _predict(frame, region):
+    """추론 경로 선택 (워커 풀 > 배치 추론기 > 단일 추론)"""
+    if inference_service is not None:
+        return inference_service.predict(frame, region)
+    return batcher.predict(frame, region)
+
+class DetectionContext:
+    """카메라(스트림)별 감지 상태. 감지 파이프라인마다 하나씩 보유합니다."""
+
+    def __init__(self):
+        # 마지막으로 감지된 사람 주변만 추론하는 ROI 추적기
+        self.roi_tracker = RoiTracker()
+        # 추론 사이 프레임의 박스를 예측하는 추적기와 추론 주기
+        self.box_tracker = BoxTracker()
+        self.cadence = InferenceCadence()
+        # 정적 장면에서 추론을 건너뛰는 변화 감지기와 재사용할 마지막 추론 결과
+        self.motion_gate = MotionGate()
+        self.last_detections = None
+
+    def reset(self):
+        """추적 상태 초기화"""
+        self.roi_tracker.reset()
+        self.box_tracker.reset()
+        self.cadence.reset()
+        self.motion_gate.reset()
+        self.last_detections = None
+
+    def get_stats(self):
+        """감지 상태 통계"""
+        return {
+            'roi_tracking': self.roi_tracker.get_stats(),
+            'cadence': self.cadence.get_stats(),
+            'tracker': self.box_tracker.get_stats(),
+            'motion_gate': self.motion_gate.get_stats(),
+            'batching': batcher.get_stats(),
+            'backend': detector.backend,
+            'workers': inference_service.get_stats() if inference_service is not None else None
+        }
+
+# 한 프레임에 대한 감지 결과 (모든 세션과 엔드포인트가 공유하는 불변 객체)
+#   seq: 결과 시퀀스 번호 (파이프라인 발행 순서)
+#   timestamp: 원본 프레임 캡처 시각
+#   status, distance: 상태 문자열과 실제 거리(cm)
+#   boxes: 감지된 사람 박스 튜플 (x1, y1, x2, y2, confidence)
+#   best_match: 선택된 박스 정보 (읽기 전용 매핑) 또는 None
+#   target_point: 목표 중심점 (x, y) 또는 None
+#   frame: 캡처된 원본 프레임 (읽기 전용, 시각화는 camera.overlay 렌더 단계에서 렌디션에 그림)
+#   buffer: frame을 담고 있는 풀 버퍼 (PooledFrame, 파이프라인에서 발행된 경우)
+#   settings: 원본 프레임 캡처 시점의 화질 설정 스냅샷 (QualitySettings, 파이프라인에서 발행된 경우)
+#   people: 모든 사람의 벡터화된 감지 결과 (PersonDetections) 또는 None
+class DetectionResult(namedtuple('DetectionResult', [
+        'seq', 'timestamp', 'status', 'distance',
+        'boxes', 'best_match', 'target_point', 'frame', 'buffer', 'settings', 'people'
+], defaults=(None, None, None))):
+    __slots__ = ()
+
+    def release(self):
+        """결과 프레임 버퍼 참조 해제 (파이프라인에서 받은 결과는 사용 후 호출)"""
+        if self.buffer is not None:
+            self.buffer.release()
+
+# 프레임 안의 모든 사람에 대한 벡터화된 감지 결과 (행마다 한 사람, 모두 읽기 전용 배열)
+#   boxes: (M, 4) int32 [x1, y1, x2, y2]
+#   confidences: (M,) float32 신뢰도 (추적 예측이면 추적 신뢰도)
+#   target_points: (M, 2) int32 목표점 (x, y)
+#   deviations: (M, 2) int32 프레임 중심 대비 X/Y 편차 (절대값, 픽셀)
+#   distances: (M,) float64 프레임 중심과 목표점 사이 실제 거리(cm)
+#   best_index: best_match 행 번호 (가장 위쪽 y1). 사람이 없으면 -1
+#   tracked: 추적기 예측 결과 여부
+class PersonDetections(namedtuple('PersonDetections', [
+        'boxes', 'confidences', 'target_points', 'deviations', 'distances', 'best_index', 'tracked'
+])):
+    __slots__ = ()
+
+    def to_boxes(self):
+        """DetectionResult.boxes 형식의 튜플 ((x1, y1, x2, y2, confidence), ...)"""
+        return tuple(tuple(box) + (confidence,)
+                     for box, confidence in zip(self.boxes.tolist(), self.confidences.tolist()))
+
+    def best_match(self):
+        """best_match 행을 사전으로 변환. 사람이 없으면 None"""
+        if self.best_index < 0:
+            return None
+        x1, y1, x2, y2 = self.boxes[self.best_index].tolist()
+        return {
+            'x1': x1,
+            'y1': y1,
+            'x2': x2,
+            'y2': y2,
+            'target_y': int(self.target_points[self.best_index, 1]),
+            'confidence': float(self.confidences[self.best_index]),
+            'tracked': self.tracked
+        }
+
+def analyze_detections(detections, frame_shape, pixels_per_cm=None, min_confidence=None, tracked=False):
+    """
+    감지 배열에서 사람 필터링, 신뢰도 임계값, 최상단 박스 선택, 목표점/편차/거리 계산을 한 번에 수행
+
+    Args:
+        detections (np.ndarray): (N, 6) 배열 [x1, y1, x2, y2, confidence, class_id]
+        frame_shape (tuple): 프레임 형상
+        pixels_per_cm (float): 픽셀당 cm (기본값: 프레임 높이 기준 추정값)
+        min_confidence (float): 최소 신뢰도 (초과만 유지, 기본값: Config.DETECTION_CONFIDENCE)
+        tracked (bool): 추적기 예측 결과 여부
+
+    Returns:
+        PersonDetections: 모든 사람의 감지 결과
+    """
+    frame_height, frame_width = frame_shape[:2]
+    if pixels_per_cm is None:
+        pixels_per_cm = (frame_height * 0.8) / 170
+    if min_confidence is None:
+        min_confidence = Config.DETECTION_CONFIDENCE
+
+    # 사람 클래스(class_id=0)이면서 신뢰도가 임계값을 넘는 행만 선택
+    keep = (detections[:, 5] == 0) & (detections[:, 4] > min_confidence)
+    people = detections[keep]
+
+    boxes = people[:, :4].astype(np.int32)
+    confidences = people[:, 4].astype(np.float32)
+
+    # 목표점: 좌우 중앙, 머리 위치(y1)에서 목표 거리만큼 아래
+    target_points = np.empty((len(boxes), 2), dtype=np.int32)
+    target_points[:, 0] = (boxes[:, 0] + boxes[:, 2]) // 2
+    target_points[:, 1] = boxes[:, 1] + int(Config.TARGET_DISTANCE * pixels_per_cm)
+
+    deviations = np.abs(target_points - np.array([frame_width // 2, frame_height // 2], dtype=np.int32))
+    distances = np.hypot(deviations[:, 0], deviations[:, 1]) / pixels_per_cm
+
+    # 사람의 상체 부분: 가장 위쪽(y1 최소) 박스 (동률이면 먼저 감지된 박스)
+    best_index = int(boxes[:, 1].argmin()) if len(boxes) else -1
+
+    for array in (boxes, confidences, target_points, deviations, distances):
+        array.flags.writeable = False
+    return PersonDetections(boxes, confidences, target_points, deviations, distances,
+                            best_index, tracked)
+
+def analyze_frame(frame, seq=0, timestamp=None, context=None):
+    """
+    프레임에서 사람을 감지하고 T셔츠 중심점을 계산하여 결과 객체로 반환
+
+    입력 프레임은 수정하지 않으므로 공유 프레임을 복사 없이 그대로 전달할 수 있습니다.
+    (시각화는 camera.overlay의 렌더 단계에서 출력 렌디션에 그림)
 
     Args:
         frame: 입력 프레임
-        state: 모니터링 상태 객체
+        seq (int): 프레임 시퀀스 번호
+        timestamp (float): 프레임 캡처 시각
+        context (DetectionContext): 스트림별 감지 상태 (ROI 추적, 추론 주기 등).
+            None이면 매 프레임 전체 프레임 추론
 
     Returns:
-        처리된 프레임
+        DetectionResult: 감지 결과 (people에 모든 사람의 감지 결과 포함)
     """
+    if timestamp is None:
+        timestamp = time.time()
+
+    status = "사람이 감지되지 않음"
+    distance = 0
+    boxes = ()
+    best_match = None
+    target_point = None
+
     try:
         if frame is None or frame.size == 0:
             logger.warning("유효하지 않은 프레임")
-            return frame
+            return DetectionResult(seq, timestamp, "처리 오류", 0, (), None, None, frame)
 
         frame_height, frame_width = frame.shape[:2]
-        frame_center_x = frame_width // 2
         frame_center_y = frame_height // 2
 
-        # YOLO 모델이 사용 불가능한 경우 기본 시각화만 제공
-        if not YOLO_AVAILABLE or detector._model is None:
-            state.status = "YOLO 모델 없음"
-            state.distance = 0
-
-            # 기본 시각화 (프레임 중심점만 표시)
-            cv2.circle(frame, (frame_center_x, frame_center_y), 5, (0, 255, 0), -1)
-            cv2.line(frame, (frame_center_x - 10, frame_center_y),
-                    (frame_center_x + 10, frame_center_y), (0, 255, 0), 1)
-            cv2.line(frame, (frame_center_x, frame_center_y - 10),
-                    (frame_center_x, frame_center_y + 10), (0, 255, 0), 1)
-
-            cv2.putText(frame, "YOLO model not available", (10, 30),
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 0, 255), 2)
+        # 모델이 아직 준비되지 않았거나 사용 불가능한 경우 감지 없이 상태만 반환
+        # (렌더 단계가 상태에 맞는 안내 문구를 표시)
+        if not is_model_ready():
+            if inference_service is None and detector.load_phase == LOAD_FAILED:
+                status = "YOLO 모델 없음"
+            else:
+                # 백그라운드 로딩이 끝날 때까지 감지 없이 프레임만 스트리밍
+                start_model_loading()
+                status = "모델 로딩 중"
 
-            return frame
+            return _make_result(seq, timestamp, status, distance, boxes,
+                                best_match, target_point, frame)
 
-        # YOLO 모델로 객체 감지 (verbose=False로 로그 억제)
         current_time = time.time()
-        results = detector._model(frame, conf=Config.DETECTION_CONFIDENCE, verbose=False)
-
-        # 3초마다 한 번씩만 감지 결과 로그 출력
-        if current_time - detector._last_log_time >= detector._log_interval:
-            if results and results[0].boxes:
-                detected_objects = []
-                for result in results[0].boxes.data:
-                    class_id = int(result[5])
-                    confidence = float(result[4])
-                    if class_id == 0:  # 사람 클래스
-                        detected_objects.append(f"person(conf:{confidence:.2f})")
-
-                if detected_objects:
-                    logger.debug(f"객체 감지: {', '.join(detected_objects)}")
-
+        should_log = current_time - detector._last_log_time >= detector._log_interval
+        if should_log:
             detector._last_log_time = current_time
 
-        if not results or not results[0].boxes:
-            state.status = "사람이 감지되지 않음"
-            state.distance = 0
-            return frame
-
-        # 사람의 상체 부분만 감지
-        detected = False
-        best_match = None
-        min_upper_body_y = float('inf')
-
         # 픽셀당 실제 거리(cm) 계산을 위한 기준값
         # 예: 1.5m 거리에서 촬영 시 사람의 평균 키(170cm)가 프레임 높이의 80%를 차지한다고 가정
         PIXELS_PER_CM = (frame_height * 0.8) / 170
 
-        for result in results[0].boxes.data:
-            class_id = int(result[5])
-            confidence = float(result[4])
-
-            # 사람 클래스(class_id=0)만 처리
-            if class_id == 0 and confidence > Config.DETECTION_CONFIDENCE:
-                x1, y1, x2, y2 = map(int, result[:4])
-
-                # 머리 위치(y1)에서 목표 거리만큼 아래 지점을 목표점으로 설정
-                target_y = y1 + int(Config.TARGET_DISTANCE * PIXELS_PER_CM)
-
-                if y1 < min_upper_body_y:
-                    min_upper_body_y = y1
-                    best_match = {
-                        'x1': x1,
-                        'y1': y1,
-                        'x2': x2,
-                        'y2': y2,
-                        'target_y': target_y,
-                        'confidence': confidence
-                    }
+        tracked = context is not None and not context.cadence.should_run(timestamp, context.box_tracker)
+        if tracked:
+            # 추론 사이 프레임: 추적기가 예측한 박스 사용 (신뢰도 감쇠는 추적기가 관리)
+            context.cadence.mark_tracked()
+            detections = _predict_tracked(context, timestamp, frame.shape)
+            people = analyze_detections(detections, frame.shape, PIXELS_PER_CM,
+                                        min_confidence=-1.0, tracked=True)
+        elif context is not None and context.motion_gate.is_static(frame, timestamp):
+            # 마지막 추론 이후 장면 변화가 없으면 추론 없이 이전 감지 결과 재사용
+            people = analyze_detections(context.last_detections, frame.shape, PIXELS_PER_CM)
+            _refresh_tracking(context, people, timestamp)
+        else:
+            # 추적 중이면 이전 사람 주변 영역만 추론
+            region = context.roi_tracker.next_region(frame.shape) if context is not None else None
+            detections = _predict(frame, region)
+            if detections is None:
+                if context is not None:
+                    context.reset()
+                return _make_result(seq, timestamp, "처리 오류", 0, (), None, None, frame)
+
+            if should_log:
+                _log_detections(detections, region)
+
+            people = analyze_detections(detections, frame.shape, PIXELS_PER_CM)
+            if context is not None:
+                # ROI에서 사람을 놓친 결과는 재사용하지 않음 (다음 프레임은 전체 프레임 추론)
+                context.motion_gate.mark_inference(timestamp,
+                                                   reusable=region is None or people.best_index >= 0)
+                context.last_detections = detections
+                _update_tracking(context, region, people, timestamp)
+
+        boxes = people.to_boxes()
+        best_match = people.best_match()
 
         if best_match:
-            # 목표점 계산 (머리 위치에서 설정된 거리만큼 아래, 좌우 중앙)
-            target_center_x = (best_match['x1'] + best_match['x2']) // 2
-            target_center_y = best_match['target_y']
+            best = people.best_index
+            target_center_x, target_center_y = people.target_points[best].tolist()
+            target_point = (target_center_x, target_center_y)
 
             # X축과 Y축 거리 별도 계산
-            distance_x = abs(frame_center_x - target_center_x)
-            distance_y = abs(frame_center_y - target_center_y)
-            distance = np.sqrt(distance_x**2 + distance_y**2)
+            distance_x, distance_y = people.deviations[best].tolist()
 
             # 실제 거리(cm) 계산
-            real_distance_cm = distance / PIXELS_PER_CM
+            real_distance_cm = float(people.distances[best])
 
-            # 상태 업데이트 (X, Y 축 각각 확인)
+            # 상태 결정 (X, Y 축 각각 확인)
             tolerance = Config.TOLERANCE
             if distance_x <= tolerance and distance_y <= tolerance:
-                state.status = "정상"
+                status = "정상"
             elif distance_x > tolerance and distance_y <= tolerance:
-                state.status = "좌우 벗어남"
+                status = "좌우 벗어남"
             elif distance_x <= tolerance and distance_y > tolerance:
                 if target_center_y < frame_center_y:
-                    state.status = "너무 높음"
+                    status = "너무 높음"
                 else:
-                    state.status = "너무 낮음"
+                    status = "너무 낮음"
             else:
-                state.status = "중심에서 벗어남"
+                status = "중심에서 벗어남"
 
-            state.distance = int(real_distance_cm)
+            distance = int(real_distance_cm)
 
-            # 시각화
-            _draw_visualization(frame, frame_center_x, frame_center_y,
-                              target_center_x, target_center_y,
-                              best_match, real_distance_cm)
-
-            detected = True
             # 3초마다 한 번씩만 상세 로그 출력
-            if current_time - detector._last_log_time >= detector._log_interval:
-                logger.debug(f"감지 성공: 상태={state.status}, 거리={state.distance}cm")
-
-        if not detected:
-            state.status = "사람이 감지되지 않음"
-            state.distance = 0
+            if should_log:
+                logger.debug(f"감지 성공: 상태={status}, 거리={distance}cm")
 
-        return frame
+        return _make_result(seq, timestamp, status, distance, boxes,
+                            best_match, target_point, frame, people)
 
     except Exception as e:
         logger.log_exception("T셔츠 중심점 감지 중 오류", e)
-        state.status = "처리 오류"
-        state.distance = 0
-        return frame
-
-def _draw_visualization(frame, frame_center_x, frame_center_y,
-                       target_center_x, target_center_y,
-                       best_match, real_distance_cm):
+        return _make_result(seq, timestamp, "처리 오류", 0, (), None, None, frame)
+
+def _log_detections(detections, region):
+    """감지된 사람 목록 디버그 로그 (호출 빈도는 analyze_frame에서 제한)"""
+    confidences = detections[detections[:, 5] == 0, 4]
+    if len(confidences):
+        detected_objects = ', '.join(f"person(conf:{confidence:.2f})" for confidence in confidences.tolist())
+        logger.debug(f"객체 감지: {detected_objects}{' (ROI)' if region is not None else ''}")
+
+def _update_tracking(context, region, people, timestamp):
+    """다음 프레임의 추론 영역과 박스 추적기 갱신 (놓치면 전체 프레임으로 복귀)"""
+    context.cadence.mark_inference(timestamp)
+    if people.best_index >= 0:
+        best_box = tuple(people.boxes[people.best_index].tolist())
+        confidence = float(people.confidences[people.best_index])
+        context.roi_tracker.update(region, best_box, confidence)
+        context.box_tracker.update(best_box, confidence, timestamp)
+    else:
+        context.roi_tracker.update(region, None, 0.0)
+        context.box_tracker.update(None, 0.0, timestamp)
+
+def _refresh_tracking(context, people, timestamp):
+    """재사용한 감지 결과로 추론 주기와 박스 추적기 갱신 (ROI 통계는 실제 추론만 집계)"""
+    context.cadence.mark_reused(timestamp)
+    if people.best_index >= 0:
+        context.box_tracker.update(tuple(people.boxes[people.best_index].tolist()),
+                                   float(people.confidences[people.best_index]), timestamp)
+
+def _predict_tracked(context, timestamp, frame_shape):
     """
-    프레임에 시각화 요소들을 그립니다.
+    추론을 건너뛴 프레임에서 추적기로 best_match 박스 예측
 
-    Args:
-        frame: 대상 프레임
-        frame_center_x, frame_center_y: 프레임 중심점
-        target_center_x, target_center_y: 목표 중심점
-        best_match: 감지된 객체 정보
-        real_distance_cm: 실제 거리(cm)
+    Returns:
+        np.ndarray: 감지 배열과 같은 형식의 (0 또는 1, 6) 배열 (신뢰도 자리에 추적 신뢰도)
     """
-    try:
-        # 프레임 중심점 (녹색)
-        cv2.circle(frame, (frame_center_x, frame_center_y), 5, (0, 255, 0), -1)
-
-        # 목표 중심점 (빨간색)
-        cv2.circle(frame, (target_center_x, target_center_y), 5, (0, 0, 255), -1)
-
-        # 감지된 영역 표시 (파란색)
-        cv2.rectangle(frame,
-                     (best_match['x1'], best_match['y1']),
-                     (best_match['x2'], best_match['y2']),
-                     (255, 0, 0), 2)
-
-        # 중심점 연결선 (파란색)
-        cv2.line(frame, (frame_center_x, frame_center_y),
-                (target_center_x, target_center_y), (255, 0, 0), 2)
-
-        # 정보 텍스트
-        font = cv2.FONT_HERSHEY_SIMPLEX
-        font_scale = 0.7
-        thickness = 2
+    predicted = context.box_tracker.predict(timestamp)
+    if predicted is None:
+        return np.empty((0, 6), dtype=np.float32)
+
+    (x1, y1, x2, y2), confidence = predicted
+    frame_height, frame_width = frame_shape[:2]
+    x1 = min(max(x1, 0), frame_width - 1)
+    x2 = min(max(x2, x1 + 1), frame_width)
+    y1 = min(max(y1, 0), frame_height - 1)
+    y2 = min(max(y2, y1 + 1), frame_height)
+    return np.array([[x1, y1, x2, y2, confidence, 0]], dtype=np.float32)
+
+def _make_result(seq, timestamp, status, distance, boxes, best_match, target_point, frame, people=None):
+    """
+    감지 결과를 읽기 전용 DetectionResult로 고정
 
-        # 거리 정보
-        cv2.putText(frame, f"Distance: {int(real_distance_cm)}cm",
-                   (10, 30), font, font_scale, (0, 255, 0), thickness)
+    frame은 호출자의 배열이므로 쓰기 가능 여부를 바꾸지 않습니다.
+    (파이프라인은 자신이 소유한 풀 버퍼를 발행 전에 직접 읽기 전용으로 고정)
+    """
+    if best_match is not None:
+        best_match = MappingProxyType(best_match)
+    return DetectionResult(seq, timestamp, status, distance, boxes,
+                           best_match, target_point, frame, people=people)
 
-        # 신뢰도 정보
-        cv2.putText(frame, f"Confidence: {best_match['confidence']:.2f}",
-                   (10, 60), font, font_scale, (0, 255, 0), thickness)
+def detect_tshirt_center(frame, state):
+    """
+    프레임에서 사람을 감지하고 T셔츠 중심점을 계산
 
-        # 프레임 중심 십자가
-        cv2.line(frame, (frame_center_x - 10, frame_center_y),
-                (frame_center_x + 10, frame_center_y), (0, 255, 0), 1)
-        cv2.line(frame, (frame_center_x, frame_center_y - 10),
-                (frame_center_x, frame_center_y + 10), (0, 255, 0), 1)
+    Args:
+        frame: 입력 프레임
+        state: 모니터링 상태 객체
 
-    except Exception as e:
-        logger.log_exception("시각화 그리기 중 오류", e)
\ No newline at end of file
+    Returns:
+        시각화가 그려진 새 프레임 (입력 프레임은 수정하지 않음)
+    """
+    result = analyze_frame(frame)
+    state.status = result.status
+    state.distance = result.distance
+    return render_overlay(result)
@@ -0,0 +1,191 @@
+import cv2
+import threading
+from collections import Counter, OrderedDict, namedtuple
+from config import Config
+from utils.logger import logger
+from camera.overlay import renderer
+
+# 인코딩된 프레임
+#   seq: 원본 프레임 시퀀스 번호
+#   jpeg: JPEG 바이트
+#   chunk: MJPEG 스트림에 그대로 쓸 수 있는 multipart 파트 바이트
+EncodedFrame = namedtuple('EncodedFrame', ['seq', 'jpeg', 'chunk'])
+
+# 클라이언트가 요청한 스트림 렌디션 (공유 단계로 맞춘 값)
+#   width: 최대 출력 너비 (None이면 원본 해상도)
+#   quality: JPEG 품질 (None이면 프레임 캡처 시점의 화질 설정)
+#   max_fps: 최대 전송 FPS (None이면 제한 없음, 인코딩과 무관하게 클라이언트별로 적용)
+Rendition = namedtuple('Rendition', ['width', 'quality', 'max_fps'])
+
+def _parse_steps(value):
+    """쉼표로 구분된 단계 목록을 정렬된 정수 목록으로 변환"""
+    return sorted({int(step) for step in str(value).split(',') if step.strip()})
+
+def _fit_step(value, steps):
+    """value 이하의 가장 큰 단계 (모두 크면 가장 작은 단계)"""
+    fitting = [step for step in steps if step <= value]
+    return fitting[-1] if fitting else steps[0]
+
+def select_rendition(max_width=None, quality=None, max_fps=None):
+    """
+    클라이언트 요청을 공유 렌디션으로 매핑
+
+    너비와 품질을 설정된 단계(STREAM_RENDITION_WIDTHS, STREAM_QUALITY_STEPS)로 내림하므로
+    비슷한 요청을 한 클라이언트들은 같은 렌디션을 공유하고, 렌디션 수는 단계 수로 제한됩니다.
+
+    Args:
+        max_width (int): 최대 출력 너비 (픽셀)
+        quality (int): 희망 JPEG 품질 (1~100)
+        max_fps (float): 최대 전송 FPS
+
+    Returns:
+        Rendition: 공유 렌디션
+    """
+    widths = _parse_steps(Config.STREAM_RENDITION_WIDTHS)
+    qualities = _parse_steps(Config.STREAM_QUALITY_STEPS)
+
+    width = _fit_step(max_width, widths) if max_width and max_width > 0 and widths else None
+    if quality and quality > 0:
+        quality = min(quality, 100)
+        if qualities:
+            quality = _fit_step(quality, qualities)
+    else:
+        quality = None
+    return Rendition(width, quality, max_fps if max_fps and max_fps > 0 else None)
+
+def rendition_size(width, frame_shape):
+    """
+    렌디션 너비에 맞춘 출력 해상도 (종횡비 유지, 원본보다 크게 늘리지 않음)
+
+    Returns:
+        tuple: (width, height). 원본 해상도를 그대로 쓰면 None
+    """
+    frame_height, frame_width = frame_shape[:2]
+    if width is None or width >= frame_width:
+        return None
+    height = max(int(round(frame_height * width / frame_width / 2)) * 2, 2)
+    return (width, height)
+
+class FrameEncoder:
+    """감지 결과를 렌디션(품질, 해상도)별로 한 번만 렌더링/JPEG 인코딩하여 공유하는 캐시"""
+
+    def __init__(self, max_entries=16):
+        """
+        초기화
+
+        Args:
+            max_entries (int): 캐시에 유지할 최대 인코딩 결과 수
+        """
+        self.max_entries = max_entries
+        self._cache = OrderedDict()
+        self._pending = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.rendition_encodes = Counter()
+
+    def encode_rendition(self, result, rendition):
+        """
+        감지 결과를 클라이언트 렌디션으로 인코딩 (같은 렌디션의 클라이언트는 인코딩 결과를 공유)
+
+        Args:
+            result (DetectionResult): 감지 결과
+            rendition (Rendition): select_rendition()으로 맞춘 렌디션
+
+        Returns:
+            EncodedFrame: 인코딩 결과. 실패 시 None
+        """
+        if result.frame is None:
+            return None
+        quality = rendition.quality
+        if quality is None:
+            # 품질을 지정하지 않으면 프레임 캡처 시점의 화질 설정 스냅샷을 따름
+            quality = result.settings.quality if result.settings else Config.VIDEO_QUALITY
+        return self.encode(result, quality, rendition_size(rendition.width, result.frame.shape))
+
+    def encode(self, result, quality, size=None):
+        """
+        감지 결과를 렌디션 해상도로 렌더링하여 인코딩 (같은 렌디션은 캐시된 bytes를 그대로 반환)
+
+        Args:
+            result (DetectionResult): 감지 결과
+            quality (int): JPEG 품질
+            size (tuple): 출력 해상도 (width, height). None이면 원본 해상도
+
+        Returns:
+            EncodedFrame: 인코딩 결과. 실패 시 None
+        """
+        frame = result.frame
+        if frame is None or frame.size == 0:
+            return None
+
+        if size is None:
+            size = (frame.shape[1], frame.shape[0])
+        key = (result.seq, int(quality), int(size[0]), int(size[1]))
+
+        with self._lock:
+            encoded = self._cache.get(key)
+            if encoded is not None:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return encoded
+
+            # 다른 세션이 같은 렌디션을 인코딩 중이면 완료까지 대기
+            pending = self._pending.get(key)
+            if pending is None:
+                pending = threading.Event()
+                self._pending[key] = pending
+                owner = True
+                self.misses += 1
+                self.rendition_encodes[f"{key[2]}x{key[3]}@q{key[1]}"] += 1
+            else:
+                owner = False
+
+        if not owner:
+            pending.wait(timeout=2.0)
+            with self._lock:
+                return self._cache.get(key)
+
+        encoded = None
+        try:
+            encoded = self._encode_frame(result, quality, size)
+        finally:
+            with self._lock:
+                if encoded is not None:
+                    self._cache[key] = encoded
+                    while len(self._cache) > self.max_entries:
+                        self._cache.popitem(last=False)
+                del self._pending[key]
+            pending.set()
+
+        return encoded
+
+    def _encode_frame(self, result, quality, size):
+        """원본 프레임을 렌디션으로 축소하고 시각화를 그린 뒤 JPEG 인코딩"""
+        try:
+            frame = renderer.render(result, size)
+
+            encode_param = [int(cv2.IMWRITE_JPEG_QUALITY), int(quality)]
+            ret, buffer = cv2.imencode('.jpg', frame, encode_param)
+            if not ret:
+                logger.warning("프레임 인코딩 실패")
+                return None
+
+            jpeg = buffer.tobytes()
+            chunk = (b'--frame\r\n'
+                     b'Content-Type: image/jpeg\r\n\r\n' + jpeg + b'\r\n')
+            return EncodedFrame(result.seq, jpeg, chunk)
+
+        except Exception as e:
+            logger.log_exception("프레임 인코딩 중 오류", e)
+            return None
+
+    def get_stats(self):
+        """캐시 적중/미스 통계"""
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'entries': len(self._cache),
+                'renditions': dict(self.rendition_encodes)
+            }
@@ -0,0 +1,312 @@
+import atexit
+import itertools
+import multiprocessing
+import os
+import queue
+import threading
+import time
+import numpy as np
+from multiprocessing import shared_memory
+from camera.backends import BACKEND_PYTORCH, prepare_backend
+from config import Config
+from utils.logger import logger
+
+# 워커가 모델 로드를 마쳤음을 알리는 응답 ID
+WORKER_READY = 0
+
+def is_worker_process():
+    """
+    자식 프로세스(추론 워커) 안에서 실행 중인지 여부
+
+    spawn/forkserver 워커는 시작할 때 부모의 메인 모듈(app.py)을 다시 import하며,
+    이때는 parent_process()가 아직 설정되지 않았으므로 프로세스 이름으로도 확인합니다.
+    """
+    return (multiprocessing.parent_process() is not None
+            or multiprocessing.current_process().name != 'MainProcess')
+
+class _PendingRequest:
+    """워커 응답을 기다리는 추론 요청 (응답 또는 워커 종료로 슬롯이 반환될 때까지 유지)"""
+    __slots__ = ('slot', 'worker', 'result', 'done')
+
+    def __init__(self, slot, worker):
+        self.slot = slot
+        self.worker = worker
+        self.result = None
+        self.done = threading.Event()
+
+def _worker_main(slots, requests, responses, parent_pid):
+    """
+    추론 워커 프로세스 루프
+
+    워커 전용 요청 큐에서 (요청 ID, 슬롯 번호, 형상, dtype)을 받아 공유 메모리 슬롯의 프레임을
+    복사 없이 추론하고, 작은 (N, 6) 박스 배열만 응답 큐로 돌려줍니다.
+    """
+    if Config.INFERENCE_THREADS > 0:
+        try:
+            import torch
+            torch.set_num_threads(Config.INFERENCE_THREADS)
+        except ImportError:
+            pass
+
+    # 워커마다 자체 모델을 로드하고 준비 완료를 알림
+    # (내보내기는 부모 프로세스가 워커 시작 전에 마쳤으므로 캐시된 모델만 로드)
+    from camera.detector import detector
+    type(detector).export_models = False
+    if detector.load():
+        responses.put((WORKER_READY, os.getpid(), None))
+
+    while True:
+        try:
+            item = requests.get(timeout=1.0)
+        except queue.Empty:
+            # 웹 프로세스가 SIGTERM 등으로 정리 없이 종료되면 워커도 종료
+            if os.getppid() != parent_pid:
+                break
+            continue
+        if item is None:
+            break
+
+        request_id, slot_index, shape, dtype = item
+        try:
+            frame = np.ndarray(shape, dtype=dtype, buffer=slots[slot_index].buf)
+            data = detector.predict(frame)
+        except Exception as e:
+            logger.log_exception("추론 워커 처리 중 오류", e)
+            data = None
+        responses.put((request_id, slot_index, data))
+
+class InferenceService:
+    """
+    프로세스 외부 추론 워커 풀
+
+    웹 프로세스는 프레임(또는 ROI)을 공유 메모리 링 슬롯에 복사하고 슬롯 번호만 큐로 보내므로
+    큰 프레임 배열을 피클링하지 않습니다. 추론은 워커 프로세스에서 수행되어
+    Flask 스레드와 GIL을 두고 경쟁하지 않습니다.
+
+    predict()는 결과가 나올 때까지 기다리므로 카메라 파이프라인마다 처리 중인 요청은 하나뿐입니다.
+    워커를 늘리면 여러 카메라의 추론이 병렬로 실행되지만, 카메라 하나의 감지 FPS는
+    워커 하나의 추론 지연 시간으로 제한됩니다.
+    """
+
+    def __init__(self, num_workers=None, num_slots=None, slot_bytes=None):
+        """
+        초기화 및 워커 시작
+
+        Args:
+            num_workers (int): 워커 프로세스 수 (기본값: Config.INFERENCE_WORKERS)
+            num_slots (int): 공유 메모리 슬롯 수 (기본값: Config.INFERENCE_SLOTS, 0이면 워커 수 x 2)
+            slot_bytes (int): 슬롯 크기 (기본값: 가장 큰 화질 프리셋 프레임 크기)
+        """
+        self.num_workers = max(Config.INFERENCE_WORKERS if num_workers is None else num_workers, 1)
+        if num_slots is None:
+            num_slots = Config.INFERENCE_SLOTS or self.num_workers * 2
+        if slot_bytes is None:
+            slot_bytes = max(preset['width'] * preset['height'] * 3
+                             for preset in Config.QUALITY_PRESETS.values())
+        self.slot_bytes = slot_bytes
+        self.timeout = Config.INFERENCE_WORKER_TIMEOUT
+
+        self._context = multiprocessing.get_context(Config.INFERENCE_WORKER_START_METHOD)
+        self._slots = [shared_memory.SharedMemory(create=True, size=slot_bytes)
+                       for _ in range(num_slots)]
+        self._free_slots = queue.Queue()
+        for index in range(num_slots):
+            self._free_slots.put(index)
+
+        self._responses = self._context.Queue()
+        self._pending = {}
+        self._pending_lock = threading.Lock()
+        self._request_ids = itertools.count(WORKER_READY + 1)
+        self._ready_pids = set()
+        self._workers = []
+        self._worker_queues = []
+        self._stopped = False
+
+        self.requests = 0
+        self.timeouts = 0
+        self.restarts = 0
+
+        # 워커들이 동시에 같은 경로로 내보내지 않도록 부모 프로세스에서 한 번만 내보냄
+        if Config.INFERENCE_BACKEND != BACKEND_PYTORCH:
+            prepare_backend(Config.INFERENCE_BACKEND, Config.YOLO_MODEL_PATH)
+
+        for _ in range(self.num_workers):
+            worker, requests = self._start_worker()
+            self._workers.append(worker)
+            self._worker_queues.append(requests)
+
+        self._responder = threading.Thread(target=self._receive_responses, daemon=True)
+        self._responder.start()
+        atexit.register(self.stop)
+
+        logger.info(f"추론 워커 풀 시작 - 워커: {self.num_workers}, 슬롯: {num_slots} "
+                    f"({slot_bytes / (1 << 20):.1f}MB)")
+
+    def _start_worker(self):
+        """
+        워커 프로세스 시작
+
+        워커마다 요청 큐를 따로 두어 각 요청이 어느 워커에 있는지 알 수 있게 합니다.
+        (공유 큐라면 처리 도중 종료된 워커가 어떤 요청과 슬롯을 가져갔는지 알 수 없음)
+
+        Returns:
+            tuple: (워커 프로세스, 요청 큐)
+        """
+        requests = self._context.Queue()
+        worker = self._context.Process(target=_worker_main,
+                                       args=(self._slots, requests, self._responses, os.getpid()),
+                                       daemon=True)
+        worker.start()
+        return worker, requests
+
+    def _select_worker_locked(self):
+        """_pending_lock 보유 상태에서 처리 중인 요청이 가장 적은 살아 있는 워커 선택"""
+        load = [0] * len(self._workers)
+        for pending in self._pending.values():
+            load[pending.worker] += 1
+        alive = [index for index, worker in enumerate(self._workers) if worker.is_alive()]
+        return min(alive or range(len(self._workers)), key=lambda index: load[index])
+
+    def predict(self, frame, region=None):
+        """
+        워커 프로세스에서 추론
+
+        Args:
+            frame: 입력 프레임
+            region (tuple): 추론할 영역 (x1, y1, x2, y2). None이면 전체 프레임
+
+        Returns:
+            np.ndarray: 전체 프레임 좌표의 (N, 6) 박스 배열. 실패 또는 시간 초과 시 None
+        """
+        offset_x = offset_y = 0
+        if region is not None:
+            x1, y1, x2, y2 = region
+            frame = frame[y1:y2, x1:x2]
+            offset_x, offset_y = x1, y1
+
+        if frame.nbytes > self.slot_bytes:
+            logger.warning(f"프레임이 공유 메모리 슬롯보다 큽니다: {frame.shape}")
+            return None
+
+        try:
+            slot_index = self._free_slots.get(timeout=self.timeout)
+        except queue.Empty:
+            self.timeouts += 1
+            logger.warning("사용 가능한 추론 슬롯이 없습니다.")
+            return None
+
+        # ROI만 슬롯에 복사 (워커는 복사 없이 슬롯 메모리를 그대로 읽음)
+        np.ndarray(frame.shape, dtype=frame.dtype, buffer=self._slots[slot_index].buf)[...] = frame
+
+        request_id = next(self._request_ids)
+        with self._pending_lock:
+            worker_index = self._select_worker_locked()
+            pending = _PendingRequest(slot_index, worker_index)
+            self._pending[request_id] = pending
+            self._worker_queues[worker_index].put((request_id, slot_index, frame.shape, frame.dtype.str))
+        self.requests += 1
+
+        if not pending.done.wait(self.timeout):
+            # 요청은 _pending에 남겨 두고, 늦게 도착한 응답이나 워커 종료 처리 시 슬롯을 반환함
+            self.timeouts += 1
+            logger.warning(f"추론 워커 응답 시간 초과 (요청 {request_id})")
+            return None
+
+        data = pending.result
+        if data is not None and (offset_x or offset_y):
+            data[:, [0, 2]] += offset_x
+            data[:, [1, 3]] += offset_y
+        return data
+
+    def _receive_responses(self):
+        """워커 응답을 요청자에게 분배하고 슬롯 반환 (죽은 워커는 재시작)"""
+        next_check = time.monotonic() + 1.0
+        while not self._stopped:
+            # 다른 워커의 응답이 계속 들어와도 죽은 워커를 주기적으로 확인
+            if time.monotonic() >= next_check:
+                self._restart_dead_workers()
+                next_check = time.monotonic() + 1.0
+            try:
+                request_id, slot_index, data = self._responses.get(timeout=1.0)
+            except queue.Empty:
+                continue
+            except (EOFError, OSError):
+                break
+
+            if request_id == WORKER_READY:
+                self._ready_pids.add(slot_index)
+                continue
+
+            with self._pending_lock:
+                pending = self._pending.pop(request_id, None)
+            if pending is None:
+                # 워커 종료 처리에서 이미 슬롯을 반환한 요청
+                continue
+            self._free_slots.put(pending.slot)
+            pending.result = data
+            pending.done.set()
+
+    def _restart_dead_workers(self):
+        """
+        비정상 종료된 워커 재시작
+
+        죽은 워커에 할당된 요청은 응답이 오지 않으므로, 대체 워커를 시작하기 전에
+        슬롯을 반환하고 대기 중인 요청자를 실패(None)로 깨웁니다.
+        """
+        for index, worker in enumerate(self._workers):
+            if self._stopped or worker.is_alive():
+                continue
+            logger.error(f"추론 워커 비정상 종료 (pid: {worker.pid}, 종료 코드: {worker.exitcode}) - 재시작")
+
+            with self._pending_lock:
+                orphaned = [request_id for request_id, pending in self._pending.items()
+                            if pending.worker == index]
+                for request_id in orphaned:
+                    pending = self._pending.pop(request_id)
+                    self._free_slots.put(pending.slot)
+                    pending.done.set()
+                self._ready_pids.discard(worker.pid)
+                self._workers[index], self._worker_queues[index] = self._start_worker()
+            if orphaned:
+                logger.warning(f"종료된 워커의 추론 요청 {len(orphaned)}건을 실패 처리하고 슬롯을 반환했습니다.")
+            self.restarts += 1
+
+    def stop(self):
+        """워커 종료 및 공유 메모리 해제"""
+        if self._stopped:
+            return
+        self._stopped = True
+
+        try:
+            for requests in self._worker_queues:
+                requests.put(None)
+            for worker in self._workers:
+                worker.join(timeout=2.0)
+                if worker.is_alive():
+                    worker.terminate()
+        except Exception as e:
+            logger.log_exception("추론 워커 종료 중 오류", e)
+
+        for slot in self._slots:
+            try:
+                slot.close()
+                slot.unlink()
+            except FileNotFoundError:
+                pass
+
+    def is_ready(self):
+        """모델 로드를 마친 워커가 하나 이상 살아 있는지 여부"""
+        return any(worker.is_alive() and worker.pid in self._ready_pids for worker in self._workers)
+
+    def get_stats(self):
+        """워커 풀 통계"""
+        return {
+            'workers': self.num_workers,
+            'alive': sum(1 for worker in self._workers if worker.is_alive()),
+            'ready': sum(1 for worker in self._workers
+                         if worker.is_alive() and worker.pid in self._ready_pids),
+            'free_slots': self._free_slots.qsize(),
+            'requests': self.requests,
+            'timeouts': self.timeouts,
+            'restarts': self.restarts
+        }
@@ -0,0 +1,166 @@
+import threading
+import time
+from collections import deque
+
+class FrameMailbox:
+    """
+    스트림 구독자별 최신 우선(latest-wins) 우편함 (크기 1)
+
+    감지 파이프라인은 결과를 발행할 때마다 모든 우편함에 넣기만 하고 기다리지 않습니다.
+    구독자가 이전 결과를 아직 가져가지 않았으면 그 결과는 버려지고 최신 결과로 교체되므로,
+    느린 클라이언트는 자기 프레임만 잃고 생산자나 다른 클라이언트를 막지 않습니다.
+    """
+
+    def __init__(self, session_id, camera_id=None, max_fps=None):
+        """
+        초기화
+
+        Args:
+            session_id (str): 구독한 세션 ID
+            camera_id (str): 카메라 ID (None이면 기본 카메라)
+            max_fps (float): 최대 전송 FPS (None이면 제한 없음)
+        """
+        self.session_id = session_id
+        self.camera_id = camera_id
+        self.max_fps = max_fps
+        self.min_interval = 1.0 / max_fps if max_fps else 0.0
+
+        self._cond = threading.Condition()
+        self._pending = None
+        self._closed = False
+        self._paused = False
+        self._next_take_time = 0.0
+        self._sent_times = deque(maxlen=64)
+
+        self.started_at = time.time()
+        self.sent = 0
+        self.dropped = 0    # 클라이언트가 따라오지 못해 버려진 결과
+        self.skipped = 0    # 최대 FPS 제한으로 건너뛴 결과
+
+    def put(self, result):
+        """
+        결과 넣기 (감지 스레드에서 호출, 대기하지 않음)
+
+        우편함이 버퍼 참조를 하나 추가로 보유하며, 가져가지 않은 이전 결과는 해제합니다.
+        """
+        if result.buffer is not None:
+            result.buffer.retain()
+        with self._cond:
+            if self._closed or self._paused:
+                replaced = result
+            else:
+                replaced = self._pending
+                self._pending = result
+                if replaced is not None:
+                    if self.min_interval and time.monotonic() < self._next_take_time:
+                        self.skipped += 1
+                    else:
+                        self.dropped += 1
+                self._cond.notify_all()
+        if replaced is not None:
+            replaced.release()
+
+    def delay(self):
+        """최대 FPS 제한으로 다음 결과를 가져갈 수 있을 때까지 남은 시간(초)"""
+        if not self.min_interval:
+            return 0.0
+        return max(self._next_take_time - time.monotonic(), 0.0)
+
+    def poll(self):
+        """
+        대기 없이 결과 가져오기
+
+        Returns:
+            DetectionResult: 새 결과 (사용 후 release() 필요). 없거나 FPS 제한 중이면 None
+        """
+        with self._cond:
+            return self._take_locked()
+
+    def take(self, timeout=1.0):
+        """
+        새 결과가 들어올 때까지 대기 후 가져오기 (최대 FPS 제한 시 전송 시각까지 먼저 대기)
+
+        Returns:
+            DetectionResult: 새 결과 (사용 후 release() 필요). 시간 초과 또는 종료 시 None
+        """
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while not self._closed:
+                result = self._take_locked()
+                if result is not None:
+                    return result
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return None
+                if self._pending is not None:
+                    # 결과는 있지만 전송 시각 전이면 그 시각까지만 대기 (그 사이 결과는 최신으로 교체됨)
+                    remaining = min(remaining, self.delay())
+                self._cond.wait(remaining)
+            return None
+
+    def _take_locked(self):
+        """_cond 보유 상태에서 대기 중인 결과를 꺼냄"""
+        if self._pending is None or self.delay() > 0:
+            return None
+        result = self._pending
+        self._pending = None
+
+        now = time.monotonic()
+        if self.min_interval:
+            # 늦게 가져갔으면 실제로 가져간 시각부터 간격을 둠 (밀린 뒤 연속 전송으로 FPS 제한을 넘지 않도록)
+            self._next_take_time = max(self._next_take_time, now) + self.min_interval
+        self._sent_times.append(now)
+        self.sent += 1
+        return result
+
+    def pause(self):
+        """결과 받기 일시 중지 (모니터링 중지 중에는 결과를 보관하거나 드롭으로 집계하지 않음)"""
+        with self._cond:
+            self._paused = True
+            pending = self._pending
+            self._pending = None
+        if pending is not None:
+            pending.release()
+
+    def resume(self):
+        """결과 받기 재개"""
+        with self._cond:
+            self._paused = False
+
+    def close(self):
+        """구독 종료 (대기 중인 take()를 깨우고 보유한 결과 해제)"""
+        with self._cond:
+            self._closed = True
+            pending = self._pending
+            self._pending = None
+            self._cond.notify_all()
+        if pending is not None:
+            pending.release()
+
+    @property
+    def closed(self):
+        return self._closed
+
+    def effective_fps(self):
+        """최근 전송 간격으로 계산한 실제 전송 FPS (전송이 멈추면 0으로 수렴)"""
+        with self._cond:
+            if len(self._sent_times) < 2:
+                return 0.0
+            first = self._sent_times[0]
+            span = time.monotonic() - first
+            return (len(self._sent_times) - 1) / span if span > 0 else 0.0
+
+    def get_stats(self):
+        """구독자별 전송/드롭 통계"""
+        offered = self.sent + self.dropped
+        return {
+            'session_id': self.session_id,
+            'camera_id': self.camera_id,
+            'max_fps': self.max_fps,
+            'sent': self.sent,
+            'dropped': self.dropped,
+            'skipped': self.skipped,
+            'drop_rate': round(self.dropped / offered, 3) if offered else 0.0,
+            'fps': round(self.effective_fps(), 1),
+            'connected_seconds': round(time.time() - self.started_at, 1)
+        }
@@ -0,0 +1,120 @@
+from collections import OrderedDict
+from config import Config
+from utils.logger import logger
+from camera.camera import SharedCamera
+from camera.pipeline import DetectionPipeline
+
+class CameraManager:
+    """
+    여러 SharedCamera와 카메라별 캡처/감지/인코딩 파이프라인을 관리하는 클래스
+
+    카메라별 파이프라인은 카메라마다 별도 프로세스가 아니라 웹 프로세스 안의 스레드로 실행합니다.
+    OpenCV 캡처/인코딩과 추론은 GIL을 놓으므로 카메라들이 병렬로 진행되고, 스트리밍 라우트가
+    발행된 프레임을 복사나 프로세스 간 전송 없이 바로 사용할 수 있기 때문입니다.
+    추론만 따로 격리하려면 공유 메모리 추론 워커 풀(INFERENCE_WORKERS)을 사용합니다.
+    카메라 하나의 장치 드라이버가 멈추거나 프로세스를 종료시키면 다른 카메라도 영향을 받습니다.
+    """
+
+    def __init__(self, sources=None, state=None):
+        """
+        초기화
+
+        Args:
+            sources (dict): 카메라 ID -> 비디오 소스 (기본값: Config.get_camera_sources())
+            state (MonitoringState): 기본 카메라의 상태/거리를 반영할 상태 객체 (선택사항)
+        """
+        try:
+            if sources is None:
+                sources = Config.get_camera_sources()
+
+            self.cameras = OrderedDict()
+            self.pipelines = OrderedDict()
+
+            # 카메라가 여러 대인 경우 다른 스테이션의 장치를 가로채지 않도록 대체 소스 탐색 비활성화
+            allow_fallback = len(sources) <= 1
+
+            for index, (camera_id, source) in enumerate(sources.items()):
+                camera = SharedCamera(video_source=source, allow_fallback=allow_fallback)
+                # 상태 객체(state.status/distance)는 기본(첫 번째) 카메라 결과만 반영
+                pipeline = DetectionPipeline(camera, state=state if index == 0 else None)
+                self.cameras[camera_id] = camera
+                self.pipelines[camera_id] = pipeline
+
+            self.default_id = next(iter(self.cameras))
+            logger.info(f"카메라 관리자 초기화 완료 - 카메라: {list(self.cameras.keys())}")
+
+        except Exception as e:
+            logger.log_exception("카메라 관리자 초기화 중 오류", e)
+            raise
+
+    def camera_ids(self):
+        """등록된 카메라 ID 목록"""
+        return list(self.cameras.keys())
+
+    def has_camera(self, camera_id):
+        """카메라 ID 존재 여부"""
+        return camera_id is None or camera_id in self.cameras
+
+    def get_camera(self, camera_id=None):
+        """카메라 조회 (camera_id가 없으면 기본 카메라)"""
+        return self.cameras.get(camera_id if camera_id is not None else self.default_id)
+
+    def get_pipeline(self, camera_id=None):
+        """카메라별 감지 파이프라인 조회 (camera_id가 없으면 기본 카메라)"""
+        return self.pipelines.get(camera_id if camera_id is not None else self.default_id)
+
+    def add_session(self, session_id, camera_id=None):
+        """세션을 카메라에 등록하고 해당 카메라의 파이프라인 시작"""
+        try:
+            camera = self.get_camera(camera_id)
+            pipeline = self.get_pipeline(camera_id)
+            if camera is None:
+                return False
+
+            added = camera.add_session(session_id)
+            pipeline.start()
+            return added
+
+        except Exception as e:
+            logger.log_exception(f"카메라 세션 등록 중 오류 (ID: {session_id})", e)
+            return False
+
+    def remove_session(self, session_id, camera_id=None):
+        """세션을 카메라에서 제거 (마지막 세션이면 카메라와 함께 감지 파이프라인도 중지)"""
+        camera = self.get_camera(camera_id)
+        if camera is not None:
+            camera.remove_session(session_id)
+            if not camera.active_sessions:
+                self.get_pipeline(camera_id).stop()
+
+    def get_status(self, camera_id=None):
+        """카메라별 상태/거리 조회"""
+        try:
+            camera = self.get_camera(camera_id)
+            pipeline = self.get_pipeline(camera_id)
+            if camera is None:
+                return None
+
+            result = pipeline.get_latest_result()
+            if result is not None:
+                result.release()
+            return {
+                'camera_id': camera_id if camera_id is not None else self.default_id,
+                'status': result.status if result else "대기중",
+                'distance': result.distance if result else 0,
+                'is_active': camera.is_active(),
+                'frame_seq': result.seq if result else 0,
+                'detection': pipeline.context.get_stats(),
+                'encoder': pipeline.encoder.get_stats(),
+                'streams': pipeline.get_subscriber_stats()
+            }
+
+        except Exception as e:
+            logger.log_exception("카메라 상태 조회 중 오류", e)
+            return None
+
+    def stop_all(self):
+        """모든 파이프라인과 카메라 중지"""
+        for camera_id in self.cameras:
+            self.pipelines[camera_id].stop()
+            self.cameras[camera_id].stop_capture()
@@ -0,0 +1,178 @@
+import cv2
+import numpy as np
+import threading
+from collections import OrderedDict
+from utils.logger import logger
+
+# 상태별 안내 문구 (문구, 위치). 'top'은 좌상단, 'middle'은 세로 중앙에 크게 표시
+STATUS_MESSAGES = {
+    "모델 로딩 중": ("Loading detection model...", 'top'),
+    "YOLO 모델 없음": ("YOLO model not available", 'top'),
+    "카메라 재연결 중": ("Camera reconnecting...", 'middle')
+}
+
+class OverlayRenderer:
+    """
+    감지 결과를 출력 렌디션 위에 그리는 렌더 단계
+
+    캡처/감지에 쓰인 원본 프레임은 수정하지 않고, 출력 해상도로 축소한 복사본에만 그립니다.
+    프레임 중심 십자가 같은 정적 요소는 해상도별로 한 번만 미리 그려 두고 합성하며,
+    박스/목표점/문구 같은 동적 요소는 렌디션 해상도 좌표로 변환해 그립니다.
+    """
+
+    def __init__(self, max_layers=4):
+        """
+        초기화
+
+        Args:
+            max_layers (int): 캐시에 유지할 해상도별 정적 레이어 수
+        """
+        self.max_layers = max_layers
+        self._layers = OrderedDict()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def render(self, result, size=None):
+        """
+        감지 결과를 렌디션 해상도로 렌더링
+
+        Args:
+            result (DetectionResult): 감지 결과 (frame은 원본 프레임)
+            size (tuple): 출력 해상도 (width, height). None이면 원본 해상도
+
+        Returns:
+            np.ndarray: 시각화가 그려진 렌디션 프레임 (스레드별 재사용 버퍼이므로 다음 호출 전까지만 유효)
+        """
+        frame = result.frame
+        if size is None:
+            size = (frame.shape[1], frame.shape[0])
+        width, height = int(size[0]), int(size[1])
+
+        output = self._get_buffer((height, width) + frame.shape[2:], frame.dtype)
+        if (frame.shape[1], frame.shape[0]) != (width, height):
+            cv2.resize(frame, (width, height), dst=output, interpolation=cv2.INTER_AREA)
+        else:
+            np.copyto(output, frame)
+
+        try:
+            self._draw_result(output, result, width / frame.shape[1], height / frame.shape[0])
+            # 십자가는 중심점 연결선 위에 보이도록 마지막에 합성
+            self._draw_crosshair(output)
+        except Exception as e:
+            logger.log_exception("오버레이 렌더링 중 오류", e)
+        return output
+
+    def _get_buffer(self, shape, dtype):
+        """스레드별 출력 버퍼 (형상이 바뀔 때만 새로 할당)"""
+        buffer = getattr(self._local, 'buffer', None)
+        if buffer is None or buffer.shape != shape or buffer.dtype != dtype:
+            buffer = np.empty(shape, dtype=dtype)
+            self._local.buffer = buffer
+        return buffer
+
+    def _crosshair_layer(self, width, height):
+        """
+        해상도별 프레임 중심 십자가 레이어 (처음 요청될 때 한 번만 그림)
+
+        Returns:
+            tuple: (y 슬라이스, x 슬라이스, 패치, 마스크) - 패치/마스크는 십자가 주변 영역만 포함
+        """
+        key = (width, height)
+        with self._lock:
+            layer = self._layers.get(key)
+            if layer is not None:
+                self._layers.move_to_end(key)
+                return layer
+
+        center_x, center_y = width // 2, height // 2
+        x1, y1 = max(center_x - 10, 0), max(center_y - 10, 0)
+        x2, y2 = min(center_x + 11, width), min(center_y + 11, height)
+
+        patch = np.zeros((y2 - y1, x2 - x1, 3), dtype=np.uint8)
+        center = (center_x - x1, center_y - y1)
+        cv2.circle(patch, center, 5, (0, 255, 0), -1)
+        cv2.line(patch, (center[0] - 10, center[1]), (center[0] + 10, center[1]), (0, 255, 0), 1)
+        cv2.line(patch, (center[0], center[1] - 10), (center[0], center[1] + 10), (0, 255, 0), 1)
+        mask = patch.any(axis=2)
+
+        layer = (slice(y1, y2), slice(x1, x2), patch, mask)
+        with self._lock:
+            self._layers[key] = layer
+            while len(self._layers) > self.max_layers:
+                self._layers.popitem(last=False)
+        return layer
+
+    def _draw_crosshair(self, output):
+        """미리 그린 십자가 레이어를 렌디션에 합성"""
+        if output.ndim != 3 or output.shape[2] != 3:
+            return
+        rows, cols, patch, mask = self._crosshair_layer(output.shape[1], output.shape[0])
+        output[rows, cols][mask] = patch[mask]
+
+    def _draw_result(self, output, result, scale_x, scale_y):
+        """
+        동적 요소(안내 문구, 감지 박스, 목표점, 거리/신뢰도)를 렌디션 좌표로 그림
+
+        Args:
+            output: 렌디션 프레임
+            result (DetectionResult): 감지 결과 (좌표는 원본 해상도 기준)
+            scale_x, scale_y (float): 원본 대비 렌디션 배율
+        """
+        height, width = output.shape[:2]
+        font = cv2.FONT_HERSHEY_SIMPLEX
+
+        message = STATUS_MESSAGES.get(result.status)
+        if message is not None:
+            text, position = message
+            if position == 'middle':
+                font_scale = max(width / 1280.0, 0.6)
+                cv2.putText(output, text, (10, height // 2), font, font_scale,
+                            (0, 0, 255), max(int(font_scale * 2), 1))
+            else:
+                cv2.putText(output, text, (10, 30), font, 0.7, (0, 0, 255), 2)
+
+        best_match = result.best_match
+        if not best_match or result.target_point is None:
+            return
+
+        center = (width // 2, height // 2)
+        target = (int(result.target_point[0] * scale_x), int(result.target_point[1] * scale_y))
+
+        # 목표 중심점 (빨간색)
+        cv2.circle(output, target, 5, (0, 0, 255), -1)
+
+        # 감지된 영역 표시 (파란색)
+        cv2.rectangle(output,
+                      (int(best_match['x1'] * scale_x), int(best_match['y1'] * scale_y)),
+                      (int(best_match['x2'] * scale_x), int(best_match['y2'] * scale_y)),
+                      (255, 0, 0), 2)
+
+        # 중심점 연결선 (파란색)
+        cv2.line(output, center, target, (255, 0, 0), 2)
+
+        # 거리 정보
+        cv2.putText(output, f"Distance: {int(result.distance)}cm",
+                    (10, 30), font, 0.7, (0, 255, 0), 2)
+
+        # 신뢰도 정보 (추적 예측 프레임이면 추적 신뢰도)
+        label = "Tracking" if best_match.get('tracked') else "Confidence"
+        cv2.putText(output, f"{label}: {best_match['confidence']:.2f}",
+                    (10, 60), font, 0.7, (0, 255, 0), 2)
+
+# 모든 스트림이 공유하는 렌더러 (정적 레이어 캐시 공유)
+renderer = OverlayRenderer()
+
+def render_overlay(result, size=None):
+    """
+    감지 결과를 시각화한 새 프레임 반환 (원본 프레임은 수정하지 않음)
+
+    Args:
+        result (DetectionResult): 감지 결과
+        size (tuple): 출력 해상도 (width, height). None이면 원본 해상도
+
+    Returns:
+        np.ndarray: 호출자가 소유하는 시각화 프레임. 프레임이 없으면 None
+    """
+    if result.frame is None or result.frame.size == 0:
+        return None
+    return renderer.render(result, size).copy()
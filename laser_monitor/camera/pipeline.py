@@ -0,0 +1,243 @@
+import threading
+import time
+from utils.logger import logger
+from camera.detector import analyze_frame, DetectionContext, DetectionResult
+from camera.encoder import FrameEncoder
+from camera.mailbox import FrameMailbox
+
+class DetectionPipeline:
+    """캡처된 프레임마다 한 번만 객체 감지를 수행하고 결과를 모든 소비자에게 공유하는 단계"""
+
+    def __init__(self, camera, state=None):
+        """
+        초기화
+
+        Args:
+            camera (SharedCamera): 프레임을 공급하는 공유 카메라
+            state (MonitoringState): 감지 결과(상태/거리)를 반영할 상태 객체 (선택사항)
+        """
+        self.camera = camera
+        self.state = state
+        self.encoder = FrameEncoder()
+        self.context = DetectionContext()
+
+        self._result_cond = threading.Condition()
+        self._latest_result = None
+        self._result_seq = 0
+        self._thread = None
+        self._stop_event = threading.Event()
+        self._listeners = []
+        self._mailboxes = []
+        self._mailbox_lock = threading.Lock()
+
+    def add_listener(self, callback):
+        """
+        결과 발행 시 호출할 콜백 등록
+
+        콜백은 발행된 DetectionResult를 인자로 감지 스레드에서 호출되므로 가볍게 유지해야 하며,
+        결과를 보관하려면 버퍼 대신 필요한 값만 복사해야 합니다.
+        """
+        self._listeners.append(callback)
+
+    def subscribe(self, session_id, camera_id=None, max_fps=None):
+        """
+        스트림 구독자 우편함 등록
+
+        Args:
+            session_id (str): 구독한 세션 ID
+            camera_id (str): 카메라 ID (통계 표시용)
+            max_fps (float): 구독자별 최대 전송 FPS (None이면 제한 없음)
+
+        Returns:
+            FrameMailbox: 발행되는 결과를 최신 우선으로 받는 우편함 (종료 시 unsubscribe() 필요)
+        """
+        mailbox = FrameMailbox(session_id, camera_id, max_fps)
+        with self._mailbox_lock:
+            self._mailboxes.append(mailbox)
+        # 구독 직후 바로 보낼 수 있도록 현재 최신 결과를 넣어 둠
+        latest = self.get_latest_result()
+        if latest is not None:
+            mailbox.put(latest)
+            latest.release()
+        return mailbox
+
+    def unsubscribe(self, mailbox):
+        """스트림 구독 해제 (우편함이 보유한 결과 해제)"""
+        with self._mailbox_lock:
+            if mailbox in self._mailboxes:
+                self._mailboxes.remove(mailbox)
+        mailbox.close()
+        stats = mailbox.get_stats()
+        logger.info(f"스트림 구독 종료: 세션 {mailbox.session_id}, 전송 {stats['sent']}, "
+                    f"드롭 {stats['dropped']}, FPS 제한 생략 {stats['skipped']}")
+
+    def get_subscriber_stats(self):
+        """구독자별 전송/드롭 통계 목록"""
+        with self._mailbox_lock:
+            mailboxes = list(self._mailboxes)
+        return [mailbox.get_stats() for mailbox in mailboxes]
+
+    def start(self):
+        """감지 스레드 시작 (이미 실행 중이면 무시)"""
+        try:
+            thread = self._thread
+            if thread is not None and thread.is_alive():
+                if not self._stop_event.is_set():
+                    return
+                # 중지 중인 이전 스레드가 끝나야 새 스레드를 시작 (두 스레드가 동시에 발행하지 않도록)
+                thread.join(timeout=2.0)
+                if thread.is_alive():
+                    logger.error("이전 감지 스레드가 아직 종료되지 않아 감지 파이프라인을 시작하지 못했습니다.")
+                    return
+
+            self._stop_event.clear()
+            self._thread = threading.Thread(target=self._run,
+                                            name=f"detection-{self.camera.video_source}",
+                                            daemon=True)
+            self._thread.start()
+            logger.info("감지 파이프라인 시작")
+
+        except Exception as e:
+            logger.log_exception("감지 파이프라인 시작 중 오류", e)
+
+    def stop(self):
+        """감지 스레드 중지"""
+        self._stop_event.set()
+        thread = self._thread
+        if thread is None or thread is threading.current_thread():
+            return
+        thread.join(timeout=2.0)
+        if thread.is_alive():
+            # 핸들을 유지해 start()가 이전 스레드의 종료를 확인하도록 함
+            logger.warning("감지 스레드가 시간 내에 종료되지 않았습니다.")
+        else:
+            self._thread = None
+
+    def _run(self):
+        """새 프레임을 기다렸다가 한 번씩 감지하고 결과를 발행"""
+        last_seq = 0
+        last_shape = None
+        reconnect_published = False
+
+        while not self._stop_event.is_set():
+            try:
+                captured = self.camera.wait_for_frame(last_seq, timeout=1.0)
+                if captured is None:
+                    if self.camera.is_ended():
+                        # 유한한 소스가 끝나면 더 올 프레임이 없으므로 중지 요청까지 대기
+                        self._stop_event.wait(1.0)
+                        continue
+                    # 카메라 재연결 중에는 마지막 프레임에 안내 문구를 덧씌워 한 번 발행
+                    if self.camera.is_reconnecting() and not reconnect_published:
+                        self._publish_reconnecting()
+                        self.context.reset()
+                        reconnect_published = True
+                    continue
+                last_seq = captured.seq
+                reconnect_published = False
+
+                # 해상도가 바뀌면 이전 좌표 기반의 추적 상태는 무효
+                frame = captured.buffer.array
+                # 발행된 프레임은 모든 시청자가 공유하므로 읽기 전용으로 고정 (풀에서 다시 꺼낼 때 복구됨)
+                frame.flags.writeable = False
+                if frame.shape != last_shape:
+                    self.context.reset()
+                    last_shape = frame.shape
+
+                # 감지는 원본 프레임을 수정하지 않으므로 캡처 버퍼를 복사 없이 그대로 발행
+                # (시각화는 인코딩 시 렌디션에만 그림)
+                result = analyze_frame(frame, seq=captured.seq,
+                                       timestamp=captured.timestamp, context=self.context)
+                self._publish(result._replace(buffer=captured.buffer, settings=captured.settings))
+
+            except Exception as e:
+                logger.log_exception("감지 파이프라인 처리 중 오류", e)
+                time.sleep(0.1)
+
+        logger.info("감지 파이프라인 종료")
+
+    def _publish_reconnecting(self):
+        """마지막 정상 프레임(없으면 빈 프레임)을 재연결 상태로 다시 발행 (안내 문구는 렌더 단계에서 표시)"""
+        latest = self.get_latest_result()
+        if latest is not None and latest.buffer is not None:
+            # 마지막 결과가 보유한 참조를 새 결과로 넘김 (복사 없음)
+            buffer = latest.buffer
+        else:
+            if latest is not None:
+                latest.release()
+            buffer = self.camera.buffer_pool.acquire((480, 640, 3))
+            buffer.array.fill(0)
+
+        frame = buffer.array
+        frame.flags.writeable = False
+
+        logger.info("카메라 재연결 중 - 마지막 프레임 유지")
+        self._publish(DetectionResult(0, time.time(), "카메라 재연결 중", 0,
+                                      (), None, None, frame, buffer, self.camera.settings))
+
+    def _publish(self, result):
+        """감지 결과 발행 (결과 시퀀스 번호는 발행 순서대로 부여)"""
+        if self.state is not None:
+            self.state.status = result.status
+            self.state.distance = result.distance
+
+        with self._result_cond:
+            self._result_seq += 1
+            result = result._replace(seq=self._result_seq)
+            previous = self._latest_result
+            self._latest_result = result
+            self._result_cond.notify_all()
+
+        # 구독자 우편함에 넣기만 하고 기다리지 않음 (느린 구독자는 이전 결과를 잃음)
+        with self._mailbox_lock:
+            mailboxes = list(self._mailboxes)
+        for mailbox in mailboxes:
+            mailbox.put(result)
+
+        for listener in self._listeners:
+            try:
+                listener(result)
+            except Exception as e:
+                logger.log_exception("감지 결과 리스너 처리 중 오류", e)
+
+        # 파이프라인이 보유하던 이전 결과의 버퍼 참조 해제
+        if previous is not None:
+            previous.release()
+
+    def _retain(self, result):
+        """소비자에게 넘길 결과의 버퍼 참조 추가 (_result_cond 보유 상태에서 호출)"""
+        if result.buffer is not None:
+            result.buffer.retain()
+        return result
+
+    def get_latest_result(self):
+        """
+        가장 최근 감지 결과 (없으면 None)
+
+        반환된 결과는 사용 후 release()를 호출해야 합니다.
+        """
+        with self._result_cond:
+            if self._latest_result is None:
+                return None
+            return self._retain(self._latest_result)
+
+    def wait_for_result(self, last_seq=0, timeout=1.0):
+        """
+        last_seq 이후의 감지 결과가 발행될 때까지 대기
+
+        Args:
+            last_seq (int): 소비자가 마지막으로 받은 결과의 시퀀스 번호
+            timeout (float): 최대 대기 시간(초)
+
+        Returns:
+            DetectionResult: 새 감지 결과. 시간 초과 시 None
+            반환된 결과는 사용 후 release()를 호출해야 합니다.
+        """
+        deadline = time.time() + timeout
+        with self._result_cond:
+            while self._latest_result is None or self._latest_result.seq <= last_seq:
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    return None
+                self._result_cond.wait(remaining)
+            return self._retain(self._latest_result)
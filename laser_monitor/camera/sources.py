@@ -0,0 +1,298 @@
+import cv2
+import numpy as np
+import os
+import time
+from config import Config
+from utils.logger import logger
+
+# 프레임 공급 속도
+PACING_REALTIME = 'realtime'  # 기록된(설정된) FPS에 맞춰 공급
+PACING_FAST = 'fast'          # 가능한 한 빠르게 공급
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.bmp')
+
+class FrameSource:
+    """
+    cv2.VideoCapture와 같은 인터페이스를 제공하는 카메라 대체 프레임 소스 기본 클래스
+
+    SharedCamera는 실제 카메라와 동일한 코드 경로(read/set/get/release)로 이 소스를 사용합니다.
+    파일/디렉토리 끝에 도달해 더 읽을 프레임이 없으면 ended가 True가 되며,
+    SharedCamera는 이를 연결 끊김이 아닌 스트림 종료로 처리합니다.
+    """
+
+    def __init__(self, fps=30, pacing=None, loop=None):
+        self.fps = float(fps) if fps and fps > 0 else 30.0
+        self.pacing = pacing or Config.FRAME_SOURCE_PACING
+        self.loop = Config.FRAME_SOURCE_LOOP if loop is None else loop
+        self.frame_index = 0
+        self.ended = False
+        self._opened = True
+        self._next_frame_time = None
+
+    def isOpened(self):
+        return self._opened
+
+    def release(self):
+        self._opened = False
+
+    def reset(self):
+        """해제되었거나 끝에 도달한 소스를 처음 상태로 다시 열기 (재연결 시 호출)"""
+        self.frame_index = 0
+        self.ended = False
+        self._opened = True
+        self._next_frame_time = None
+
+    def read(self, image=None):
+        """다음 프레임 읽기 (image가 주어지면 해당 버퍼에 기록)"""
+        if not self._opened:
+            return False, None
+
+        frame = self._next_frame(image)
+        if frame is None:
+            # 더 읽을 프레임이 없음 (반복 재생이 꺼진 파일/디렉토리의 끝)
+            self.ended = True
+            return False, None
+
+        self._wait_for_pacing()
+        self.frame_index += 1
+        return True, frame
+
+    def _next_frame(self, image):
+        """하위 클래스에서 다음 프레임을 생성"""
+        raise NotImplementedError
+
+    def _wait_for_pacing(self):
+        """실시간 모드에서는 FPS 간격에 맞춰 대기"""
+        if self.pacing != PACING_REALTIME:
+            return
+
+        now = time.perf_counter()
+        if self._next_frame_time is None:
+            self._next_frame_time = now
+        delay = self._next_frame_time - now
+        if delay > 0:
+            time.sleep(delay)
+        else:
+            # 처리 지연이 누적되면 기준 시각을 현재로 재설정
+            self._next_frame_time = now
+        self._next_frame_time += 1.0 / self.fps
+
+    def _copy_into(self, frame, image):
+        """주어진 버퍼에 프레임을 기록 (형상이 다르면 새 배열 반환)"""
+        if image is not None and image.shape == frame.shape and image.dtype == frame.dtype:
+            np.copyto(image, frame)
+            return image
+        return frame.copy()
+
+    def set(self, prop_id, value):
+        if prop_id == cv2.CAP_PROP_FPS and value > 0:
+            self.fps = float(value)
+            return True
+        return False
+
+    def get(self, prop_id):
+        if prop_id == cv2.CAP_PROP_FPS:
+            return self.fps
+        if prop_id == cv2.CAP_PROP_POS_FRAMES:
+            return float(self.frame_index)
+        return 0.0
+
+class VideoFileSource(FrameSource):
+    """녹화된 동영상 파일 프레임 소스"""
+
+    def __init__(self, path, pacing=None, loop=None):
+        self.path = path
+        self._cap = cv2.VideoCapture(path)
+        super().__init__(fps=self._cap.get(cv2.CAP_PROP_FPS), pacing=pacing, loop=loop)
+        self._opened = self._cap.isOpened()
+
+    def reset(self):
+        super().reset()
+        self._cap.release()
+        self._cap = cv2.VideoCapture(self.path)
+        self._opened = self._cap.isOpened()
+
+    def _next_frame(self, image):
+        ret, frame = self._cap.read(image) if image is not None else self._cap.read()
+        if not ret and self.loop:
+            # 파일 끝에 도달하면 처음부터 다시 재생
+            self._cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            ret, frame = self._cap.read(image) if image is not None else self._cap.read()
+        return frame if ret else None
+
+    def set(self, prop_id, value):
+        # 녹화 파일은 해상도/FPS를 바꿀 수 없으므로 무시
+        return False
+
+    def get(self, prop_id):
+        if prop_id in (cv2.CAP_PROP_FRAME_WIDTH, cv2.CAP_PROP_FRAME_HEIGHT,
+                       cv2.CAP_PROP_FRAME_COUNT):
+            return self._cap.get(prop_id)
+        return super().get(prop_id)
+
+    def release(self):
+        super().release()
+        self._cap.release()
+
+class ImageDirectorySource(FrameSource):
+    """이미지 디렉토리 프레임 소스 (파일명 순서대로 재생)"""
+
+    def __init__(self, path, fps=30, pacing=None, loop=None):
+        super().__init__(fps=fps, pacing=pacing, loop=loop)
+        self.path = path
+        self.files = sorted(os.path.join(path, f) for f in os.listdir(path)
+                            if f.lower().endswith(IMAGE_EXTENSIONS))
+        self._position = 0
+        self._cache = {}
+        self._opened = bool(self.files)
+        if not self.files:
+            logger.error(f"이미지 디렉토리에 이미지가 없습니다: {path}")
+
+    def reset(self):
+        super().reset()
+        self._position = 0
+        self._opened = bool(self.files)
+
+    def _next_frame(self, image):
+        if self._position >= len(self.files):
+            if not self.loop:
+                return None
+            self._position = 0
+
+        frame = self._load(self.files[self._position])
+        self._position += 1
+        return None if frame is None else self._copy_into(frame, image)
+
+    def _load(self, filepath):
+        """이미지 로드 (디코딩 비용이 측정을 왜곡하지 않도록 디코딩 결과를 재사용)"""
+        frame = self._cache.get(filepath)
+        if frame is None:
+            frame = cv2.imread(filepath)
+            if frame is None:
+                logger.warning(f"이미지를 읽을 수 없습니다: {filepath}")
+                return None
+            self._cache[filepath] = frame
+        return frame
+
+    def get(self, prop_id):
+        if self.files and prop_id in (cv2.CAP_PROP_FRAME_WIDTH, cv2.CAP_PROP_FRAME_HEIGHT):
+            frame = self._load(self.files[0])
+            if frame is None:
+                return 0.0
+            return float(frame.shape[1] if prop_id == cv2.CAP_PROP_FRAME_WIDTH else frame.shape[0])
+        if prop_id == cv2.CAP_PROP_FRAME_COUNT:
+            return float(len(self.files))
+        return super().get(prop_id)
+
+class SyntheticFrameSource(FrameSource):
+    """
+    합성 프레임 소스
+
+    generator를 지정하지 않으면 좌우로 움직이는 사람 형태의 도형을 그린 결정적 프레임을 생성합니다.
+    해상도/FPS를 지정하지 않으면 카메라처럼 CAP_PROP_FRAME_WIDTH/HEIGHT/FPS 설정을 따르므로
+    화질 프리셋별 측정에 사용할 수 있습니다.
+    """
+
+    def __init__(self, width=None, height=None, fps=None, generator=None, pacing=None, loop=None):
+        preset = Config.get_quality_preset()
+        super().__init__(fps=fps or preset['fps'], pacing=pacing, loop=loop)
+        self.width = int(width or preset['width'])
+        self.height = int(height or preset['height'])
+        self.fixed_size = width is not None and height is not None
+        self.fixed_fps = fps is not None
+        self.generator = generator
+        self._background = None
+
+    def set(self, prop_id, value):
+        if prop_id == cv2.CAP_PROP_FRAME_WIDTH and value > 0 and not self.fixed_size:
+            self.width = int(value)
+            return True
+        if prop_id == cv2.CAP_PROP_FRAME_HEIGHT and value > 0 and not self.fixed_size:
+            self.height = int(value)
+            return True
+        if prop_id == cv2.CAP_PROP_FPS and self.fixed_fps:
+            return False
+        return super().set(prop_id, value)
+
+    def get(self, prop_id):
+        if prop_id == cv2.CAP_PROP_FRAME_WIDTH:
+            return float(self.width)
+        if prop_id == cv2.CAP_PROP_FRAME_HEIGHT:
+            return float(self.height)
+        return super().get(prop_id)
+
+    def _next_frame(self, image):
+        if self.generator is not None:
+            frame = self.generator(self.frame_index, self.width, self.height)
+            return None if frame is None else self._copy_into(frame, image)
+
+        shape = (self.height, self.width, 3)
+        if self._background is None or self._background.shape != shape:
+            # 세로 그라디언트 배경 (해상도별로 한 번만 생성)
+            gradient = np.linspace(40, 160, self.height, dtype=np.uint8)
+            self._background = np.repeat(gradient[:, None, None], self.width, axis=1).repeat(3, axis=2)
+
+        if image is not None and image.shape == shape and image.dtype == np.uint8:
+            frame = image
+            np.copyto(frame, self._background)
+        else:
+            frame = self._background.copy()
+
+        # 사람 형태 (머리 + 몸통)가 프레임 중심을 기준으로 좌우 왕복
+        period = max(int(self.fps * 4), 1)
+        phase = (self.frame_index % period) / period
+        offset = int((abs(phase * 2 - 1) * 2 - 1) * self.width * 0.2)
+        center_x = self.width // 2 + offset
+        head_radius = max(self.height // 16, 2)
+        head_y = self.height // 4
+        body_w = head_radius * 3
+
+        cv2.circle(frame, (center_x, head_y), head_radius, (90, 120, 200), -1)
+        cv2.rectangle(frame, (center_x - body_w // 2, head_y + head_radius),
+                      (center_x + body_w // 2, self.height - self.height // 8),
+                      (40, 40, 200), -1)
+        return frame
+
+def parse_synthetic_spec(spec):
+    """
+    "synthetic" 또는 "synthetic:1920x1080@30" 형식의 문자열을 (width, height, fps)로 변환
+    """
+    width = height = fps = None
+    _, _, options = spec.partition(':')
+    if options:
+        size, _, rate = options.partition('@')
+        if 'x' in size:
+            width, height = (int(v) for v in size.lower().split('x', 1))
+        if rate:
+            fps = float(rate)
+    return width, height, fps
+
+def open_frame_source(source, pacing=None, loop=None):
+    """
+    비디오 소스로부터 캡처 객체 생성
+
+    Args:
+        source: 장치 번호(int), 동영상 파일 경로, 이미지 디렉토리 경로,
+                "synthetic[:WxH@FPS]" 문자열, FrameSource 인스턴스 또는 프레임 생성 함수
+        pacing (str): 'realtime' 또는 'fast' (기본값: Config.FRAME_SOURCE_PACING)
+        loop (bool): 파일/디렉토리 끝에서 처음부터 반복 여부
+
+    Returns:
+        cv2.VideoCapture 또는 FrameSource
+    """
+    if isinstance(source, FrameSource):
+        # 같은 인스턴스로 재연결하는 경우 해제된 상태를 처음부터 다시 열어 반환
+        if not source.isOpened() or source.ended:
+            source.reset()
+        return source
+    if callable(source):
+        return SyntheticFrameSource(generator=source, pacing=pacing, loop=loop)
+    if isinstance(source, str):
+        if source.startswith('synthetic'):
+            width, height, fps = parse_synthetic_spec(source)
+            return SyntheticFrameSource(width, height, fps, pacing=pacing, loop=loop)
+        if os.path.isdir(source):
+            return ImageDirectorySource(source, pacing=pacing, loop=loop)
+        if os.path.isfile(source):
+            return VideoFileSource(source, pacing=pacing, loop=loop)
+    return cv2.VideoCapture(source)
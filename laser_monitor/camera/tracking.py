@@ -0,0 +1,390 @@
+import cv2
+import numpy as np
+from config import Config
+from utils.logger import logger
+
+class RoiTracker:
+    """
+    마지막으로 감지된 사람 주변 영역(ROI)만 추론하도록 관리하는 추적기
+
+    신뢰도 높은 감지 이후에는 이전 best_match 박스를 확장한 영역만 추론하고,
+    일정 프레임마다 또는 영역 안에서 사람을 놓치면 전체 프레임으로 다시 추론합니다.
+    """
+
+    # ROI 최소 크기 (픽셀). 너무 작은 영역은 모델 입력으로 확대될 때 정확도가 떨어짐
+    MIN_REGION_SIZE = 64
+
+    def __init__(self, enabled=None, margin=None, full_frame_interval=None, min_confidence=None):
+        """
+        초기화
+
+        Args:
+            enabled (bool): ROI 추적 사용 여부 (기본값: Config.ROI_TRACKING)
+            margin (float): 박스 크기 대비 상하좌우 확장 비율 (기본값: Config.ROI_MARGIN)
+            full_frame_interval (int): 전체 프레임 추론 주기(프레임) (기본값: Config.ROI_FULL_FRAME_INTERVAL)
+            min_confidence (float): ROI 추적을 시작할 최소 신뢰도 (기본값: Config.ROI_MIN_CONFIDENCE)
+        """
+        self.enabled = Config.ROI_TRACKING if enabled is None else enabled
+        self.margin = Config.ROI_MARGIN if margin is None else margin
+        self.full_frame_interval = (Config.ROI_FULL_FRAME_INTERVAL
+                                    if full_frame_interval is None else full_frame_interval)
+        self.min_confidence = Config.ROI_MIN_CONFIDENCE if min_confidence is None else min_confidence
+
+        self.box = None
+        self.frames_since_full = 0
+        self.roi_runs = 0
+        self.full_runs = 0
+
+    def next_region(self, frame_shape):
+        """
+        다음 추론에 사용할 영역
+
+        Args:
+            frame_shape (tuple): 프레임 형상 (height, width, ...)
+
+        Returns:
+            tuple: (x1, y1, x2, y2) 추론 영역. 전체 프레임을 추론해야 하면 None
+        """
+        if not self.enabled or self.box is None:
+            return None
+        if self.frames_since_full >= self.full_frame_interval:
+            return None
+
+        frame_height, frame_width = frame_shape[:2]
+        x1, y1, x2, y2 = self.box
+        margin_x = (x2 - x1) * self.margin
+        margin_y = (y2 - y1) * self.margin
+
+        region_x1 = max(int(x1 - margin_x), 0)
+        region_y1 = max(int(y1 - margin_y), 0)
+        region_x2 = min(int(x2 + margin_x), frame_width)
+        region_y2 = min(int(y2 + margin_y), frame_height)
+
+        if (region_x2 - region_x1 < self.MIN_REGION_SIZE or
+                region_y2 - region_y1 < self.MIN_REGION_SIZE):
+            return None
+
+        # 영역이 프레임 대부분을 차지하면 잘라내는 이득이 없으므로 전체 프레임 사용
+        region_area = (region_x2 - region_x1) * (region_y2 - region_y1)
+        if region_area >= frame_width * frame_height * 0.8:
+            return None
+
+        return region_x1, region_y1, region_x2, region_y2
+
+    def update(self, region, best_box, confidence):
+        """
+        추론 결과 반영
+
+        Args:
+            region (tuple): 이번 추론에 사용한 영역 (전체 프레임이면 None)
+            best_box (tuple): 선택된 사람 박스 (x1, y1, x2, y2). 없으면 None
+            confidence (float): 선택된 박스의 신뢰도
+        """
+        if region is None:
+            self.frames_since_full = 0
+            self.full_runs += 1
+        else:
+            self.frames_since_full += 1
+            self.roi_runs += 1
+
+        if best_box is not None and confidence >= self.min_confidence:
+            self.box = tuple(best_box)
+        else:
+            if region is not None and self.box is not None:
+                logger.debug("ROI에서 사람을 놓쳐 전체 프레임 추론으로 전환")
+            self.box = None
+
+    def reset(self):
+        """추적 상태 초기화 (다음 추론은 전체 프레임)"""
+        self.box = None
+        self.frames_since_full = 0
+
+    def get_stats(self):
+        """ROI 추적 통계"""
+        return {
+            'enabled': self.enabled,
+            'tracking': self.box is not None,
+            'roi_runs': self.roi_runs,
+            'full_runs': self.full_runs
+        }
+
+class BoxTracker:
+    """
+    추론 사이 프레임의 사람 박스를 예측하는 경량 추적기
+
+    박스 중심/크기에 등속 모델을 적용한 알파-베타 필터(정상 상태 칼만 필터)로,
+    추론 결과가 들어오면 상태를 보정하고 그 사이에는 속도로 위치를 외삽합니다.
+    예측이 길어질수록 추적 신뢰도는 감쇠합니다.
+    """
+
+    def __init__(self, alpha=None, beta=None, decay=None):
+        """
+        초기화
+
+        Args:
+            alpha (float): 위치 보정 이득 (기본값: Config.TRACKER_ALPHA)
+            beta (float): 속도 보정 이득 (기본값: Config.TRACKER_BETA)
+            decay (float): 예측 프레임당 신뢰도 감쇠율 (기본값: Config.TRACKER_CONFIDENCE_DECAY)
+        """
+        self.alpha = Config.TRACKER_ALPHA if alpha is None else alpha
+        self.beta = Config.TRACKER_BETA if beta is None else beta
+        self.decay = Config.TRACKER_CONFIDENCE_DECAY if decay is None else decay
+
+        self.state = None          # [cx, cy, w, h]
+        self.velocity = None       # 초당 변화량
+        self.last_update_time = 0.0
+        self.detection_confidence = 0.0
+        self.confidence = 0.0
+        self.frames_since_update = 0
+
+    @staticmethod
+    def _to_state(box):
+        x1, y1, x2, y2 = box
+        return np.array([(x1 + x2) / 2.0, (y1 + y2) / 2.0, x2 - x1, y2 - y1], dtype=np.float64)
+
+    @staticmethod
+    def _to_box(state):
+        cx, cy, w, h = state
+        return (int(cx - w / 2.0), int(cy - h / 2.0), int(cx + w / 2.0), int(cy + h / 2.0))
+
+    def is_tracking(self):
+        """추적 중인 박스가 있는지 여부"""
+        return self.state is not None
+
+    def update(self, box, confidence, timestamp):
+        """
+        추론 결과로 상태 보정
+
+        Args:
+            box (tuple): 감지된 박스 (x1, y1, x2, y2). 사람을 놓쳤으면 None
+            confidence (float): 감지 신뢰도
+            timestamp (float): 프레임 캡처 시각
+        """
+        if box is None:
+            self.reset()
+            return
+
+        measured = self._to_state(box)
+        if self.state is None:
+            self.state = measured
+            self.velocity = np.zeros(4, dtype=np.float64)
+        else:
+            dt = max(timestamp - self.last_update_time, 1e-3)
+            predicted = self.state + self.velocity * dt
+            residual = measured - predicted
+            self.state = predicted + self.alpha * residual
+            self.velocity = self.velocity + (self.beta / dt) * residual
+
+        self.last_update_time = timestamp
+        self.detection_confidence = float(confidence)
+        self.confidence = float(confidence)
+        self.frames_since_update = 0
+
+    def predict(self, timestamp):
+        """
+        추론 없이 현재 프레임의 박스 예측
+
+        Args:
+            timestamp (float): 프레임 캡처 시각
+
+        Returns:
+            tuple: ((x1, y1, x2, y2), 추적 신뢰도). 추적 중이 아니면 None
+        """
+        if self.state is None:
+            return None
+
+        dt = max(timestamp - self.last_update_time, 0.0)
+        predicted = self.state + self.velocity * dt
+        predicted[2:] = np.maximum(predicted[2:], 1.0)
+
+        self.frames_since_update += 1
+        self.confidence = self.detection_confidence * (self.decay ** self.frames_since_update)
+        return self._to_box(predicted), self.confidence
+
+    def reset(self):
+        """추적 상태 초기화"""
+        self.state = None
+        self.velocity = None
+        self.detection_confidence = 0.0
+        self.confidence = 0.0
+        self.frames_since_update = 0
+
+    def get_stats(self):
+        """추적기 상태"""
+        return {
+            'tracking': self.is_tracking(),
+            'confidence': round(self.confidence, 3),
+            'frames_since_update': self.frames_since_update
+        }
+
+class InferenceCadence:
+    """
+    YOLO 추론 주기 관리
+
+    N 프레임마다(DETECTION_INTERVAL) 또는 시간 예산(DETECTION_TIME_BUDGET초)마다 추론하고,
+    그 사이 프레임은 추적기 예측으로 채웁니다. 추적 신뢰도가 최소값 아래로 떨어지면 즉시 추론합니다.
+    """
+
+    def __init__(self, interval=None, time_budget=None, min_confidence=None):
+        """
+        초기화
+
+        Args:
+            interval (int): 추론 간격(프레임). 1이면 매 프레임 추론 (기본값: Config.DETECTION_INTERVAL)
+            time_budget (float): 추론 간격(초). 0보다 크면 프레임 간격 대신 사용 (기본값: Config.DETECTION_TIME_BUDGET)
+            min_confidence (float): 추적만으로 버틸 최소 신뢰도 (기본값: Config.TRACKER_MIN_CONFIDENCE)
+        """
+        self.interval = max(Config.DETECTION_INTERVAL if interval is None else interval, 1)
+        self.time_budget = Config.DETECTION_TIME_BUDGET if time_budget is None else time_budget
+        self.min_confidence = Config.TRACKER_MIN_CONFIDENCE if min_confidence is None else min_confidence
+
+        self.frames_since_inference = 0
+        self.last_inference_time = None
+        self.inference_runs = 0
+        self.tracked_frames = 0
+
+    def should_run(self, timestamp, tracker):
+        """이번 프레임에서 추론해야 하는지 여부"""
+        if self.last_inference_time is None:
+            return True
+        if tracker.is_tracking() and tracker.confidence < self.min_confidence:
+            return True
+        if self.time_budget > 0:
+            return timestamp - self.last_inference_time >= self.time_budget
+        return self.frames_since_inference + 1 >= self.interval
+
+    def mark_inference(self, timestamp):
+        """추론 수행 기록"""
+        self.frames_since_inference = 0
+        self.last_inference_time = timestamp
+        self.inference_runs += 1
+
+    def mark_reused(self, timestamp):
+        """추론 대신 이전 감지 결과를 재사용한 프레임 기록 (다음 추론 주기를 다시 시작)"""
+        self.frames_since_inference = 0
+        self.last_inference_time = timestamp
+
+    def mark_tracked(self):
+        """추적 예측으로 대체한 프레임 기록"""
+        self.frames_since_inference += 1
+        self.tracked_frames += 1
+
+    def reset(self):
+        """다음 프레임에서 바로 추론하도록 초기화"""
+        self.frames_since_inference = 0
+        self.last_inference_time = None
+
+    def get_stats(self):
+        """추론 주기 통계"""
+        return {
+            'interval_frames': self.interval,
+            'time_budget': self.time_budget,
+            'inference_runs': self.inference_runs,
+            'tracked_frames': self.tracked_frames
+        }
+
+class MotionGate:
+    """
+    정적 장면에서 YOLO 추론을 건너뛰는 변화 감지기
+
+    프레임을 작은 그레이스케일 썸네일로 줄여 마지막으로 추론한 프레임의 썸네일과 비교하고,
+    밝기가 크게 바뀐 픽셀의 비율이 임계값 미만이면 이전 감지 결과를 재사용하도록 알려줍니다.
+    (사람이 프레임의 일부만 차지하므로 평균 차이 대신 변화 픽셀 비율을 사용)
+    마지막 추론 이후 최대 허용 시간이 지나면 변화가 없어도 추론합니다.
+    """
+
+    def __init__(self, enabled=None, threshold=None, max_staleness=None, thumbnail_width=None,
+                 pixel_delta=None):
+        """
+        초기화
+
+        Args:
+            enabled (bool): 사용 여부 (기본값: Config.MOTION_GATING)
+            threshold (float): 정적 장면으로 볼 최대 변화 픽셀 비율(%) (기본값: Config.MOTION_THRESHOLD)
+            max_staleness (float): 추론 없이 결과를 재사용할 최대 시간(초) (기본값: Config.MOTION_MAX_STALENESS)
+            thumbnail_width (int): 비교용 썸네일 너비 (기본값: Config.MOTION_THUMBNAIL_WIDTH)
+            pixel_delta (int): 변화 픽셀로 볼 최소 밝기 차이 (0~255, 기본값: Config.MOTION_PIXEL_DELTA)
+        """
+        self.enabled = Config.MOTION_GATING if enabled is None else enabled
+        self.threshold = Config.MOTION_THRESHOLD if threshold is None else threshold
+        self.max_staleness = Config.MOTION_MAX_STALENESS if max_staleness is None else max_staleness
+        self.thumbnail_width = max(Config.MOTION_THUMBNAIL_WIDTH if thumbnail_width is None else thumbnail_width, 8)
+        self.pixel_delta = Config.MOTION_PIXEL_DELTA if pixel_delta is None else pixel_delta
+
+        self._reference = None
+        self._reference_time = 0.0
+        self._thumbnail = None
+        self.last_difference = None
+        self.run = 0
+        self.skipped = 0
+
+    def _make_thumbnail(self, frame):
+        """프레임을 작은 그레이스케일 썸네일로 축소 (큰 프레임은 먼저 간격 샘플링)"""
+        height, width = frame.shape[:2]
+        thumb_width = min(self.thumbnail_width, width)
+        thumb_height = max(int(round(height * thumb_width / width)), 1)
+
+        # 4K 프레임 전체를 보간하지 않도록 썸네일의 약 4배 크기로 간격 샘플링
+        step = max(width // (thumb_width * 4), 1)
+        sampled = frame[::step, ::step]
+        if sampled.ndim == 3:
+            sampled = cv2.cvtColor(sampled, cv2.COLOR_BGR2GRAY)
+        return cv2.resize(sampled, (thumb_width, thumb_height), interpolation=cv2.INTER_AREA)
+
+    def is_static(self, frame, timestamp):
+        """
+        마지막 추론 프레임 이후 장면 변화가 없어 이전 감지 결과를 재사용할 수 있는지 여부
+
+        재사용하지 않는 경우 이번 프레임의 썸네일을 보관하므로, 실제로 추론한 뒤 mark_inference()를 호출합니다.
+        """
+        if not self.enabled:
+            return False
+
+        self._thumbnail = self._make_thumbnail(frame)
+        reference = self._reference
+        if reference is None or reference.shape != self._thumbnail.shape:
+            self.last_difference = None
+            return False
+        if timestamp - self._reference_time >= self.max_staleness:
+            return False
+
+        changed = cv2.absdiff(self._thumbnail, reference) > self.pixel_delta
+        self.last_difference = float(changed.mean() * 100)
+        if self.last_difference < self.threshold:
+            self.skipped += 1
+            return True
+        return False
+
+    def mark_inference(self, timestamp, reusable=True):
+        """
+        실제 추론 수행 기록
+
+        Args:
+            timestamp (float): 프레임 캡처 시각
+            reusable (bool): 이번 결과를 이후 프레임에서 재사용해도 되는지 여부.
+                False이면 비교 기준을 지워 다음 프레임도 추론
+        """
+        self.run += 1
+        if not reusable:
+            self.reset()
+        elif self._thumbnail is not None:
+            self._reference = self._thumbnail
+            self._reference_time = timestamp
+            self._thumbnail = None
+
+    def reset(self):
+        """비교 기준 초기화 (다음 프레임은 반드시 추론)"""
+        self._reference = None
+        self._thumbnail = None
+        self.last_difference = None
+
+    def get_stats(self):
+        """추론 실행/생략 통계"""
+        return {
+            'enabled': self.enabled,
+            'threshold': self.threshold,
+            'max_staleness': self.max_staleness,
+            'run': self.run,
+            'skipped': self.skipped,
+            'last_difference': round(self.last_difference, 2) if self.last_difference is not None else None
+        }
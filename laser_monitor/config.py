@@ -1,4 +1,8 @@
 import os
+import re
+import threading
+from collections import namedtuple
+from types import MappingProxyType
 from dotenv import load_dotenv
 
 # .env 파일 로드 (선택사항)
@@ -7,6 +11,12 @@ try:
 except:
     pass
 
+# 화질 설정 스냅샷 (프리셋 변경 시 버전이 증가하는 불변 객체)
+#   캡처/감지/인코딩 단계는 Config 클래스 속성 대신 이 스냅샷을 읽어 설정 변경 중 경합을 피합니다.
+QualitySettings = namedtuple('QualitySettings', [
+    'version', 'preset_name', 'width', 'height', 'fps', 'quality', 'preset'
+])
+
 class Config:
     # Flask 설정
     SECRET_KEY = os.getenv('SECRET_KEY', 'your-secret-key-here')
@@ -69,10 +79,25 @@ class Config:
 
     # 카메라 설정 (선택된 프리셋에서 가져옴)
     DEFAULT_VIDEO_SOURCE = int(os.getenv('DEFAULT_VIDEO_SOURCE', '0'))
+    # 다중 카메라 소스 (쉼표 구분, "카메라ID=소스" 또는 "소스" 형식. 예: "left=0,right=1")
+    CAMERA_SOURCES = os.getenv('CAMERA_SOURCES', str(DEFAULT_VIDEO_SOURCE))
+    # 파일/합성 프레임 소스 설정 ('realtime': 기록된 FPS로 재생, 'fast': 최대 속도)
+    FRAME_SOURCE_PACING = os.getenv('FRAME_SOURCE_PACING', 'realtime')
+    FRAME_SOURCE_LOOP = os.getenv('FRAME_SOURCE_LOOP', 'True').lower() == 'true'
+    # 카메라 재연결 백오프 (초)
+    CAMERA_RECONNECT_MIN_DELAY = float(os.getenv('CAMERA_RECONNECT_MIN_DELAY', '0.1'))
+    CAMERA_RECONNECT_MAX_DELAY = float(os.getenv('CAMERA_RECONNECT_MAX_DELAY', '5.0'))
+    # 재사용 프레임 버퍼 풀 크기 (카메라별 유휴 버퍼 최대 개수)
+    FRAME_POOL_SIZE = int(os.getenv('FRAME_POOL_SIZE', '8'))
     CAMERA_WIDTH = int(os.getenv('CAMERA_WIDTH', str(QUALITY_PRESETS[CURRENT_QUALITY_PRESET]['width'])))
     CAMERA_HEIGHT = int(os.getenv('CAMERA_HEIGHT', str(QUALITY_PRESETS[CURRENT_QUALITY_PRESET]['height'])))
     CAMERA_FPS = int(os.getenv('CAMERA_FPS', str(QUALITY_PRESETS[CURRENT_QUALITY_PRESET]['fps'])))
     VIDEO_QUALITY = int(os.getenv('VIDEO_QUALITY', str(QUALITY_PRESETS[CURRENT_QUALITY_PRESET]['quality'])))
+    # 스트림 렌디션 단계 (클라이언트 요청을 이 단계로 맞춰 같은 렌디션은 프레임당 한 번만 인코딩)
+    STREAM_RENDITION_WIDTHS = os.getenv('STREAM_RENDITION_WIDTHS', '320,480,640,960,1280,1920')  # 픽셀
+    STREAM_QUALITY_STEPS = os.getenv('STREAM_QUALITY_STEPS', '50,70,85,95')
+    # 시청자가 없을 때 /snapshot.jpg 요청으로 카메라를 켜 두는 시간 (요청마다 연장)
+    SNAPSHOT_HOLD_SECONDS = float(os.getenv('SNAPSHOT_HOLD_SECONDS', '10'))  # 초
 
     # 모니터링 설정
     CAPTURE_INTERVAL = int(os.getenv('CAPTURE_INTERVAL', '60'))  # 초
@@ -80,6 +105,45 @@ class Config:
     DETECTION_CONFIDENCE = float(os.getenv('DETECTION_CONFIDENCE', '0.6'))
     TOLERANCE = int(os.getenv('TOLERANCE', '50'))  # 픽셀
 
+    # ROI 추적 설정 (마지막으로 감지된 사람 주변 영역만 추론, 기본 꺼짐)
+    ROI_TRACKING = os.getenv('ROI_TRACKING', 'False').lower() == 'true'
+    ROI_MARGIN = float(os.getenv('ROI_MARGIN', '0.5'))  # 박스 크기 대비 확장 비율
+    ROI_FULL_FRAME_INTERVAL = int(os.getenv('ROI_FULL_FRAME_INTERVAL', '30'))  # 프레임
+    ROI_MIN_CONFIDENCE = float(os.getenv('ROI_MIN_CONFIDENCE', '0.7'))
+
+    # 움직임 감지 기반 추론 생략 (정적 장면에서는 이전 감지 결과 재사용, 기본 꺼짐)
+    MOTION_GATING = os.getenv('MOTION_GATING', 'False').lower() == 'true'
+    MOTION_THRESHOLD = float(os.getenv('MOTION_THRESHOLD', '0.5'))  # 변화 픽셀 비율 (%)
+    MOTION_PIXEL_DELTA = int(os.getenv('MOTION_PIXEL_DELTA', '12'))  # 변화 픽셀로 볼 밝기 차이 (0~255)
+    MOTION_MAX_STALENESS = float(os.getenv('MOTION_MAX_STALENESS', '2.0'))  # 초
+    MOTION_THUMBNAIL_WIDTH = int(os.getenv('MOTION_THUMBNAIL_WIDTH', '64'))  # 픽셀
+
+    # 추론 전처리 설정 (긴 변 기준으로 한 번 축소한 뒤 추론, 0이면 원본 해상도 그대로 전달)
+    INFERENCE_SIZE = int(os.getenv('INFERENCE_SIZE', '640'))  # 픽셀
+    INFERENCE_INTERPOLATION = os.getenv('INFERENCE_INTERPOLATION', 'area')  # area 또는 linear
+    # 추론 백엔드 (pytorch, onnxruntime, openvino). 내보낸 모델은 모델 해시와 입력 크기별로 캐시
+    INFERENCE_BACKEND = os.getenv('INFERENCE_BACKEND', 'pytorch').lower()
+    MODEL_CACHE_DIR = os.getenv('MODEL_CACHE_DIR', 'laser_monitor/data/models')
+    INFERENCE_THREADS = int(os.getenv('INFERENCE_THREADS', '0'))  # 0이면 런타임 기본값
+    # 프로세스 외부 추론 워커 (0이면 웹 프로세스 안에서 추론)
+    INFERENCE_WORKERS = int(os.getenv('INFERENCE_WORKERS', '0'))
+    INFERENCE_SLOTS = int(os.getenv('INFERENCE_SLOTS', '0'))  # 공유 메모리 슬롯 수 (0이면 워커 수 x 2)
+    INFERENCE_WORKER_TIMEOUT = float(os.getenv('INFERENCE_WORKER_TIMEOUT', '5.0'))  # 초
+    # 캡처/감지/웹 스레드가 잡고 있는 락을 복제하지 않도록 fork 대신 spawn으로 워커 시작
+    INFERENCE_WORKER_START_METHOD = os.getenv('INFERENCE_WORKER_START_METHOD', 'spawn')
+    # 배치 추론 설정 (여러 카메라의 프레임을 모아 한 번에 추론, 1이면 배치 없이 바로 추론)
+    # 카메라마다 요청이 하나씩만 대기하므로 배치 크기는 최대 카메라 수까지만 커짐
+    INFERENCE_BATCH_SIZE = int(os.getenv('INFERENCE_BATCH_SIZE', '1'))
+    INFERENCE_BATCH_WAIT_MS = float(os.getenv('INFERENCE_BATCH_WAIT_MS', '5'))  # 첫 요청 이후 최대 대기
+
+    # 추론 주기 설정 (추론 사이 프레임은 박스 추적기 예측으로 대체)
+    DETECTION_INTERVAL = int(os.getenv('DETECTION_INTERVAL', '1'))  # 프레임 (1이면 매 프레임 추론)
+    DETECTION_TIME_BUDGET = float(os.getenv('DETECTION_TIME_BUDGET', '0'))  # 초 (0보다 크면 프레임 간격 대신 사용)
+    TRACKER_ALPHA = float(os.getenv('TRACKER_ALPHA', '0.7'))  # 위치 보정 이득
+    TRACKER_BETA = float(os.getenv('TRACKER_BETA', '0.3'))  # 속도 보정 이득
+    TRACKER_CONFIDENCE_DECAY = float(os.getenv('TRACKER_CONFIDENCE_DECAY', '0.9'))  # 예측 프레임당 감쇠율
+    TRACKER_MIN_CONFIDENCE = float(os.getenv('TRACKER_MIN_CONFIDENCE', '0.4'))  # 미만이면 즉시 추론
+
     # 파일 관리 설정
     MAX_CAPTURES = int(os.getenv('MAX_CAPTURES', '10'))
     MAX_FILES = int(os.getenv('MAX_FILES', '20'))
@@ -93,6 +157,15 @@ class Config:
 
     # 세션 관리 설정
     SESSION_TIMEOUT = int(os.getenv('SESSION_TIMEOUT', '60'))  # 초
+    STREAM_IDLE_KEEPALIVE = float(os.getenv('STREAM_IDLE_KEEPALIVE', '15'))  # 초 (모니터링 중지 중 연결 확인 간격)
+
+    # 상태 푸시 채널 설정 (/events, Server-Sent Events)
+    STATUS_PUSH_COALESCE_MS = float(os.getenv('STATUS_PUSH_COALESCE_MS', '250'))  # 변경 병합 구간
+    STATUS_PUSH_KEEPALIVE = float(os.getenv('STATUS_PUSH_KEEPALIVE', '15'))  # 초 (연결 유지 겸 세션 하트비트)
+
+    # 서버 모드 설정 (threaded: Flask 개발 서버, async: aiohttp 이벤트 루프로 스트리밍)
+    SERVER_MODE = os.getenv('SERVER_MODE', 'threaded').lower()
+    ASYNC_WORKER_THREADS = int(os.getenv('ASYNC_WORKER_THREADS', '8'))  # 인코딩/일반 라우트 스레드 수
 
     # 로깅 설정
     LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
@@ -101,6 +174,10 @@ class Config:
     # 모델 파일 경로
     YOLO_MODEL_PATH = os.getenv('YOLO_MODEL_PATH', 'yolov8n.pt')
 
+    # 화질 설정 스냅샷 (get_settings_snapshot()으로 조회)
+    _settings_lock = threading.Lock()
+    _settings_snapshot = None
+
     @classmethod
     def get_quality_preset(cls, preset_name=None):
         """화질 프리셋 가져오기"""
@@ -112,20 +189,79 @@ class Config:
     def set_quality_preset(cls, preset_name):
         """화질 프리셋 설정"""
         if preset_name in cls.QUALITY_PRESETS:
-            cls.CURRENT_QUALITY_PRESET = preset_name
-            preset = cls.QUALITY_PRESETS[preset_name]
-            cls.CAMERA_WIDTH = preset['width']
-            cls.CAMERA_HEIGHT = preset['height']
-            cls.CAMERA_FPS = preset['fps']
-            cls.VIDEO_QUALITY = preset['quality']
+            with cls._settings_lock:
+                cls.CURRENT_QUALITY_PRESET = preset_name
+                preset = cls.QUALITY_PRESETS[preset_name]
+                cls.CAMERA_WIDTH = preset['width']
+                cls.CAMERA_HEIGHT = preset['height']
+                cls.CAMERA_FPS = preset['fps']
+                cls.VIDEO_QUALITY = preset['quality']
+
+                # 새 버전의 스냅샷으로 한 번에 교체
+                version = cls._settings_snapshot.version + 1 if cls._settings_snapshot else 1
+                cls._settings_snapshot = cls._build_settings_snapshot(version)
             return True
         return False
 
+    @classmethod
+    def get_settings_snapshot(cls):
+        """현재 화질 설정 스냅샷 (QualitySettings)"""
+        with cls._settings_lock:
+            if cls._settings_snapshot is None:
+                cls._settings_snapshot = cls._build_settings_snapshot(1)
+            return cls._settings_snapshot
+
+    @classmethod
+    def _build_settings_snapshot(cls, version):
+        """현재 프리셋으로 화질 설정 스냅샷 생성"""
+        preset = MappingProxyType(dict(cls.get_quality_preset()))
+        return QualitySettings(version=version,
+                               preset_name=cls.CURRENT_QUALITY_PRESET,
+                               width=preset['width'],
+                               height=preset['height'],
+                               fps=preset['fps'],
+                               quality=cls.VIDEO_QUALITY,
+                               preset=preset)
+
     @classmethod
     def get_available_presets(cls):
         """사용 가능한 화질 프리셋 목록"""
         return {name: preset for name, preset in cls.QUALITY_PRESETS.items()}
 
+    @classmethod
+    def get_camera_sources(cls):
+        """
+        카메라 ID -> 비디오 소스 매핑 (숫자 소스는 장치 번호로 변환)
+
+        카메라 ID는 /video_feed/<camera_id> 같은 URL 경로에 쓰이므로 영문자, 숫자, '_', '-'만 남깁니다.
+        (예: /dev/video0 -> dev-video0, 겹치면 -2, -3 ... 접미사)
+        """
+        sources = {}
+        for entry in cls.CAMERA_SOURCES.split(','):
+            entry = entry.strip()
+            if not entry:
+                continue
+            if '=' in entry:
+                camera_id, source = (part.strip() for part in entry.split('=', 1))
+            else:
+                camera_id, source = entry, entry
+            camera_id = cls._camera_id_slug(camera_id, len(sources))
+            base_id, suffix = camera_id, 2
+            while camera_id in sources:
+                camera_id = f"{base_id}-{suffix}"
+                suffix += 1
+            sources[camera_id] = int(source) if source.isdigit() else source
+
+        if not sources:
+            sources[str(cls.DEFAULT_VIDEO_SOURCE)] = cls.DEFAULT_VIDEO_SOURCE
+        return sources
+
+    @staticmethod
+    def _camera_id_slug(camera_id, index):
+        """URL 경로 한 구간에 들어갈 수 있는 카메라 ID (남는 문자가 없으면 camera<번호>)"""
+        slug = re.sub(r'[^A-Za-z0-9_-]+', '-', camera_id).strip('-')
+        return slug or f"camera{index}"
+
     @classmethod
     def validate_config(cls):
         """설정 검증"""
@@ -1,7 +1,46 @@
+import threading
 import time
 
 class UserSession:
     def __init__(self, session_id):
         self.session_id = session_id
-        self.is_monitoring = False
-        self.last_active = time.time()
\ No newline at end of file
+        self._monitoring = False
+        self._monitoring_cond = threading.Condition()
+        self._listeners = []
+        self.last_active = time.time()
+        self.camera_ids = set()
+        self.streams = {}              # 카메라 ID -> 열린 스트림 수
+
+    @property
+    def is_monitoring(self):
+        return self._monitoring
+
+    @is_monitoring.setter
+    def is_monitoring(self, value):
+        """모니터링 상태 변경 (대기 중인 스트림을 깨우고 리스너 호출)"""
+        with self._monitoring_cond:
+            changed = self._monitoring != value
+            self._monitoring = value
+            self._monitoring_cond.notify_all()
+        if changed:
+            for listener in list(self._listeners):
+                listener(value)
+
+    def wait_for_monitoring(self, timeout):
+        """
+        모니터링이 켜질 때까지 대기 (폴링 없이 상태 변경 시에만 깨어남)
+
+        Returns:
+            bool: 모니터링 중이면 True, 시간 초과 시 False
+        """
+        with self._monitoring_cond:
+            return self._monitoring_cond.wait_for(lambda: self._monitoring, timeout)
+
+    def add_listener(self, callback):
+        """모니터링 상태 변경 시 새 상태를 인자로 호출할 콜백 등록"""
+        self._listeners.append(callback)
+
+    def remove_listener(self, callback):
+        """모니터링 상태 리스너 제거"""
+        if callback in self._listeners:
+            self._listeners.remove(callback)
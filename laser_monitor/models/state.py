@@ -1,12 +1,17 @@
 import os
-from camera.camera import SharedCamera
+import threading
+from camera.manager import CameraManager
 from .session import UserSession
+from .status_publisher import StatusPublisher
 import time
 import cv2
 from datetime import datetime
 from config import Config
 from utils.logger import logger
 
+# 스냅샷 요청이 카메라를 켜 둘 때 사용하는 내부 세션 ID
+SNAPSHOT_SESSION_ID = '__snapshot__'
+
 class MonitoringState:
     """모니터링 상태 관리 클래스"""
 
@@ -14,7 +19,16 @@ class MonitoringState:
         """초기화"""
         try:
             self.sessions = {}
-            self.camera = SharedCamera(video_source=Config.DEFAULT_VIDEO_SOURCE)
+            self._stream_lock = threading.Lock()        # 세션별 스트림 수 갱신용 (짧게 보유)
+            self._registration_locks = {}               # 카메라 ID -> 카메라 등록/해제 직렬화 락
+            self._camera_holds = {}   # 카메라 ID -> 스냅샷 유지 만료 시각
+            self._hold_lock = threading.Lock()
+            self.cameras = CameraManager(state=self)
+            # 기본 카메라 (단일 카메라 코드 경로와의 호환용)
+            self.camera = self.cameras.get_camera()
+            self.pipeline = self.cameras.get_pipeline()
+            # 상태/거리/화질 변경을 서버 푸시 구독자에게 분배
+            self.publisher = StatusPublisher(self.cameras)
             self.is_monitoring = True
             self.alert_enabled = False
             self.email = None
@@ -48,17 +62,129 @@ class MonitoringState:
             raise
 
     def get_or_create_session(self, session_id):
-        """세션 생성 또는 조회"""
+        """세션 생성 또는 조회 (카메라 등록은 스트림을 열 때 open_stream()에서 수행)"""
         try:
             if session_id not in self.sessions:
                 self.sessions[session_id] = UserSession(session_id)
-                self.camera.add_session(session_id)
                 logger.info(f"새 세션 생성: {session_id}")
             return self.sessions[session_id]
         except Exception as e:
             logger.log_exception(f"세션 생성/조회 중 오류 (ID: {session_id})", e)
             raise
 
+    def open_stream(self, session_id, camera_id=None):
+        """
+        스트림 시작 시 세션을 카메라에 등록 (카메라 캡처와 감지는 등록된 세션이 있는 동안만 실행)
+
+        Returns:
+            UserSession: 세션
+        """
+        session = self.get_or_create_session(session_id)
+        if camera_id is None:
+            camera_id = self.cameras.default_id
+
+        with self._stream_lock:
+            count = session.streams.get(camera_id, 0)
+            session.streams[camera_id] = count + 1
+            if count == 0:
+                session.camera_ids.add(camera_id)
+        if count == 0:
+            self._sync_registration(session_id, camera_id)
+        return session
+
+    def close_stream(self, session_id, camera_id=None):
+        """
+        스트림 종료 시 호출 (클라이언트 연결 끊김 포함)
+
+        세션의 해당 카메라 스트림이 모두 닫히면 즉시 카메라 등록을 해제하므로,
+        마지막 시청자가 나가면 캡처와 감지 파이프라인이 멈춥니다.
+        """
+        try:
+            session = self.sessions.get(session_id)
+            if session is None:
+                return
+            if camera_id is None:
+                camera_id = self.cameras.default_id
+
+            with self._stream_lock:
+                count = session.streams.get(camera_id, 0) - 1
+                if count > 0:
+                    session.streams[camera_id] = count
+                    return
+                session.streams.pop(camera_id, None)
+                session.camera_ids.discard(camera_id)
+            # 캡처/감지 스레드 종료를 기다리므로 스트림 락을 놓은 뒤 등록 해제
+            self._sync_registration(session_id, camera_id)
+            logger.info(f"세션 {session_id}의 스트림 종료: 카메라 {camera_id} 등록 해제")
+
+        except Exception as e:
+            logger.log_exception(f"스트림 종료 처리 중 오류 (ID: {session_id})", e)
+
+    def _sync_registration(self, session_id, camera_id):
+        """
+        세션의 카메라 등록 여부를 현재 스트림 수에 맞춤
+
+        카메라 시작/중지는 느리므로 스트림 락 밖에서 수행하고, 같은 카메라의 등록/해제는
+        카메라별 락으로 순서를 지킵니다. 락을 얻은 뒤 스트림 수를 다시 읽으므로,
+        닫기 직후 다시 열린 스트림의 등록을 늦게 도착한 해제가 지우지 않습니다.
+        """
+        with self._stream_lock:
+            lock = self._registration_locks.setdefault(camera_id, threading.Lock())
+        with lock:
+            with self._stream_lock:
+                session = self.sessions.get(session_id)
+                wanted = session is not None and session.streams.get(camera_id, 0) > 0
+            camera = self.cameras.get_camera(camera_id)
+            registered = camera is not None and session_id in camera.active_sessions
+            if wanted and not registered:
+                self.cameras.add_session(session_id, camera_id)
+            elif not wanted and registered:
+                self.cameras.remove_session(session_id, camera_id)
+
+    def hold_camera(self, camera_id=None, duration=None):
+        """
+        시청자 없이도 카메라를 잠시 켜 둠 (스냅샷 요청용, 만료 전에 다시 호출하면 연장)
+
+        Args:
+            camera_id (str): 카메라 ID (None이면 기본 카메라)
+            duration (float): 유지 시간(초) (기본값: Config.SNAPSHOT_HOLD_SECONDS)
+
+        Returns:
+            bool: 꺼져 있던 카메라를 새로 켰으면 True (최신 결과가 켜기 전의 오래된 결과일 수 있음)
+        """
+        if camera_id is None:
+            camera_id = self.cameras.default_id
+        if duration is None:
+            duration = Config.SNAPSHOT_HOLD_SECONDS
+
+        with self._hold_lock:
+            held = camera_id in self._camera_holds
+            self._camera_holds[camera_id] = time.time() + duration
+        if held:
+            return False
+
+        started = not self.cameras.get_camera(camera_id).is_active()
+        self.open_stream(SNAPSHOT_SESSION_ID, camera_id)
+        self._schedule_hold_release(camera_id, duration)
+        return started
+
+    def _schedule_hold_release(self, camera_id, delay):
+        """스냅샷 유지 만료 확인 예약"""
+        timer = threading.Timer(delay, self._release_hold, args=(camera_id,))
+        timer.daemon = True
+        timer.start()
+
+    def _release_hold(self, camera_id):
+        """스냅샷 유지가 만료되었으면 카메라 등록 해제 (연장되었으면 다시 예약)"""
+        with self._hold_lock:
+            remaining = self._camera_holds[camera_id] - time.time()
+            if remaining <= 0:
+                del self._camera_holds[camera_id]
+        if remaining > 0:
+            self._schedule_hold_release(camera_id, remaining)
+        else:
+            self.close_stream(SNAPSHOT_SESSION_ID, camera_id)
+
     def cleanup_inactive_sessions(self, timeout=None):
         """비활성 세션 정리"""
         if timeout is None:
@@ -73,8 +199,13 @@ class MonitoringState:
                     inactive_sessions.append(session_id)
 
             for session_id in inactive_sessions:
-                self.camera.remove_session(session_id)
-                del self.sessions[session_id]
+                with self._stream_lock:
+                    session = self.sessions.pop(session_id)
+                    camera_ids = list(session.camera_ids)
+                    session.camera_ids.clear()
+                    session.streams.clear()
+                for camera_id in camera_ids:
+                    self._sync_registration(session_id, camera_id)
                 logger.info(f"비활성 세션 제거: {session_id}")
 
             if inactive_sessions:
@@ -83,13 +214,20 @@ class MonitoringState:
         except Exception as e:
             logger.log_exception("세션 정리 중 오류", e)
 
-    def add_capture(self, frame, is_manual=False):
-        """캡처 추가"""
+    def add_capture(self, frame, is_manual=False, jpeg=None):
+        """
+        캡처 추가
+
+        Args:
+            frame: 저장할 프레임 (jpeg가 주어지면 사용하지 않음)
+            is_manual (bool): 수동 캡처 여부
+            jpeg (bytes): 이미 인코딩된 JPEG (주어지면 다시 인코딩하지 않고 그대로 저장)
+        """
         try:
             current_time = time.time()
             if is_manual or current_time - self.last_capture_time >= self.capture_interval:
 
-                if frame is None or frame.size == 0:
+                if jpeg is None and (frame is None or frame.size == 0):
                     logger.warning("유효하지 않은 프레임, 캡처 건너뜀")
                     return
 
@@ -101,7 +239,12 @@ class MonitoringState:
                 logger.debug(f"캡처 저장 시도: {filepath}")
 
                 # 이미지 저장
-                success = cv2.imwrite(filepath, frame)
+                if jpeg is not None:
+                    with open(filepath, 'wb') as f:
+                        f.write(jpeg)
+                    success = True
+                else:
+                    success = cv2.imwrite(filepath, frame)
                 if not success:
                     logger.error(f"이미지 저장 실패: {filepath}")
                     return
@@ -0,0 +1,152 @@
+import threading
+import time
+from config import Config
+from utils.logger import logger
+
+class StatusPublisher:
+    """
+    상태 변경 이벤트 발행기 (서버 푸시 채널용)
+
+    감지 파이프라인이 결과를 발행할 때마다 카메라별 상태/거리/해상도를 가볍게 비교해 두고,
+    바뀐 내용이 있으면 하나의 발행 스레드가 병합 구간(STATUS_PUSH_COALESCE_MS) 동안 기다린 뒤
+    마지막 값만 이벤트로 만듭니다. 구독자는 이벤트 버전만 비교하므로 구독자 수와 무관하게
+    상태 계산은 한 번만 수행됩니다.
+    """
+
+    def __init__(self, cameras, coalesce=None):
+        """
+        초기화 및 발행 스레드 시작
+
+        Args:
+            cameras (CameraManager): 상태를 구독할 카메라 관리자
+            coalesce (float): 변경 병합 구간(초) (기본값: Config.STATUS_PUSH_COALESCE_MS)
+        """
+        self.cameras = cameras
+        self.coalesce = Config.STATUS_PUSH_COALESCE_MS / 1000.0 if coalesce is None else coalesce
+
+        self._cond = threading.Condition()
+        self._events = {}     # 이벤트 이름 -> (버전, 데이터)
+        self._version = 0
+        self._latest = {}     # 카메라 ID -> (상태, 거리, 프레임 해상도)
+        self._dirty = threading.Event()
+        self._listeners = []
+
+        self.subscribers = 0
+        self.notifications = 0
+        self.published = 0
+
+        for camera_id in cameras.camera_ids():
+            cameras.get_pipeline(camera_id).add_listener(self._listener(camera_id))
+
+        self._thread = threading.Thread(target=self._run, name="status-publisher", daemon=True)
+        self._thread.start()
+        # 시작 시점의 상태(대기중, 현재 프리셋)를 첫 이벤트로 발행
+        self.notify()
+
+    def _listener(self, camera_id):
+        """파이프라인 결과 콜백 (감지 스레드에서 호출되므로 비교만 수행)"""
+        def on_result(result):
+            shape = result.frame.shape[:2] if result.frame is not None else None
+            latest = (result.status, result.distance, shape)
+            if self._latest.get(camera_id) != latest:
+                self._latest[camera_id] = latest
+                self.notify()
+        return on_result
+
+    def add_listener(self, callback):
+        """새 이벤트 발행 시 인자 없이 호출할 콜백 등록 (발행 스레드에서 호출되므로 가볍게 유지)"""
+        self._listeners.append(callback)
+
+    def notify(self):
+        """상태가 바뀌었음을 알림 (화질 프리셋 변경 등 결과 발행과 무관한 변경에도 호출)"""
+        self.notifications += 1
+        self._dirty.set()
+
+    def _run(self):
+        """변경 알림을 병합 구간 단위로 모아 이벤트 발행"""
+        while True:
+            self._dirty.wait()
+            # 병합 구간 동안의 변경은 마지막 값 하나로 합침
+            time.sleep(self.coalesce)
+            self._dirty.clear()
+            try:
+                self._publish(self._build_events())
+            except Exception as e:
+                logger.log_exception("상태 이벤트 발행 중 오류", e)
+
+    def _build_events(self):
+        """현재 상태로 이벤트 데이터 생성"""
+        default_id = self.cameras.default_id
+        cameras = {}
+        for camera_id in self.cameras.camera_ids():
+            status, distance, _ = self._latest.get(camera_id, ("대기중", 0, None))
+            cameras[camera_id] = {'status': status, 'distance': distance}
+
+        status = dict(cameras.get(default_id, {'status': "대기중", 'distance': 0}), cameras=cameras)
+
+        # 화질 정보는 설정 스냅샷과 실제 프레임 해상도로 구성 (카메라 장치 조회 없음)
+        settings = Config.get_settings_snapshot()
+        _, _, shape = self._latest.get(default_id, (None, None, None))
+        height, width = shape if shape is not None else (None, None)
+        quality = {
+            'preset_name': settings.preset_name,
+            'description': settings.preset.get('description'),
+            'width': width,
+            'height': height,
+            'fps': settings.fps
+        }
+        return {'status': status, 'quality': quality}
+
+    def _publish(self, events):
+        """이전 이벤트와 달라진 이벤트만 새 버전으로 저장하고 구독자에게 알림"""
+        with self._cond:
+            changed = False
+            for name, data in events.items():
+                previous = self._events.get(name)
+                if previous is not None and previous[1] == data:
+                    continue
+                self._version += 1
+                self._events[name] = (self._version, data)
+                self.published += 1
+                changed = True
+            if changed:
+                self._cond.notify_all()
+
+        if changed:
+            for listener in self._listeners:
+                try:
+                    listener()
+                except Exception as e:
+                    logger.log_exception("상태 이벤트 리스너 처리 중 오류", e)
+
+    def wait_for_events(self, seen, timeout):
+        """
+        구독자가 받지 않은 이벤트가 생길 때까지 대기
+
+        Args:
+            seen (dict): 이벤트 이름 -> 구독자가 마지막으로 받은 버전
+            timeout (float): 최대 대기 시간(초)
+
+        Returns:
+            list: (이벤트 이름, 버전, 데이터) 목록. 시간 초과 시 빈 목록
+        """
+        deadline = time.time() + timeout
+        with self._cond:
+            while True:
+                pending = [(name, version, data) for name, (version, data) in self._events.items()
+                           if seen.get(name, 0) < version]
+                if pending:
+                    return sorted(pending, key=lambda event: event[1])
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    return []
+                self._cond.wait(remaining)
+
+    def get_stats(self):
+        """발행 통계"""
+        return {
+            'subscribers': self.subscribers,
+            'notifications': self.notifications,
+            'published': self.published,
+            'coalesce_ms': round(self.coalesce * 1000, 1)
+        }